@@ -0,0 +1,84 @@
+"""Benchmark checkpoint size and step time for long tool-calling analyses.
+
+Runs a stub agent loop that makes one tool call per iteration, each
+returning a large JSON result, and checkpoints every step with:
+
+* ``full``: ``MemorySaver``, storing the whole message list at every step
+* ``delta``: ``DeltaMemorySaver``, storing each message once
+
+Reports the bytes held by the checkpointer after the run and the mean wall
+time per graph step. Runs offline; no API keys needed.
+
+Usage:
+    python scripts/bench_checkpointing.py --iterations 10 50 100 --result-kb 20
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from langchain_fmp_data.checkpointing import DeltaMemorySaver, saver_bytes
+
+
+def _graph(saver: MemorySaver, iterations: int, result_kb: int) -> Any:
+    """Agent loop calling a stub tool ``iterations`` times before answering."""
+    row = {"date": "2026-01-02", "open": 1.0, "close": 2.0, "volume": 1000}
+    rows = [row] * max(1, result_kb * 1024 // len(json.dumps(row)))
+
+    def agent(state: MessagesState) -> Dict[str, Any]:
+        calls = sum(isinstance(m, ToolMessage) for m in state["messages"])
+        if calls >= iterations:
+            return {"messages": [AIMessage(content="Done.")]}
+        call = {"name": "get_historical_prices", "args": {"symbol": "AAPL"}, "id": f"call-{calls}"}
+        return {"messages": [AIMessage(content="", tool_calls=[call])]}
+
+    def tools(state: MessagesState) -> Dict[str, Any]:
+        call_id = state["messages"][-1].tool_calls[0]["id"]
+        content = json.dumps({"status": "success", "data": rows})
+        return {"messages": [ToolMessage(content=content, tool_call_id=call_id)]}
+
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("agent", agent)
+    workflow.add_node("tools", tools)
+    workflow.add_edge(START, "agent")
+    workflow.add_conditional_edges(
+        "agent", lambda state: "tools" if state["messages"][-1].tool_calls else END
+    )
+    workflow.add_edge("tools", "agent")
+    return workflow.compile(checkpointer=saver)
+
+
+def _measure(saver: MemorySaver, iterations: int, result_kb: int) -> Tuple[int, float]:
+    graph = _graph(saver, iterations, result_kb)
+    config = {"configurable": {"thread_id": "bench"}, "recursion_limit": 2 * iterations + 5}
+    start = time.perf_counter()
+    graph.invoke({"messages": [HumanMessage(content="Analyze AAPL")]}, config)
+    elapsed = time.perf_counter() - start
+    if isinstance(saver, DeltaMemorySaver):
+        stored = sum(saver.stored_bytes().values())
+    else:
+        stored = sum(saver_bytes(saver).values())
+    steps = 2 * iterations + 1
+    return stored, elapsed / steps * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--result-kb", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'iterations':>10}{'mode':>8}{'stored MB':>12}{'ms/step':>10}")
+    for iterations in args.iterations:
+        for mode, saver in (("full", MemorySaver()), ("delta", DeltaMemorySaver())):
+            stored, ms_per_step = _measure(saver, iterations, args.result_kb)
+            print(f"{iterations:>10}{mode:>8}{stored / 2**20:>12.2f}{ms_per_step:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
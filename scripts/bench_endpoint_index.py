@@ -0,0 +1,152 @@
+"""Benchmark endpoint index load time and RSS per worker.
+
+Compares three ways a worker can get the endpoint index:
+
+* ``pickle``: ``FAISS.load_local`` of a saved store (what ``create_vector_store``
+  does when a cache exists)
+* ``read``: the prebuilt artifact read into private memory
+* ``mmap``: the prebuilt artifact mapped read-only (shared between workers)
+
+Runs offline with synthetic vectors; no API keys needed.
+
+Usage:
+    python scripts/bench_endpoint_index.py --vectors 50000 --dimension 1536 --workers 4
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import faiss
+import numpy as np
+from fmp_data import FMPDataClient
+from fmp_data.lc import setup_registry
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from langchain_fmp_data.endpoint_index import (
+    INDEX_FILE,
+    METADATA_FILE,
+    EndpointIndexMetadata,
+    PrebuiltEndpointVectorStore,
+    fmp_data_version,
+)
+
+
+def _rss_kb() -> Dict[str, int]:
+    """Read resident memory counters of the current process (Linux)."""
+    fields = {}
+    with open("/proc/self/status") as status:
+        for line in status:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0])
+    return fields
+
+
+def _build_artifacts(root: Path, vectors: int, dimension: int, names: List[str]) -> None:
+    rng = np.random.default_rng(0)
+    data = rng.random((vectors, dimension), dtype=np.float32)
+    endpoints = [names[i % len(names)] for i in range(vectors)]
+
+    index = faiss.IndexFlatL2(dimension)
+    index.add(data)
+
+    prebuilt = root / "prebuilt"
+    prebuilt.mkdir()
+    faiss.write_index(index, str(prebuilt / INDEX_FILE))
+    metadata = EndpointIndexMetadata(
+        fmp_data_version=fmp_data_version(),
+        embedding_model="default",
+        dimension=dimension,
+        endpoints=endpoints,
+    )
+    (prebuilt / METADATA_FILE).write_text(metadata.model_dump_json())
+
+    docs = {
+        str(i): Document(page_content=name, metadata={"endpoint": name})
+        for i, name in enumerate(endpoints)
+    }
+    store = FAISS(
+        embedding_function=DeterministicFakeEmbedding(size=dimension),
+        index=index,
+        docstore=InMemoryDocstore(docs),
+        index_to_docstore_id={i: str(i) for i in range(vectors)},
+    )
+    store.save_local(str(root / "pickle"))
+
+
+def _worker(mode: str, root: str, dimension: int, queue: "multiprocessing.Queue") -> None:
+    embeddings = DeterministicFakeEmbedding(size=dimension)
+    # The registry is needed on every path; keep it out of the measurement
+    client = FMPDataClient(api_key="bench")
+    registry, _ = setup_registry(client)
+    before = _rss_kb()
+    start = time.perf_counter()
+    if mode == "pickle":
+        store = FAISS.load_local(
+            str(Path(root) / "pickle"), embeddings, allow_dangerous_deserialization=True
+        )
+        index = store.index
+    else:
+        store = PrebuiltEndpointVectorStore(
+            client, registry, embeddings, Path(root) / "prebuilt", mmap=mode == "mmap"
+        )
+        index = store.vector_store.index
+    elapsed = time.perf_counter() - start
+    # Touch every page, as a search over a flat index would
+    index.search(np.zeros((1, dimension), dtype=np.float32), 1)
+    after = _rss_kb()
+    queue.put(
+        {
+            "seconds": elapsed,
+            "anon_mb": (after["RssAnon"] - before["RssAnon"]) / 1024,
+            "file_mb": (after["RssFile"] - before["RssFile"]) / 1024,
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    registry, _ = setup_registry(FMPDataClient(api_key="bench"))
+    names = list(registry.list_endpoints())
+    context = multiprocessing.get_context("fork")
+
+    with tempfile.TemporaryDirectory() as root:
+        _build_artifacts(Path(root), args.vectors, args.dimension, names)
+        size_mb = (Path(root) / "prebuilt" / INDEX_FILE).stat().st_size / 2**20
+        print(f"{args.vectors} vectors x {args.dimension} dims ({size_mb:.1f} MB index)")
+        print(f"{'mode':<8}{'load s':>10}{'private MB':>12}{'shared MB':>12}")
+
+        for mode in ("pickle", "read", "mmap"):
+            queue = context.Queue()
+            workers = [
+                context.Process(target=_worker, args=(mode, root, args.dimension, queue))
+                for _ in range(args.workers)
+            ]
+            for worker in workers:
+                worker.start()
+            results = [queue.get() for _ in workers]
+            for worker in workers:
+                worker.join()
+            print(
+                f"{mode:<8}"
+                f"{statistics.median(r['seconds'] for r in results):>10.3f}"
+                f"{statistics.median(r['anon_mb'] for r in results):>12.1f}"
+                f"{statistics.median(r['file_mb'] for r in results):>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark recall, latency and size of endpoint index types.
+
+Builds every ``EndpointIndexConfig`` combination worth comparing over the
+same synthetic catalog and reports, against the exact flat index:
+
+* ``build s``: time to train and fill the index
+* ``MB``: serialized index size (what a worker maps or loads)
+* ``p50 us`` / ``p99 us``: latency of single-query searches, as
+  ``get_tools`` issues them
+* ``recall@k``: share of the exact top-k neighbors found
+
+Vectors are normalized and clustered around topics, shaped like endpoint
+description embeddings. Runs offline; no API keys needed.
+
+Usage:
+    python scripts/bench_index_types.py --vectors 5000 20000 --dimension 1536 --k 10
+"""
+
+import argparse
+import time
+from typing import List, Tuple
+
+import faiss
+import numpy as np
+
+from langchain_fmp_data.endpoint_index import (
+    EndpointIndexConfig,
+    IndexType,
+    Quantization,
+    build_faiss_index,
+)
+
+CONFIGS: List[Tuple[str, EndpointIndexConfig]] = [
+    ("flat", EndpointIndexConfig()),
+    ("flat+fp16", EndpointIndexConfig(quantization=Quantization.FP16)),
+    ("flat+sq8", EndpointIndexConfig(quantization=Quantization.SQ8)),
+    ("flat+pq", EndpointIndexConfig(quantization=Quantization.PQ)),
+    ("hnsw", EndpointIndexConfig(index_type=IndexType.HNSW)),
+    ("hnsw+sq8", EndpointIndexConfig(index_type=IndexType.HNSW, quantization=Quantization.SQ8)),
+    ("ivf", EndpointIndexConfig(index_type=IndexType.IVF)),
+    ("ivf+sq8", EndpointIndexConfig(index_type=IndexType.IVF, quantization=Quantization.SQ8)),
+    ("ivf+pq", EndpointIndexConfig(index_type=IndexType.IVF, quantization=Quantization.PQ)),
+]
+
+
+def _vectors(count: int, dimension: int, topics: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = np.random.default_rng(0).normal(size=(topics, dimension))
+    vectors = centers[rng.integers(0, topics, count)] + 0.5 * rng.normal(size=(count, dimension))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _latencies_us(index: faiss.Index, queries: np.ndarray, k: int) -> np.ndarray:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query[None, :], k)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return np.array(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, nargs="+", default=[5000, 20000])
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=1, help="FAISS OpenMP threads")
+    args = parser.parse_args()
+
+    faiss.omp_set_num_threads(args.threads)
+    for count in args.vectors:
+        topics = max(10, count // 100)
+        vectors = _vectors(count, args.dimension, topics, seed=1)
+        queries = _vectors(args.queries, args.dimension, topics, seed=2)
+        print(f"\n{count} vectors x {args.dimension} dims, {args.queries} queries, k={args.k}")
+        print(f"{'index':<11}{'build s':>9}{'MB':>9}{'p50 us':>9}{'p99 us':>9}{'recall@k':>10}")
+
+        exact = None
+        for name, config in CONFIGS:
+            start = time.perf_counter()
+            index = build_faiss_index(vectors, config)
+            build_seconds = time.perf_counter() - start
+            size_mb = faiss.serialize_index(index).nbytes / 2**20
+            latencies = _latencies_us(index, queries, args.k)
+            _, found = index.search(queries, args.k)
+            if exact is None:
+                exact = found
+            recall = np.mean([len(set(f) & set(e)) / args.k for f, e in zip(found, exact)])
+            print(
+                f"{name:<11}{build_seconds:>9.2f}{size_mb:>9.1f}"
+                f"{np.percentile(latencies, 50):>9.0f}{np.percentile(latencies, 99):>9.0f}"
+                f"{recall:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark workflow build time and memory against endpoint catalog size.
+
+Compares the tool node setup of ``create_fmp_data_workflow``:
+
+* ``eager``: one ``StructuredTool`` built per catalog endpoint up front
+* ``lazy``: a name to factory index; tools are built on first use
+
+The catalog is grown by replicating registry entries under new names. Runs
+offline; no API keys needed.
+
+Usage:
+    python scripts/bench_workflow_build.py --sizes 200 1000 5000
+"""
+
+import argparse
+import gc
+import logging
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Tuple
+
+from fmp_data import FMPDataClient
+from fmp_data.lc import setup_registry
+from fmp_data.lc.vector_store import EndpointVectorStore
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from langchain_fmp_data.agent import BasicToolNode, endpoint_tool_factories
+
+
+class _ScaledRegistry:
+    """Registry view repeating the real catalog up to ``size`` endpoints."""
+
+    def __init__(self, registry: Any, size: int) -> None:
+        base = [
+            (name, info)
+            for name, info in registry.list_endpoints().items()
+            if not info.semantics.deprecated
+        ]
+        self._endpoints: Dict[str, Any] = {}
+        for i in range(size):
+            name, info = base[i % len(base)]
+            copy = info.model_copy(deep=True)
+            copy.semantics.method_name = f"{copy.semantics.method_name}_{i}"
+            self._endpoints[f"{name}_{i}"] = copy
+
+    def list_endpoints(self) -> Dict[str, Any]:
+        return self._endpoints
+
+    def get_endpoint(self, name: str) -> Any:
+        return self._endpoints.get(name)
+
+
+def _eager(vector_store: EndpointVectorStore) -> BasicToolNode:
+    tools = [
+        vector_store.create_tool(info) for info in vector_store.registry.list_endpoints().values()
+    ]
+    return BasicToolNode(tools)  # type: ignore[arg-type]
+
+
+def _lazy(vector_store: EndpointVectorStore) -> BasicToolNode:
+    return BasicToolNode([], tool_factories=endpoint_tool_factories(vector_store))
+
+
+def _measure(
+    build: Callable[[EndpointVectorStore], BasicToolNode], store: Any
+) -> Tuple[float, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    node = build(store)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del node
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000, 5000])
+    args = parser.parse_args()
+
+    client = FMPDataClient(api_key="bench")
+    registry, _ = setup_registry(client)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Renamed copies resolve no client method; silence the per-tool fallback warning
+        quiet = logging.getLogger("bench_workflow_build.store")
+        quiet.setLevel(logging.ERROR)
+        store = EndpointVectorStore(
+            client,
+            registry,
+            DeterministicFakeEmbedding(size=8),
+            cache_dir=cache_dir,
+            logger=quiet,
+        )
+        print(f"{'endpoints':>10}{'mode':>8}{'build s':>10}{'peak MB':>10}")
+        for size in args.sizes:
+            store.registry = _ScaledRegistry(registry, size)
+            for mode, build in (("eager", _eager), ("lazy", _lazy)):
+                seconds, peak_mb = _measure(build, store)
+                print(f"{size:>10}{mode:>8}{seconds:>10.3f}{peak_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
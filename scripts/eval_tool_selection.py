@@ -0,0 +1,146 @@
+"""Evaluate adaptive toolset sizing: prompt tokens saved against retrieval recall.
+
+For every labeled query the endpoint store is searched once; the fixed-size
+toolset ``call_model`` binds by default is compared with ``AdaptiveToolSelection``
+over a grid of relative gaps and score floors. Tool tokens are counted on the
+JSON of each bound OpenAI tool spec, which tracks what a tool schema adds to
+every model call.
+
+The labeled set is JSONL with ``query`` and the expected ``tools`` (tool names).
+
+Usage:
+    # Real embeddings (FMP_API_KEY and OPENAI_API_KEY, or a prebuilt index)
+    python scripts/eval_tool_selection.py --index-dir /opt/fmp-index
+
+    # Plumbing check with fake embeddings; the numbers are meaningless
+    python scripts/eval_tool_selection.py --offline
+"""
+
+import argparse
+import itertools
+import json
+import os
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import tiktoken
+from fmp_data.lc.vector_store import EndpointVectorStore, SearchResult
+
+from langchain_fmp_data.tool_selection import AdaptiveToolSelection
+from langchain_fmp_data.tool_specs import build_tool_spec_catalog
+
+DEFAULT_QUERIES = Path(__file__).parent / "tool_selection_queries.jsonl"
+
+
+def _load_store(args: argparse.Namespace) -> EndpointVectorStore:
+    if args.offline:
+        from fmp_data import FMPDataClient
+        from fmp_data.lc import setup_registry
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+
+        client = FMPDataClient(api_key="eval")
+        registry, _ = setup_registry(client)
+        store = EndpointVectorStore(
+            client, registry, DeterministicFakeEmbedding(size=64), cache_dir=tempfile.mkdtemp()
+        )
+        store.add_endpoints(list(registry.list_endpoints()))
+        return store
+
+    if args.index_dir:
+        from langchain_fmp_data.endpoint_index import load_vector_store
+
+        return load_vector_store(
+            fmp_api_key=os.environ["FMP_API_KEY"],
+            openai_api_key=os.environ["OPENAI_API_KEY"],
+            index_dir=args.index_dir,
+        )
+
+    from fmp_data.lc import create_vector_store
+
+    store = create_vector_store(
+        fmp_api_key=os.environ["FMP_API_KEY"], openai_api_key=os.environ["OPENAI_API_KEY"]
+    )
+    if store is None:
+        raise RuntimeError("Vector store initialization failed")
+    return store
+
+
+def _token_counter() -> Callable[[str], int]:
+    """Count tokens with tiktoken, estimating from length when it is unavailable."""
+    try:
+        encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"tiktoken encoding unavailable ({type(e).__name__}); estimating 4 chars/token")
+        return lambda text: len(text) // 4
+    return lambda text: len(encoding.encode(text))
+
+
+def _recall(selected: Sequence[SearchResult], expected: Sequence[str]) -> float:
+    names = {r.info.semantics.method_name for r in selected}
+    return len(names.intersection(expected)) / len(expected)
+
+
+def _summarize(
+    label: str,
+    selections: List[List[SearchResult]],
+    labels: List[Dict[str, Any]],
+    tool_tokens: Dict[str, int],
+    baseline_tokens: Optional[float],
+) -> float:
+    tokens = [sum(tool_tokens.get(r.info.semantics.method_name, 0) for r in s) for s in selections]
+    recalls = [_recall(s, row["tools"]) for s, row in zip(selections, labels)]
+    mean_tokens = statistics.mean(tokens)
+    saved = 1 - mean_tokens / baseline_tokens if baseline_tokens else 0.0
+    print(
+        f"{label:<28}"
+        f"{statistics.mean(len(s) for s in selections):>7.1f}"
+        f"{mean_tokens:>9.0f}"
+        f"{saved:>8.0%}"
+        f"{statistics.mean(recalls):>8.0%}"
+        f"{sum(r == 1 for r in recalls):>6}/{len(recalls)}"
+    )
+    return mean_tokens
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=Path, default=DEFAULT_QUERIES)
+    parser.add_argument("--index-dir", default=None, help="Prebuilt endpoint index")
+    parser.add_argument("--offline", action="store_true", help="Use fake embeddings")
+    parser.add_argument("--fixed-k", type=int, default=10, help="Baseline toolset size")
+    parser.add_argument("--min-tools", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--gaps", type=float, nargs="+", default=[0.05, 0.1, 0.2])
+    parser.add_argument("--min-scores", type=float, nargs="+", default=[0.3])
+    args = parser.parse_args()
+
+    labels = [json.loads(line) for line in args.queries.read_text().splitlines() if line]
+    store = _load_store(args)
+    count_tokens = _token_counter()
+    catalog = build_tool_spec_catalog(store)
+    tool_tokens = {name: count_tokens(json.dumps(spec)) for name, spec in catalog.specs.items()}
+
+    candidates = [store.search(row["query"], k=args.fixed_k, threshold=0) for row in labels]
+
+    print(f"{len(labels)} queries, {len(catalog)} tools")
+    print(f"{'selection':<28}{'tools':>7}{'tokens':>9}{'saved':>8}{'recall':>8}{'full':>9}")
+    # Baseline: what get_tools(query, k=fixed_k) binds today (default threshold 0.3)
+    fixed = [[r for r in found if r.score >= 0.3] for found in candidates]
+    baseline = _summarize(f"fixed k={args.fixed_k}", fixed, labels, tool_tokens, None)
+
+    for min_tools, gap, min_score in itertools.product(args.min_tools, args.gaps, args.min_scores):
+        selection = AdaptiveToolSelection(
+            min_tools=min_tools, max_tools=args.fixed_k, min_score=min_score, max_relative_gap=gap
+        )
+        _summarize(
+            f"min={min_tools} gap={gap:g} floor={min_score:g}",
+            [selection.select(found) for found in candidates],
+            labels,
+            tool_tokens,
+            baseline,
+        )
+
+
+if __name__ == "__main__":
+    main()
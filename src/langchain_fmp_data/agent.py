@@ -1,17 +1,54 @@
 import json
 import logging
-from typing import Annotated, Any, Dict, List, Literal, Sequence, TypedDict, cast
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from functools import partial
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+    cast,
+)
 
 from fmp_data.exceptions import FMPError
 from fmp_data.lc import EndpointVectorStore
-from langchain_core.messages import BaseMessage, ToolMessage
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool
 from langchain_openai import ChatOpenAI
 from langgraph.graph import START, MessagesState, StateGraph
 from langgraph.graph.message import add_messages
 
+from langchain_fmp_data.analytics import SESSION_ARG, SessionData
+from langchain_fmp_data.artifacts import ArtifactStore
+from langchain_fmp_data.coalesce import DEFAULT_BATCH_RULES, ToolCallCoalescer, split_batch_symbols
+from langchain_fmp_data.endpoint_health import EndpointHealth
+from langchain_fmp_data.model_tiers import ModelRouter
+from langchain_fmp_data.prefetch import SpeculativePrefetcher, ToolResultCache
+from langchain_fmp_data.price_store import PRICE_HISTORY_ENDPOINTS, PriceStore, cache_price_history
+from langchain_fmp_data.prompt_cache import PromptCacheConfig, PromptCacheStats
+from langchain_fmp_data.tool_selection import AdaptiveToolSelection
+from langchain_fmp_data.tool_specs import ToolSpecCatalog, specs_for_results, tool_spec
+
 logger = logging.getLogger(__name__)
 
+# Number of retrieved toolsets kept per workflow for reuse across steps
+_TOOLSET_CACHE_SIZE = 32
+
+# Number of lazily built endpoint tools kept per tool node
+DEFAULT_MAX_CACHED_TOOLS = 64
+
 
 class State(TypedDict):
     """Type definition for the graph state."""
@@ -19,44 +56,271 @@ class State(TypedDict):
     messages: Annotated[List[BaseMessage], add_messages]
 
 
+class RetrievalPolicy(str, Enum):
+    """Which message drives tool retrieval in ``call_model``, and how often.
+
+    ONCE_PER_USER_TURN retrieves on the latest human message and reuses that
+    toolset for every step until the user asks something new.
+    LATEST_HUMAN_MESSAGE retrieves on the latest human message at every step.
+    ORIGINAL_QUESTION retrieves once on the first human message of the
+    conversation and reuses that toolset throughout.
+    """
+
+    ONCE_PER_USER_TURN = "once_per_user_turn"
+    LATEST_HUMAN_MESSAGE = "latest_human_message"
+    ORIGINAL_QUESTION = "original_question"
+
+
 class ToolExecutionError(Exception):
     """Raised when there's an error executing a tool."""
 
     pass
 
 
+class ToolCallBudgetExceededError(ToolExecutionError):
+    """Raised when a query requests more tool calls than its budget allows."""
+
+    def __init__(self, budget: int) -> None:
+        self.budget = budget
+        super().__init__(f"Tool call budget of {budget} exceeded")
+
+
 class BasicToolNode:
     """
     A node that executes tools requested in the last AI message.
 
+    Tools can be registered eagerly, or as factories that are only called the
+    first time the model requests the tool; built tools are kept in a bounded
+    LRU cache. Local tools (such as the analytics tools) compute over earlier
+    tool results of the conversation, which they receive in their injected
+    ``session`` argument, and do not count against ``max_tool_calls``. With an
+    artifact store, large results are kept out of the conversation: the
+    ToolMessage carries a preview and the artifact handle. With endpoint
+    health tracking, endpoint calls go through a per-endpoint circuit breaker
+    and their failures become error results instead of aborting the run.
+
     Attributes:
-        tools_by_name: Dictionary mapping tool names to tool instances
+        tools_by_name: Dictionary mapping tool names to eagerly built tools
+        tool_factories: Dictionary mapping tool names to tool factories
+        local_tools: Dictionary mapping tool names to local tools
+        max_cached_tools: Maximum number of factory-built tools kept
+        max_tool_calls: Maximum number of tool calls allowed per user query
+            (None for no limit)
+        result_cache: Cache of prefetched tool results checked before invoking
+            a tool
+        coalescer: Optional coalescer answering per-symbol calls of one
+            message with a single batch call
+        artifact_store: Optional store holding large results out of band
+        endpoint_health: Optional per-endpoint circuit breaker and hedging
 
     Methods:
         __call__: Execute tools based on the input state
     """
 
-    def __init__(self, tools: List[BaseTool]) -> None:
+    def __init__(
+        self,
+        tools: List[BaseTool],
+        max_tool_calls: Optional[int] = None,
+        result_cache: Optional[ToolResultCache] = None,
+        tool_factories: Optional[Mapping[str, Callable[[], BaseTool]]] = None,
+        max_cached_tools: int = DEFAULT_MAX_CACHED_TOOLS,
+        coalescer: Optional[ToolCallCoalescer] = None,
+        local_tools: Optional[Sequence[BaseTool]] = None,
+        artifact_store: Optional[ArtifactStore] = None,
+        endpoint_health: Optional[EndpointHealth] = None,
+    ) -> None:
         """
         Initialize the tool node.
 
         Args:
             tools: List of available tools
+            max_tool_calls: Maximum number of tool calls allowed per user query
+            result_cache: Cache of prefetched tool results
+            tool_factories: Factories for tools built on first use
+            max_cached_tools: Maximum number of factory-built tools kept
+            coalescer: Optional coalescer for per-symbol tool calls
+            local_tools: Tools computing over the session's tool results
+            artifact_store: Optional store holding large results out of band
+            endpoint_health: Optional per-endpoint circuit breaker and hedging
         """
         self.tools_by_name: Dict[str, BaseTool] = {tool.name: tool for tool in tools}
+        self.tool_factories: Dict[str, Callable[[], BaseTool]] = dict(tool_factories or {})
+        self.max_cached_tools = max_cached_tools
+        self.max_tool_calls = max_tool_calls
+        self.result_cache = result_cache
+        self.coalescer = coalescer
+        self.local_tools: Dict[str, BaseTool] = {tool.name: tool for tool in local_tools or []}
+        self.artifact_store = artifact_store
+        self.endpoint_health = endpoint_health
+        self._built_tools: OrderedDict[str, BaseTool] = OrderedDict()
+        self._built_tools_lock = threading.Lock()
+
+    def has_tool(self, tool_name: str) -> bool:
+        """Check whether a tool is available, without building it."""
+        return (
+            tool_name in self.local_tools
+            or tool_name in self.tools_by_name
+            or tool_name in self.tool_factories
+        )
+
+    def get_tool(self, tool_name: str) -> Optional[BaseTool]:
+        """
+        Return a tool instance, building it from its factory on first use.
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            Tool instance, or None if the tool is unknown
+        """
+        tool = self.local_tools.get(tool_name) or self.tools_by_name.get(tool_name)
+        if tool is not None:
+            return tool
+
+        factory = self.tool_factories.get(tool_name)
+        if factory is None:
+            return None
+
+        with self._built_tools_lock:
+            tool = self._built_tools.get(tool_name)
+            if tool is not None:
+                self._built_tools.move_to_end(tool_name)
+                return tool
+
+        tool = factory()
+        with self._built_tools_lock:
+            self._built_tools[tool_name] = tool
+            while len(self._built_tools) > self.max_cached_tools:
+                self._built_tools.popitem(last=False)
+        return tool
+
+    def invoke_tool(self, tool_name: str, args: Dict[str, Any]) -> Any:
+        """
+        Invoke a tool, using a prefetched result when one is available.
+
+        With endpoint health tracking, the call goes through the endpoint's
+        circuit breaker and may be hedged.
+
+        Args:
+            tool_name: Name of the tool
+            args: Tool arguments
+
+        Returns:
+            Tool result
+        """
+        if self.result_cache is not None:
+            pending = self.result_cache.get(tool_name, args)
+            if pending is not None:
+                try:
+                    return pending.result()
+                except Exception as e:
+                    logger.debug(f"Prefetched {tool_name} failed, calling directly: {str(e)}")
+        tool = self.get_tool(tool_name)
+        if tool is None:
+            raise ValueError(f"Unknown tool: {tool_name}")
+        if self.endpoint_health is None:
+            return tool.invoke(args)
+        return self.endpoint_health.call(tool_name, lambda: tool.invoke(args))
+
+    def invoke_coalesced(self, tool_calls: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Answer per-symbol tool calls through batch tools where possible.
+
+        Calls with a prefetched result are left alone, and any call the batch
+        response does not answer falls back to its own request.
+
+        Args:
+            tool_calls: Tool calls of one model message
+
+        Returns:
+            Results keyed by tool call id
+        """
+        if self.coalescer is None:
+            return {}
+
+        pending = tool_calls
+        if self.result_cache is not None:
+            result_cache = self.result_cache
+            pending = [c for c in tool_calls if result_cache.get(c["name"], c["args"]) is None]
+
+        results: Dict[str, Any] = {}
+        for batch in self.coalescer.plan(pending):
+            if not self.has_tool(batch.rule.batch_tool):
+                continue
+            try:
+                batch_result = self.invoke_tool(batch.rule.batch_tool, batch.batch_args)
+            except Exception as e:
+                logger.debug(f"Batch {batch.rule.batch_tool} failed, calling per symbol: {str(e)}")
+                continue
+            answered = self.coalescer.split(batch, batch_result)
+            logger.debug(
+                f"Coalesced {len(answered)}/{len(batch.tool_calls)} {batch.tool_name} calls "
+                f"into {batch.rule.batch_tool}"
+            )
+            results.update(answered)
+        return results
+
+    def tool_message(
+        self, tool_name: str, tool_call_id: str, result: Any, thread_id: Optional[str] = None
+    ) -> ToolMessage:
+        """
+        Wrap a tool result in a ToolMessage, storing large results out of band.
 
-    def __call__(self, state: Dict[str, Any]) -> Dict[str, List[ToolMessage]]:
+        Args:
+            tool_name: Name of the tool
+            tool_call_id: Id of the tool call
+            result: Tool result
+            thread_id: Conversation whose artifacts hold a stored result
+
+        Returns:
+            ToolMessage with the serialized result, or a preview of it and
+            the artifact handle in ``artifact``
+        """
+        if self.artifact_store is None:
+            return ToolMessage(
+                content=json.dumps(result), name=tool_name, tool_call_id=tool_call_id
+            )
+        content, handle = self.artifact_store.offload(result, bool(self.local_tools), thread_id)
+        return ToolMessage(
+            content=content, name=tool_name, tool_call_id=tool_call_id, artifact=handle
+        )
+
+    def session(
+        self, messages: Sequence[BaseMessage], thread_id: Optional[str] = None
+    ) -> SessionData:
+        """Collect the session's tool results, resolving artifact handles."""
+        store = self.artifact_store
+        if store is None:
+            return SessionData.from_messages(messages)
+        return SessionData.from_messages(messages, lambda handle: store.get(handle, thread_id))
+
+    @staticmethod
+    def count_tool_calls(messages: Sequence[BaseMessage], exclude: Collection[str] = ()) -> int:
+        """Count tool results produced since the latest human message."""
+        count = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            if isinstance(message, ToolMessage) and message.name not in exclude:
+                count += 1
+        return count
+
+    def __call__(
+        self, state: Dict[str, Any], config: Optional[RunnableConfig] = None
+    ) -> Dict[str, List[ToolMessage]]:
         """
         Execute tools based on the input state.
 
         Args:
             state: Current state containing messages
+            config: Run config; its thread id scopes stored artifacts
 
         Returns:
             Dictionary containing tool execution results
 
         Raises:
             ValueError: If no message is found or invalid tool call
+            ToolCallBudgetExceededError: If the tool call budget is exhausted
             ToolExecutionError: If tool execution fails
         """
         try:
@@ -68,21 +332,37 @@ class BasicToolNode:
             if not hasattr(message, "tool_calls"):
                 raise ValueError("Last message contains no tool calls")
 
+            if self.max_tool_calls is not None:
+                requested = self.count_tool_calls(messages, self.local_tools) + sum(
+                    1 for call in message.tool_calls if call["name"] not in self.local_tools
+                )
+                if requested > self.max_tool_calls:
+                    raise ToolCallBudgetExceededError(self.max_tool_calls)
+
             outputs: List[ToolMessage] = []
+            thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
 
             for tool_call in message.tool_calls:
-                tool_name = tool_call["name"]
-                if tool_name not in self.tools_by_name:
-                    raise ValueError(f"Unknown tool: {tool_name}")
+                if not self.has_tool(tool_call["name"]):
+                    raise ValueError(f"Unknown tool: {tool_call['name']}")
 
+            coalesced = self.invoke_coalesced(message.tool_calls)
+
+            for tool_call in message.tool_calls:
+                tool_name = tool_call["name"]
                 try:
-                    tool_result = self.tools_by_name[tool_name].invoke(tool_call["args"])
-                    outputs.append(
-                        ToolMessage(
-                            content=json.dumps(tool_result),
-                            name=tool_name,
-                            tool_call_id=tool_call["id"],
+                    if tool_call["id"] in coalesced:
+                        tool_result = coalesced[tool_call["id"]]
+                    elif tool_name in self.local_tools:
+                        # Results of earlier calls in this step are usable too
+                        session = self.session([*messages, *outputs], thread_id)
+                        tool_result = self.local_tools[tool_name].invoke(
+                            {**tool_call["args"], SESSION_ARG: session}
                         )
+                    else:
+                        tool_result = self.invoke_tool(tool_name, tool_call["args"])
+                    outputs.append(
+                        self.tool_message(tool_name, tool_call["id"], tool_result, thread_id)
                     )
                 except Exception as e:
                     logger.error(f"Tool execution failed: {str(e)}", exc_info=True)
@@ -130,6 +410,88 @@ def should_continue(state: MessagesState) -> Literal["tools", "__end__"]:
         return "__end__"
 
 
+def select_retrieval_query(
+    messages: Sequence[BaseMessage], policy: RetrievalPolicy
+) -> Tuple[str, str]:
+    """
+    Pick the text to retrieve tools for under the given policy.
+
+    Tool results are never used as retrieval queries: embedding a large JSON
+    payload is slow and can swap the toolset out mid-analysis.
+
+    Args:
+        messages: Conversation messages
+        policy: Retrieval policy
+
+    Returns:
+        Tuple of (cache key, query); the key identifies the human message the
+        query came from
+    """
+    human_messages = [m for m in messages if isinstance(m, HumanMessage)]
+    if human_messages:
+        if policy == RetrievalPolicy.ORIGINAL_QUESTION:
+            source: BaseMessage = human_messages[0]
+        else:
+            source = human_messages[-1]
+    else:
+        source = messages[-1]
+
+    content = source.content
+    # Ensure query is a string for get_tools
+    query = content if isinstance(content, str) else str(content)
+    return source.id or query, query
+
+
+def tool_name(tool: Any) -> Optional[str]:
+    """Return the name of a tool, OpenAI function spec or OpenAI tool spec."""
+    if isinstance(tool, dict):
+        function = tool.get("function")
+        return function.get("name") if isinstance(function, dict) else tool.get("name")
+    return getattr(tool, "name", None)
+
+
+def endpoint_tool_factories(
+    vector_store: EndpointVectorStore,
+    price_store: Optional[PriceStore] = None,
+) -> Dict[str, Callable[[], BaseTool]]:
+    """
+    Index the endpoint catalog by tool name without building any tool.
+
+    Batch endpoint tools are wrapped so their comma-separated ``symbols``
+    argument reaches the client as a list.
+
+    Args:
+        vector_store: Vector store whose registry and client back the tools
+        price_store: Optional local store serving historical price tools
+
+    Returns:
+        Dictionary mapping tool names to factories creating the tool
+    """
+
+    batch_rules = {rule.batch_tool: rule for rule in DEFAULT_BATCH_RULES.values()}
+
+    def create(endpoint_name: str) -> BaseTool:
+        info = vector_store.registry.get_endpoint(endpoint_name)
+        if info is None:
+            raise ValueError(f"Endpoint {endpoint_name} is no longer registered")
+        tool = cast(BaseTool, vector_store.create_tool(info))
+        method_name = info.semantics.method_name
+        rule = batch_rules.get(method_name)
+        if rule is not None:
+            return split_batch_symbols(tool, rule)
+        if price_store is not None and method_name in PRICE_HISTORY_ENDPOINTS:
+            return cache_price_history(tool, price_store, PRICE_HISTORY_ENDPOINTS[method_name])
+        return tool
+
+    factories: Dict[str, Callable[[], BaseTool]] = {}
+    for endpoint_name, info in vector_store.registry.list_endpoints().items():
+        semantics = info.semantics
+        if semantics.deprecated:
+            continue
+        factories[semantics.method_name] = partial(create, endpoint_name)
+    return factories
+
+
 def validate_workflow_params(
     vector_store: EndpointVectorStore, model: ChatOpenAI, max_toolset_size: int
 ) -> None:
@@ -153,15 +515,64 @@ def create_fmp_data_workflow(
     model: ChatOpenAI,
     max_toolset_size: int = 10,
     max_retries: int = 3,
+    max_tool_calls: Optional[int] = None,
+    retrieval_policy: RetrievalPolicy = RetrievalPolicy.ONCE_PER_USER_TURN,
+    prefetcher: Optional[SpeculativePrefetcher] = None,
+    tool_specs: Optional[ToolSpecCatalog] = None,
+    tool_selection: Optional[AdaptiveToolSelection] = None,
+    prompt_cache: Optional[PromptCacheConfig] = None,
+    prompt_cache_stats: Optional[PromptCacheStats] = None,
+    coalescer: Optional[ToolCallCoalescer] = None,
+    price_store: Optional[PriceStore] = None,
+    local_tools: Optional[Sequence[BaseTool]] = None,
+    artifact_store: Optional[ArtifactStore] = None,
+    stop_after_data: bool = False,
+    model_router: Optional[ModelRouter] = None,
+    endpoint_health: Optional[EndpointHealth] = None,
 ) -> StateGraph:
     """
     Create a workflow for processing FMP data queries.
 
+    The number of agent iterations is bounded at run time through LangGraph's
+    ``recursion_limit`` config key; ``max_tool_calls`` additionally caps the
+    total number of tool calls made while answering a single user query.
+
     Args:
         vector_store: Vector store for tool retrieval
         model: ChatOpenAI model instance
         max_toolset_size: Maximum number of tools to use
         max_retries: Maximum number of retries for model calls (default: 3)
+        max_tool_calls: Maximum number of tool calls per query (default: no limit)
+        retrieval_policy: When to retrieve a fresh toolset
+            (default: once per user turn)
+        prefetcher: Optional prefetcher that starts likely tool calls while the
+            model is generating its first response of a turn
+        tool_specs: Optional precomputed OpenAI tool specs bound instead of
+            converting tool schemas at every step
+        tool_selection: Optional score-based toolset sizing; when given, its
+            bounds replace the fixed ``max_toolset_size``
+        prompt_cache: Optional arrangement of bound tools (pinned tools first,
+            the rest in canonical order) that keeps the prompt prefix cacheable
+        prompt_cache_stats: Optional recorder of provider-reported cached
+            tokens and model call latency
+        coalescer: Optional coalescer sending same-endpoint per-symbol tool
+            calls of one step as a single batch request
+        price_store: Optional local store answering historical price tool
+            calls and fetching only the date ranges it is missing
+        local_tools: Optional tools run by the tool node over the session's
+            tool results (such as the analytics tools); they are bound at
+            every step, after any pinned tools
+        artifact_store: Optional store keeping large tool results out of the
+            messages sent back to the model
+        stop_after_data: Drop the model's final text answer once the turn
+            has fetched data, so the run ends on the last tool results; the
+            model still decides when it has all the data it needs. For
+            callers that want the tool data rather than prose
+        model_router: Optional router sending tool-calling steps to a faster
+            model and final answers to ``model``
+        endpoint_health: Optional per-endpoint circuit breaker that turns
+            calls to a failing endpoint into short error results, and hedges
+            slow calls when configured
 
     Returns:
         Configured StateGraph instance
@@ -173,6 +584,88 @@ def create_fmp_data_workflow(
     if max_toolset_size < 1:
         raise ValueError("max_toolset_size must be greater than 0")
 
+    if max_tool_calls is not None and max_tool_calls < 1:
+        raise ValueError("max_tool_calls must be greater than 0")
+
+    # Recently retrieved toolsets keyed by the human message they were
+    # retrieved for, so later steps of the same turn skip the embedding call.
+    toolsets: OrderedDict[str, Sequence[Any]] = OrderedDict()
+    toolsets_lock = threading.Lock()
+
+    def search_tools(query: str) -> Sequence[Any]:
+        """Find the tools to bind for a retrieval query."""
+        if tool_selection is None and tool_specs is None:
+            return vector_store.get_tools(query, k=max_toolset_size, provider="openai")
+
+        if tool_selection is None:
+            results = vector_store.search(query, k=max_toolset_size)
+        else:
+            # Scores are filtered by the selection, which also keeps min_tools
+            candidates = vector_store.search(query, k=tool_selection.max_tools, threshold=0)
+            results = tool_selection.select(candidates)
+        return specs_for_results(vector_store, results, tool_specs)
+
+    def retrieve_tools(messages: Sequence[BaseMessage]) -> Sequence[Any]:
+        """Retrieve the toolset for the current step according to the policy."""
+        key, query = select_retrieval_query(messages, retrieval_policy)
+        reuse = retrieval_policy != RetrievalPolicy.LATEST_HUMAN_MESSAGE
+
+        if reuse:
+            with toolsets_lock:
+                if key in toolsets:
+                    toolsets.move_to_end(key)
+                    return toolsets[key]
+
+        match_tools = search_tools(query)
+
+        if reuse:
+            with toolsets_lock:
+                toolsets[key] = match_tools
+                while len(toolsets) > _TOOLSET_CACHE_SIZE:
+                    toolsets.popitem(last=False)
+        return match_tools
+
+    pinned_specs: List[Any] = []
+    local_specs = [tool_spec(tool) for tool in local_tools or []]
+
+    def arrange_tools(match_tools: Sequence[Any]) -> Sequence[Any]:
+        """Put pinned and local tools first and order the rest canonically."""
+        if prompt_cache is None:
+            return [*local_specs, *match_tools]
+
+        if prompt_cache.pinned_tools and not pinned_specs:
+            for name in prompt_cache.pinned_tools:
+                if tool_specs is not None and name in tool_specs:
+                    pinned_specs.append(tool_specs.specs[name])
+                else:
+                    pinned_specs.append(tool_spec(tool_node.get_tool(name)))
+
+        pinned = set(prompt_cache.pinned_tools)
+        rest = [tool for tool in match_tools if tool_name(tool) not in pinned]
+        if prompt_cache.canonical_tool_order:
+            rest.sort(key=lambda tool: tool_name(tool) or "")
+        return [*pinned_specs, *local_specs, *rest]
+
+    def invoke_model(runnable: Any, messages: Sequence[BaseMessage]) -> BaseMessage:
+        """Invoke the model, recording prompt cache usage when requested."""
+        start = time.perf_counter()
+        response = runnable.invoke(messages)
+        if prompt_cache_stats is not None:
+            prompt_cache_stats.record(response, time.perf_counter() - start)
+        return cast(BaseMessage, response)
+
+    def prefetch_tools(messages: Sequence[BaseMessage], match_tools: Sequence[Any]) -> None:
+        """Start likely tool calls for a new user turn in the background."""
+        if prefetcher is None:
+            return
+        _, query = select_retrieval_query(messages, RetrievalPolicy.LATEST_HUMAN_MESSAGE)
+        names = [tool_name(tool) for tool in match_tools]
+        try:
+            prefetcher.prefetch(query, [n for n in names if n], tool_node.get_tool)
+        except Exception as e:
+            # Prefetching is an optimization; never fail the model call over it
+            logger.warning(f"Tool prefetch failed: {str(e)}")
+
     def call_model(state: MessagesState) -> Dict[str, List[BaseMessage]]:
         """Process messages with the model."""
         retry_count = 0
@@ -180,20 +673,28 @@ def create_fmp_data_workflow(
         while retry_count < max_retries:
             try:
                 messages = state["messages"]
-                query_content = messages[-1].content
-                # Ensure query is a string for get_tools
-                query = query_content if isinstance(query_content, str) else str(query_content)
+                match_tools = retrieve_tools(messages)
 
-                match_tools = vector_store.get_tools(query, k=max_toolset_size, provider="openai")
+                if prefetcher is not None and isinstance(messages[-1], HumanMessage):
+                    prefetch_tools(messages, match_tools)
+
+                match_tools = arrange_tools(match_tools)
 
                 if not match_tools:
                     logger.warning("No matching tools found for query")
-                    return {"messages": [model.invoke(messages)]}
+                    return {"messages": [invoke_model(model, messages)]}
+
+                if model_router is not None:
+                    names = {name for name in map(tool_name, match_tools) if name}
+                    response = model_router.invoke(
+                        model, match_tools, names, messages, invoke_model
+                    )
+                    return {"messages": [response]}
 
                 # Cast tools to the expected type for bind_tools
                 tools_list = cast(Sequence[BaseTool], match_tools)
                 model_with_tools = model.bind_tools(tools=tools_list)
-                response = model_with_tools.invoke(messages)
+                response = invoke_model(model_with_tools, messages)
 
                 return {"messages": [response]}
 
@@ -214,18 +715,48 @@ def create_fmp_data_workflow(
         raise RuntimeError("Max retries exceeded without resolution")
 
     try:
-        # Initialize workflow components
-        all_tools = vector_store.get_tools()
-        # Cast tools to List[BaseTool] for BasicToolNode
-        tools_list = cast(List[BaseTool], list(all_tools))
-        tool_node = BasicToolNode(tools_list)
+        # Initialize workflow components; endpoint tools are built on first use
+        tool_node = BasicToolNode(
+            [],
+            tool_factories=endpoint_tool_factories(vector_store, price_store),
+            max_tool_calls=max_tool_calls,
+            result_cache=prefetcher.cache if prefetcher is not None else None,
+            coalescer=coalescer,
+            local_tools=local_tools,
+            artifact_store=artifact_store,
+            endpoint_health=endpoint_health,
+        )
+        if prompt_cache is not None:
+            for name in prompt_cache.pinned_tools:
+                if not tool_node.has_tool(name):
+                    raise ValueError(f"Unknown pinned tool: {name}")
         workflow: StateGraph[MessagesState] = StateGraph(MessagesState)
 
+        def call_model_for_data(state: MessagesState) -> Dict[str, List[BaseMessage]]:
+            """Call the model, dropping its final answer once the turn has data."""
+            update = call_model(state)
+            response = update["messages"][-1]
+            if not getattr(response, "tool_calls", None) and tool_node.count_tool_calls(
+                state["messages"]
+            ):
+                return {"messages": []}
+            return update
+
+        def should_continue_for_data(state: MessagesState) -> Literal["tools", "__end__"]:
+            # A dropped answer leaves the turn ending on its tool results
+            if isinstance(state["messages"][-1], ToolMessage):
+                return "__end__"
+            return should_continue(state)
+
         # Add nodes and edges
-        workflow.add_node("agent", call_model)  # type: ignore[arg-type]
+        if stop_after_data:
+            workflow.add_node("agent", call_model_for_data)  # type: ignore[arg-type]
+            workflow.add_conditional_edges("agent", should_continue_for_data)
+        else:
+            workflow.add_node("agent", call_model)  # type: ignore[arg-type]
+            workflow.add_conditional_edges("agent", should_continue)
         workflow.add_node("tools", tool_node)  # type: ignore[arg-type, type-var]
         workflow.add_edge(START, "agent")
-        workflow.add_conditional_edges("agent", should_continue)
         workflow.add_edge("tools", "agent")
 
         return workflow
@@ -0,0 +1,550 @@
+"""Local NumPy analytics over tool results already fetched in a session.
+
+Left to itself the model pulls statements and price series into its context
+and works out growth rates, margins and averages over the raw JSON, which is
+slow, token-heavy and error-prone. The tools created by
+``create_analytics_tools`` run vectorized NumPy calculations instead, over
+results fetched earlier in the conversation and referenced by the
+``tool_call_id`` of the call that produced them, and return small summaries.
+
+``BasicToolNode`` runs these tools locally. It passes the session's tool
+results in the injected ``session`` argument, which is not part of the schema
+the model sees, and does not count the calls against the FMP call budget.
+``select_rows`` reads bounded slices of a result, for results the tool node
+kept out of the conversation in an artifact store.
+"""
+
+import json
+from typing import Annotated, Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from langchain_core.messages import BaseMessage, ToolMessage
+from langchain_core.tools import BaseTool, InjectedToolArg, StructuredTool
+from pydantic import BaseModel, Field
+
+from langchain_fmp_data.price_store import to_date
+
+#: Name of the injected argument carrying the session's tool results
+SESSION_ARG = "session"
+
+#: Row fields holding the date of a record, in order of preference
+DATE_FIELDS = ("date", "price_date")
+
+#: Maximum number of per-period values listed in a summary
+MAX_LISTED_VALUES = 12
+
+#: Maximum number of rows returned by select_rows
+MAX_SELECTED_ROWS = 50
+
+_DAYS_PER_YEAR = 365.25
+
+Series = Tuple[Optional[np.ndarray], np.ndarray]
+
+
+class SessionData:
+    """
+    Tool results of a conversation keyed by tool call id.
+
+    Attributes:
+        results: Parsed tool results keyed by tool call id
+        names: Tool names keyed by tool call id
+        expired: Tool call ids whose results were evicted from the artifact store
+    """
+
+    def __init__(
+        self,
+        results: Optional[Dict[str, Any]] = None,
+        names: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Initialize the session data.
+
+        Args:
+            results: Parsed tool results keyed by tool call id
+            names: Tool names keyed by tool call id
+        """
+        self.results: Dict[str, Any] = dict(results or {})
+        self.names: Dict[str, str] = dict(names or {})
+        self.expired: Set[str] = set()
+
+    @classmethod
+    def from_messages(
+        cls,
+        messages: Sequence[BaseMessage],
+        resolve: Optional[Callable[[str], Any]] = None,
+    ) -> "SessionData":
+        """
+        Collect the JSON tool results of a conversation.
+
+        Args:
+            messages: Conversation messages
+            resolve: Optional lookup of the full result behind a message's
+                artifact handle, returning None once it has been evicted
+
+        Returns:
+            Session data holding every tool result that parses as JSON
+        """
+        session = cls()
+        for message in messages:
+            if not isinstance(message, ToolMessage) or not isinstance(message.content, str):
+                continue
+            if resolve is not None and isinstance(message.artifact, str):
+                session.names[message.tool_call_id] = message.name or ""
+                result = resolve(message.artifact)
+                if result is None:
+                    session.expired.add(message.tool_call_id)
+                else:
+                    session.results[message.tool_call_id] = result
+                continue
+            try:
+                session.results[message.tool_call_id] = json.loads(message.content)
+            except json.JSONDecodeError:
+                continue
+            session.names[message.tool_call_id] = message.name or ""
+        return session
+
+    def get(self, source: str) -> Any:
+        """
+        Return the result of an earlier tool call.
+
+        Args:
+            source: Tool call id of the result
+
+        Returns:
+            Parsed tool result
+
+        Raises:
+            ValueError: If no result has that id, it has expired from the
+                artifact store or it is an error result
+        """
+        if source in self.expired:
+            raise ValueError(
+                f"Tool result {source} has expired from the artifact store; fetch it again"
+            )
+        if source not in self.results:
+            available = ", ".join(f"{key} ({name})" for key, name in self.names.items())
+            raise ValueError(f"No tool result with id {source}; available: {available or 'none'}")
+        result = self.results[source]
+        if isinstance(result, dict) and result.get("status") == "error":
+            raise ValueError(f"Tool result {source} is an error result")
+        return result
+
+    def series(self, source: str, field: str) -> Series:
+        """
+        Extract a numeric field of an earlier result as a chronological series.
+
+        Rows are sorted by their date when the result is dated; otherwise
+        they are taken as FMP returns them, newest first. Rows without a
+        numeric value, and undated rows of a dated result, are skipped.
+
+        Args:
+            source: Tool call id of the result
+            field: Numeric field of the result rows
+
+        Returns:
+            Dates (None for undated rows) and values, oldest first
+
+        Raises:
+            ValueError: If the result has no numeric values for the field
+        """
+        rows = result_rows(self.get(source))
+        rows = [
+            row
+            for row in rows
+            if isinstance(row.get(field), (int, float)) and not isinstance(row[field], bool)
+        ]
+        date_field = _date_field(rows)
+        if date_field is not None:
+            rows = [row for row in rows if row.get(date_field)]
+        if not rows:
+            raise ValueError(f"Tool result {source} has no numeric values for {field}")
+
+        values = np.array([float(row[field]) for row in rows], dtype=np.float64)
+        if date_field is None:
+            return None, values[::-1]
+
+        dates = np.array([to_date(row[date_field]) for row in rows], dtype="datetime64[D]")
+        order = np.argsort(dates, kind="stable")
+        return dates[order], values[order]
+
+
+def _date_field(rows: List[Dict[str, Any]]) -> Optional[str]:
+    """Return the date field of a result's rows, if any row has one."""
+    return next((key for key in DATE_FIELDS if any(row.get(key) for row in rows)), None)
+
+
+def result_rows(result: Any) -> List[Dict[str, Any]]:
+    """
+    Return the records of a tool result.
+
+    Handles lists of records, records nested under a single list field (such
+    as ``historical``) and single records.
+
+    Args:
+        result: Parsed tool result
+
+    Returns:
+        Records of the result
+    """
+    data = result.get("data") if isinstance(result, dict) and "data" in result else result
+    if isinstance(data, dict):
+        lists = [value for value in data.values() if isinstance(value, list)]
+        data = lists[0] if len(lists) == 1 else [data]
+    if not isinstance(data, list):
+        return []
+    return [row for row in data if isinstance(row, dict)]
+
+
+def cagr(start_value: float, end_value: float, years: float) -> float:
+    """
+    Compound annual growth rate between two values.
+
+    Args:
+        start_value: First value
+        end_value: Last value
+        years: Years between the two values
+
+    Returns:
+        Growth rate per year as a fraction
+
+    Raises:
+        ValueError: If the values are not positive or no time elapsed
+    """
+    if start_value <= 0 or end_value <= 0:
+        raise ValueError("CAGR needs positive start and end values")
+    if years <= 0:
+        raise ValueError("CAGR needs values at least one period apart")
+    return float((end_value / start_value) ** (1.0 / years) - 1.0)
+
+
+def rolling_returns(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Simple returns over a rolling window of observations.
+
+    Args:
+        values: Series, oldest first
+        window: Number of observations per return
+
+    Returns:
+        Returns ending at each observation from ``window`` on
+
+    Raises:
+        ValueError: If the series is not longer than the window
+    """
+    if window < 1 or len(values) <= window:
+        raise ValueError(f"Need more than {window} observations for {window}-period returns")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = values[window:] / values[:-window] - 1.0
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+
+def zscores(values: np.ndarray, window: Optional[int] = None) -> np.ndarray:
+    """
+    Z-scores against the whole series or a trailing window.
+
+    Args:
+        values: Series, oldest first
+        window: Trailing window size (None for the whole series)
+
+    Returns:
+        Z-scores (NaN where undefined), aligned with the end of the series
+
+    Raises:
+        ValueError: If there are too few observations
+    """
+    if window is None:
+        if len(values) < 2:
+            raise ValueError("Need at least 2 observations for z-scores")
+        mean, std = values.mean(), values.std()
+        return (values - mean) / std if std else np.full_like(values, np.nan)
+
+    if window < 2 or len(values) < window:
+        raise ValueError(f"Need at least {window} observations for {window}-period z-scores")
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    means, stds = windows.mean(axis=1), windows.std(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = (values[window - 1 :] - means) / stds
+    scores[~np.isfinite(scores)] = np.nan
+    return scores
+
+
+def _number(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 6)
+
+
+def _day(dates: Optional[np.ndarray], index: int) -> Optional[str]:
+    return None if dates is None else str(dates[index])
+
+
+def _summary(values: np.ndarray, dates: Optional[np.ndarray]) -> Dict[str, Any]:
+    """Latest, mean, spread and extremes of a series with NaN gaps."""
+    valid = ~np.isnan(values)
+    if not valid.any():
+        raise ValueError("No defined values to summarize")
+    low, high = int(np.nanargmin(values)), int(np.nanargmax(values))
+    latest = int(np.flatnonzero(valid)[-1])
+    return {
+        "count": int(valid.sum()),
+        "latest": _number(values[latest]),
+        "latest_date": _day(dates, latest),
+        "mean": _number(np.nanmean(values)),
+        "std": _number(np.nanstd(values)),
+        "min": _number(values[low]),
+        "min_date": _day(dates, low),
+        "max": _number(values[high]),
+        "max_date": _day(dates, high),
+    }
+
+
+class CagrInput(BaseModel):
+    """Input for compute_cagr."""
+
+    source: str = Field(..., description="tool_call_id of an earlier tool result")
+    field: str = Field(..., description="Numeric field of its rows, e.g. close or revenue")
+    periods_per_year: Optional[float] = Field(
+        default=None,
+        description="Rows per year for rows without dates (1 for annual, 4 for quarterly)",
+    )
+    session: Annotated[Any, InjectedToolArg] = None
+
+
+class RollingReturnsInput(BaseModel):
+    """Input for compute_rolling_returns."""
+
+    source: str = Field(..., description="tool_call_id of an earlier tool result")
+    field: str = Field(..., description="Numeric field of its rows, e.g. close")
+    window: int = Field(..., description="Observations per return, e.g. 21 for monthly")
+    session: Annotated[Any, InjectedToolArg] = None
+
+
+class RatioInput(BaseModel):
+    """Input for compute_ratio."""
+
+    source: str = Field(..., description="tool_call_id of the result holding the numerator")
+    numerator: str = Field(..., description="Numerator field, e.g. net_income")
+    denominator: str = Field(..., description="Denominator field, e.g. revenue")
+    denominator_source: Optional[str] = Field(
+        default=None,
+        description="tool_call_id of the result holding the denominator, if different",
+    )
+    session: Annotated[Any, InjectedToolArg] = None
+
+
+class ZScoresInput(BaseModel):
+    """Input for compute_zscores."""
+
+    source: str = Field(..., description="tool_call_id of an earlier tool result")
+    field: str = Field(..., description="Numeric field of its rows")
+    window: Optional[int] = Field(
+        default=None, description="Trailing window size (defaults to the whole series)"
+    )
+    session: Annotated[Any, InjectedToolArg] = None
+
+
+class SelectRowsInput(BaseModel):
+    """Input for select_rows."""
+
+    source: str = Field(..., description="tool_call_id of an earlier tool result")
+    fields: Optional[List[str]] = Field(
+        default=None, description="Fields to return besides the date (defaults to all)"
+    )
+    start_date: Optional[str] = Field(default=None, description="First date, YYYY-MM-DD")
+    end_date: Optional[str] = Field(default=None, description="Last date, YYYY-MM-DD")
+    limit: int = Field(
+        default=20, description=f"Maximum rows returned, at most {MAX_SELECTED_ROWS}"
+    )
+    session: Annotated[Any, InjectedToolArg] = None
+
+
+def _session(session: Any) -> SessionData:
+    if not isinstance(session, SessionData):
+        raise ValueError("Analytics tools run inside the FMP agent's tool node")
+    return session
+
+
+def _run_analytics(compute: Any, **kwargs: Any) -> Dict[str, Any]:
+    """Wrap a computation in the success or error shape of FMP tool results."""
+    try:
+        return {"status": "success", "data": compute(**kwargs)}
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+
+
+def _cagr(
+    source: str, field: str, periods_per_year: Optional[float] = None, session: Any = None
+) -> Dict[str, Any]:
+    dates, values = _session(session).series(source, field)
+    if dates is not None:
+        years = float((dates[-1] - dates[0]) / np.timedelta64(1, "D")) / _DAYS_PER_YEAR
+    elif periods_per_year:
+        years = (len(values) - 1) / periods_per_year
+    else:
+        raise ValueError("Rows have no dates; pass periods_per_year")
+    return {
+        "start_date": _day(dates, 0),
+        "end_date": _day(dates, -1),
+        "start_value": _number(values[0]),
+        "end_value": _number(values[-1]),
+        "years": round(years, 4),
+        "cagr": round(cagr(values[0], values[-1], years), 6),
+    }
+
+
+def _rolling_returns(source: str, field: str, window: int, session: Any = None) -> Dict[str, Any]:
+    dates, values = _session(session).series(source, field)
+    returns = rolling_returns(values, window)
+    return {"window": window, **_summary(returns, None if dates is None else dates[window:])}
+
+
+def _ratio(
+    source: str,
+    numerator: str,
+    denominator: str,
+    denominator_source: Optional[str] = None,
+    session: Any = None,
+) -> Dict[str, Any]:
+    data = _session(session)
+    num_dates, num = data.series(source, numerator)
+    den_dates, den = data.series(denominator_source or source, denominator)
+
+    dates: Optional[np.ndarray] = None
+    if num_dates is not None and den_dates is not None:
+        dates, num_index, den_index = np.intersect1d(num_dates, den_dates, return_indices=True)
+        num, den = num[num_index], den[den_index]
+    elif len(num) != len(den):
+        raise ValueError("Undated series of different lengths cannot be aligned")
+    if not len(num):
+        raise ValueError("The two series share no dates")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = num / den
+    ratios[~np.isfinite(ratios)] = np.nan
+
+    recent = range(max(0, len(ratios) - MAX_LISTED_VALUES), len(ratios))
+    return {
+        **_summary(ratios, dates),
+        "values": [{"date": _day(dates, i), "value": _number(ratios[i])} for i in recent],
+    }
+
+
+def _zscores(
+    source: str, field: str, window: Optional[int] = None, session: Any = None
+) -> Dict[str, Any]:
+    dates, values = _session(session).series(source, field)
+    scores = zscores(values, window)
+    offset = len(values) - len(scores)
+    if np.isnan(scores).all():
+        raise ValueError(f"{field} does not vary, z-scores are undefined")
+    extreme = int(np.nanargmax(np.abs(scores)))
+    latest_window = values[-window:] if window else values
+    return {
+        "window": window,
+        "latest_value": _number(values[-1]),
+        "latest_zscore": _number(scores[-1]),
+        "mean": _number(latest_window.mean()),
+        "std": _number(latest_window.std()),
+        "max_abs_zscore": _number(scores[extreme]),
+        "max_abs_date": _day(dates, extreme + offset),
+        "max_abs_value": _number(values[extreme + offset]),
+    }
+
+
+def _select_rows(
+    source: str,
+    fields: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = 20,
+    session: Any = None,
+) -> Dict[str, Any]:
+    rows = result_rows(_session(session).get(source))
+    date_field = _date_field(rows)
+    if start_date is not None or end_date is not None:
+        if date_field is None:
+            raise ValueError(f"Tool result {source} has no dates to filter on")
+        start = to_date(start_date) if start_date is not None else None
+        end = to_date(end_date) if end_date is not None else None
+        # Undated rows cannot fall within a date range
+        rows = [
+            row
+            for row in rows
+            if row.get(date_field)
+            and (start is None or to_date(row[date_field]) >= start)
+            and (end is None or to_date(row[date_field]) <= end)
+        ]
+
+    selected = rows[: max(1, min(limit, MAX_SELECTED_ROWS))]
+    if fields:
+        keep = [date_field, *fields] if date_field else fields
+        selected = [{key: row.get(key) for key in keep} for row in selected]
+    return {"total": len(rows), "returned": len(selected), "rows": selected}
+
+
+def create_analytics_tools() -> List[BaseTool]:
+    """
+    Create the local analytics tools.
+
+    Returns:
+        Tools computing CAGR, rolling returns, ratios and z-scores over
+        earlier tool results, and one selecting rows of them
+    """
+    return [
+        StructuredTool.from_function(
+            func=lambda **kwargs: _run_analytics(_cagr, **kwargs),
+            name="compute_cagr",
+            description=(
+                "Compound annual growth rate of a numeric field between the first "
+                "and last rows of an earlier tool result (prices, revenue, EPS)."
+            ),
+            args_schema=CagrInput,
+        ),
+        StructuredTool.from_function(
+            func=lambda **kwargs: _run_analytics(_rolling_returns, **kwargs),
+            name="compute_rolling_returns",
+            description=(
+                "Summary (latest, mean, std, min, max) of rolling returns over a "
+                "window of rows of an earlier tool result."
+            ),
+            args_schema=RollingReturnsInput,
+        ),
+        StructuredTool.from_function(
+            func=lambda **kwargs: _run_analytics(_ratio, **kwargs),
+            name="compute_ratio",
+            description=(
+                "Per-period ratio of two numeric fields, such as margins "
+                "(net_income / revenue), aligned by date across earlier tool results."
+            ),
+            args_schema=RatioInput,
+        ),
+        StructuredTool.from_function(
+            func=lambda **kwargs: _run_analytics(_zscores, **kwargs),
+            name="compute_zscores",
+            description=(
+                "Z-score of the latest value of a numeric field, and its most "
+                "extreme observation, over an earlier tool result."
+            ),
+            args_schema=ZScoresInput,
+        ),
+        StructuredTool.from_function(
+            func=lambda **kwargs: _run_analytics(_select_rows, **kwargs),
+            name="select_rows",
+            description=(
+                "Rows of an earlier tool result, optionally filtered by date range "
+                "and narrowed to some fields, in the order the result lists them."
+            ),
+            args_schema=SelectRowsInput,
+        ),
+    ]
+
+
+__all__ = [
+    "MAX_SELECTED_ROWS",
+    "SESSION_ARG",
+    "SessionData",
+    "cagr",
+    "create_analytics_tools",
+    "result_rows",
+    "rolling_returns",
+    "zscores",
+]
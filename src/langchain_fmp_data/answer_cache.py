@@ -0,0 +1,329 @@
+"""Semantic answer cache keyed on query embeddings.
+
+Exact-match caching misses paraphrases such as "AAPL share price now" and
+"AAPL stock price right now". ``SemanticAnswerCache`` stores earlier answers
+next to the embedding of their query and returns one when a new query is close
+enough, within a TTL. Entries are tagged with the tickers found in the query
+and only match queries naming exactly the same tickers, so answers for
+different symbols never collide however similar the wording. The numbers,
+dates and reporting periods of the query (years, quarters, annual or quarterly)
+are part of the tag too: "AAPL revenue 2020" and "AAPL revenue 2021" embed
+almost alike but ask for different data. Queries naming no ticker the cache
+can recognize are neither looked up nor stored: "price of aapl" and "price of
+msft" would otherwise share the empty ticker set. With a ``SymbolTable``,
+lower-case tickers and company names are recognized too.
+
+The query embedding is shared with tool retrieval: ``CachingEmbeddings``
+memoizes ``embed_query`` on the endpoint vector store, so embedding the query
+for the cache lookup costs nothing extra when the agent then retrieves tools
+for it.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+from fmp_data.lc.vector_store import EndpointVectorStore
+from langchain_core.embeddings import Embeddings
+
+from langchain_fmp_data.fast_path import SymbolTable
+from langchain_fmp_data.symbols import extract_tickers
+
+# Dates, quarters, numbers and reporting-period words changing what a query asks for
+_PERIOD_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}|\bQ[1-4]\b|(?<![\d.])\d+(?:\.\d+)?"
+    r"|\b(?:annual(?:ly)?|yearly|quarterly|quarters?|ttm|monthly|weekly|daily)\b",
+    re.IGNORECASE,
+)
+
+_PERIOD_ALIASES = {
+    "annually": "annual",
+    "yearly": "annual",
+    "quarter": "quarterly",
+    "quarters": "quarterly",
+}
+
+
+def period_tokens(query: str) -> List[str]:
+    """
+    Find the dates, numbers and reporting periods a query names.
+
+    Args:
+        query: Natural language query
+
+    Returns:
+        Distinct normalized tokens (e.g. "2021", "Q3", "quarterly"), sorted
+    """
+    tokens = set()
+    for match in _PERIOD_PATTERN.findall(query):
+        token = match.upper() if match[0] in "qQ" and match[1:].isdigit() else match.lower()
+        tokens.add(_PERIOD_ALIASES.get(token, token))
+    return sorted(tokens)
+
+
+class CachingEmbeddings(Embeddings):
+    """
+    Embeddings wrapper memoizing ``embed_query`` results.
+
+    Document embeddings are passed through; attribute access falls back to the
+    wrapped embeddings so model names and settings stay visible.
+
+    Attributes:
+        embeddings: Wrapped embeddings
+        max_entries: Maximum number of memoized queries
+    """
+
+    def __init__(self, embeddings: Embeddings, max_entries: int = 256) -> None:
+        """
+        Initialize the wrapper.
+
+        Args:
+            embeddings: Embeddings to wrap
+            max_entries: Maximum number of memoized queries
+        """
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self._vectors: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing on the wrapper itself
+        if name == "embeddings":
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, reusing the vector of an identical earlier query."""
+        with self._lock:
+            vector = self._vectors.get(text)
+            if vector is not None:
+                self._vectors.move_to_end(text)
+                return vector
+
+        vector = self.embeddings.embed_query(text)
+        with self._lock:
+            self._vectors[text] = vector
+            while len(self._vectors) > self.max_entries:
+                self._vectors.popitem(last=False)
+        return vector
+
+    def prime(self, texts: Sequence[str]) -> int:
+        """
+        Memoize the embeddings of expected queries with one batched call.
+
+        The texts are embedded as documents, which gives the same vectors as
+        ``embed_query`` for models that embed both the same way (such as
+        OpenAI's). The memo grows to hold every primed text.
+
+        Args:
+            texts: Queries to embed
+
+        Returns:
+            Number of texts newly embedded
+        """
+        with self._lock:
+            missing = list(dict.fromkeys(t for t in texts if t not in self._vectors))
+        if not missing:
+            return 0
+
+        vectors = self.embeddings.embed_documents(missing)
+        with self._lock:
+            self.max_entries = max(self.max_entries, len(missing))
+            for text, vector in zip(missing, vectors):
+                self._vectors[text] = vector
+            while len(self._vectors) > self.max_entries:
+                self._vectors.popitem(last=False)
+        return len(missing)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents without memoization."""
+        return self.embeddings.embed_documents(texts)
+
+
+def install_query_embedding_cache(
+    vector_store: EndpointVectorStore, max_entries: int = 256
+) -> CachingEmbeddings:
+    """
+    Memoize query embeddings of an endpoint vector store.
+
+    Installing twice returns the existing wrapper.
+
+    Args:
+        vector_store: Vector store to patch
+        max_entries: Maximum number of memoized queries
+
+    Returns:
+        Wrapper now used by the vector store
+    """
+    embeddings = vector_store.embeddings
+    if not isinstance(embeddings, CachingEmbeddings):
+        embeddings = CachingEmbeddings(embeddings, max_entries=max_entries)
+        vector_store.embeddings = embeddings
+
+    store = getattr(vector_store, "vector_store", None)
+    if store is not None and hasattr(store, "embedding_function"):
+        store.embedding_function = embeddings
+    return embeddings
+
+
+class SemanticAnswerCache:
+    """
+    Thread-safe cache of answers looked up by query-embedding similarity.
+
+    Entries live in a small brute-force cosine index; with at most a few
+    hundred entries a matrix product is faster than any ANN structure.
+
+    Attributes:
+        similarity_threshold: Minimum cosine similarity for a hit
+        ttl: Seconds an answer stays valid
+        max_entries: Maximum number of answers kept
+        symbols: Optional table resolving lower-case tickers and company names
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.92,
+        ttl: float = 300.0,
+        max_entries: int = 512,
+        symbols: Optional[SymbolTable] = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a hit
+            ttl: Seconds an answer stays valid
+            max_entries: Maximum number of answers kept
+            symbols: Table resolving lower-case tickers and company names
+                (defaults to recognizing upper-case tickers only)
+
+        Raises:
+            ValueError: If a parameter is out of range
+        """
+        if not 0 < similarity_threshold <= 1:
+            raise ValueError("similarity_threshold must be in (0, 1]")
+        if ttl <= 0 or max_entries < 1:
+            raise ValueError("ttl and max_entries must be positive")
+
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.symbols = symbols
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Tuple[Tuple[str, ...], Any, float]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _drop(self, keep: List[int]) -> None:
+        """Keep only the given entry positions (caller holds the lock)."""
+        self._entries = [self._entries[i] for i in keep]
+        self._vectors = self._vectors[keep] if self._vectors is not None and keep else None
+
+    def tickers(self, query: str) -> List[str]:
+        """
+        Find the tickers a query names, which key its cache entries.
+
+        Args:
+            query: Natural language query
+
+        Returns:
+            Tickers in order of first appearance; empty when the query names
+            none the cache recognizes, in which case it is not cached
+        """
+        return self.symbols.find(query) if self.symbols is not None else extract_tickers(query)
+
+    def key(self, query: str) -> Tuple[str, ...]:
+        """
+        Build the key a query's cache entries are tagged with.
+
+        Args:
+            query: Natural language query
+
+        Returns:
+            Sorted tickers followed by the query's period tokens; empty when
+            the query names no recognized ticker, in which case it is not cached
+        """
+        tickers = self.tickers(query)
+        if not tickers:
+            return ()
+        return tuple(sorted(set(tickers))) + tuple(period_tokens(query))
+
+    def get(self, embedding: Sequence[float], key: Sequence[str]) -> Optional[Any]:
+        """
+        Return the answer of the most similar live entry with the same key.
+
+        Args:
+            embedding: Query embedding
+            key: Key of the query from ``key``, or the tickers it names
+
+        Returns:
+            Cached answer, or None on a miss or when the key is empty
+        """
+        if not key:
+            return None
+        entry_key = tuple(sorted(key))
+        query = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != query.shape[0]:
+                return None
+            similarities = self._vectors @ query
+            best: Optional[Any] = None
+            best_similarity = self.similarity_threshold
+            for position, (stored_key, answer, expires_at) in enumerate(self._entries):
+                similarity = float(similarities[position])
+                if stored_key == entry_key and expires_at > now and similarity >= best_similarity:
+                    best, best_similarity = answer, similarity
+            return best
+
+    def put(self, embedding: Sequence[float], key: Sequence[str], answer: Any) -> None:
+        """
+        Store an answer for a query.
+
+        Args:
+            embedding: Query embedding
+            key: Key of the query from ``key``, or the tickers it names;
+                when empty, nothing is stored
+            answer: Answer to reuse for similar queries
+        """
+        if not key:
+            return
+        vector = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._vectors is not None and self._vectors.shape[1] != vector.shape[0]:
+                self._entries, self._vectors = [], None
+            # Purge expired entries, then the oldest ones beyond capacity
+            live = [i for i, (_, _, expires_at) in enumerate(self._entries) if expires_at > now]
+            self._drop(live[max(0, len(live) - self.max_entries + 1) :])
+
+            self._entries.append((tuple(sorted(key)), answer, now + self.ttl))
+            row = vector[np.newaxis, :]
+            self._vectors = row if self._vectors is None else np.vstack([self._vectors, row])
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries, self._vectors = [], None
+
+
+__all__ = [
+    "CachingEmbeddings",
+    "SemanticAnswerCache",
+    "install_query_embedding_cache",
+    "period_tokens",
+]
@@ -0,0 +1,366 @@
+"""Out-of-band storage for large tool results.
+
+A tool result put into ``ToolMessage.content`` is sent to the model again at
+every later step of the conversation. With an ``ArtifactStore``,
+``BasicToolNode`` keeps large results out of band: the message carries a
+compact preview (row count, field names and the first rows) and the store
+handle in ``ToolMessage.artifact``, which is never sent to the model. Local
+tools and the final response formatter resolve the handle to the full
+result.
+
+Artifacts are kept in memory or as files in a directory. Each conversation
+(LangGraph thread id) has its own byte budget and evicts its own least
+recently used artifacts, so a busy conversation never evicts another's live
+results; ``release`` frees a conversation's artifacts when its session ends.
+Identical results stored by several conversations are kept once.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from langchain_fmp_data.analytics import result_rows
+
+logger = logging.getLogger(__name__)
+
+#: Prefix of artifact handles
+HANDLE_PREFIX = "artifact-"
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Conversation owning artifacts stored without a thread id
+_DEFAULT_THREAD = ""
+DEFAULT_INLINE_LIMIT = 4096
+
+
+class ArtifactStore:
+    """
+    Thread-safe store of serialized tool results addressed by content hash.
+
+    Attributes:
+        max_bytes: Size of one conversation's artifacts before eviction
+        inline_limit: Serialized size up to which results stay in the message
+        preview_rows: Number of rows shown in a preview
+        directory: Directory holding artifact files (None keeps them in memory)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        inline_limit: int = DEFAULT_INLINE_LIMIT,
+        preview_rows: int = 3,
+        directory: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            max_bytes: Size of one conversation's artifacts before its least
+                recently used ones are evicted
+            inline_limit: Serialized size up to which results stay in the message
+            preview_rows: Number of rows shown in a preview
+            directory: Directory for artifact files; artifacts already there
+                are picked up, owned by no conversation in particular
+                (defaults to keeping artifacts in memory)
+
+        Raises:
+            ValueError: If a size is not positive
+        """
+        if max_bytes < 1 or inline_limit < 1:
+            raise ValueError("max_bytes and inline_limit must be positive")
+
+        self.max_bytes = max_bytes
+        self.inline_limit = inline_limit
+        self.preview_rows = preview_rows
+        self.directory = Path(directory).expanduser() if directory is not None else None
+        self._sizes: Dict[str, int] = {}
+        self._blobs: Dict[str, bytes] = {}
+        self._owners: Dict[str, Set[str]] = {}
+        self._threads: Dict[str, OrderedDict[str, None]] = {}
+        self._thread_bytes: Dict[str, int] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            files = sorted(self.directory.glob(f"{HANDLE_PREFIX}*.json"), key=os.path.getmtime)
+            for path in files:
+                self._sizes[path.stem] = path.stat().st_size
+                self._total += path.stat().st_size
+                self._reference(_DEFAULT_THREAD, path.stem)
+            self._evict(_DEFAULT_THREAD)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sizes)
+
+    def __contains__(self, handle: object) -> bool:
+        with self._lock:
+            return handle in self._sizes
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the kept artifacts."""
+        with self._lock:
+            return self._total
+
+    def thread_bytes(self, thread_id: Optional[str] = None) -> int:
+        """Size of the artifacts a conversation holds."""
+        with self._lock:
+            return self._thread_bytes.get(_thread_key(thread_id), 0)
+
+    def _path(self, handle: str) -> Path:
+        if self.directory is None:
+            raise RuntimeError("Artifact store keeps artifacts in memory, not in files")
+        return self.directory / f"{handle}.json"
+
+    def _reference(self, thread: str, handle: str) -> None:
+        """Mark an artifact as used by a conversation (caller holds the lock)."""
+        handles = self._threads.setdefault(thread, OrderedDict())
+        if handle in handles:
+            handles.move_to_end(handle)
+            return
+        handles[handle] = None
+        self._owners.setdefault(handle, set()).add(thread)
+        self._thread_bytes[thread] = self._thread_bytes.get(thread, 0) + self._sizes[handle]
+
+    def _unreference(self, thread: str, handle: str) -> None:
+        """Drop a conversation's use of an artifact (caller holds the lock)."""
+        handles = self._threads.get(thread)
+        if handles is None or handle not in handles:
+            return
+        del handles[handle]
+        self._thread_bytes[thread] -= self._sizes[handle]
+        if not handles:
+            del self._threads[thread]
+            del self._thread_bytes[thread]
+        owners = self._owners[handle]
+        owners.discard(thread)
+        if not owners:
+            self._discard(handle)
+
+    def _discard(self, handle: str) -> None:
+        """Delete an artifact no conversation uses (caller holds the lock)."""
+        self._owners.pop(handle, None)
+        self._total -= self._sizes.pop(handle)
+        if self.directory is None:
+            self._blobs.pop(handle, None)
+        else:
+            self._path(handle).unlink(missing_ok=True)
+
+    def _evict(self, thread: str) -> None:
+        """Drop a conversation's least recently used artifacts over its budget."""
+        handles = self._threads.get(thread)
+        while handles and self._thread_bytes[thread] > self.max_bytes:
+            handle = next(iter(handles))
+            logger.debug(f"Evicted artifact {handle} ({self._sizes[handle]} bytes)")
+            self._unreference(thread, handle)
+            handles = self._threads.get(thread)
+
+    def put(self, value: Any, thread_id: Optional[str] = None) -> str:
+        """
+        Store a JSON-serializable value.
+
+        Args:
+            value: Value to store
+            thread_id: Conversation the value belongs to
+
+        Returns:
+            Handle resolving to the value
+        """
+        blob = json.dumps(value).encode("utf-8")
+        return self._put_blob(blob, thread_id)
+
+    def _put_blob(self, blob: bytes, thread_id: Optional[str] = None) -> str:
+        handle = HANDLE_PREFIX + hashlib.sha256(blob).hexdigest()[:24]
+        thread = _thread_key(thread_id)
+        with self._lock:
+            if handle not in self._sizes:
+                if self.directory is None:
+                    self._blobs[handle] = blob
+                else:
+                    tmp = self._path(handle).with_suffix(".tmp")
+                    tmp.write_bytes(blob)
+                    os.replace(tmp, self._path(handle))
+                self._sizes[handle] = len(blob)
+                self._total += len(blob)
+            self._reference(thread, handle)
+            self._evict(thread)
+        return handle
+
+    def get(self, handle: str, thread_id: Optional[str] = None) -> Optional[Any]:
+        """
+        Resolve a handle.
+
+        Args:
+            handle: Handle returned by ``put``
+            thread_id: Conversation reading the value, whose use of it
+                counts as recent
+
+        Returns:
+            Stored value, or None if it was never stored or has been evicted
+        """
+        with self._lock:
+            if handle not in self._sizes:
+                return None
+            handles = self._threads.get(_thread_key(thread_id))
+            if handles is not None and handle in handles:
+                handles.move_to_end(handle)
+            if self.directory is None:
+                blob = self._blobs[handle]
+            else:
+                try:
+                    blob = self._path(handle).read_bytes()
+                except FileNotFoundError:
+                    for thread in list(self._owners.get(handle, ())):
+                        self._unreference(thread, handle)
+                    return None
+        return json.loads(blob)
+
+    def release(self, thread_id: str) -> None:
+        """
+        Free a conversation's artifacts, keeping those other conversations use.
+
+        Args:
+            thread_id: Conversation whose session ended
+        """
+        with self._lock:
+            for handle in list(self._threads.get(_thread_key(thread_id), ())):
+                self._unreference(_thread_key(thread_id), handle)
+
+    def offload(
+        self, result: Any, local_tools: bool = False, thread_id: Optional[str] = None
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Serialize a tool result for a ToolMessage, storing it if it is large.
+
+        Args:
+            result: Tool result
+            local_tools: Whether the model has the analytics tools that read
+                stored results, so the preview points it to them
+            thread_id: Conversation the result belongs to
+
+        Returns:
+            Message content and the artifact handle (None if kept inline)
+        """
+        content = json.dumps(result)
+        if len(content) <= self.inline_limit:
+            return content, None
+
+        handle = self._put_blob(content.encode("utf-8"), thread_id)
+        return json.dumps(self.preview(result, handle, len(content), local_tools)), handle
+
+    def preview(
+        self, result: Any, handle: str, size: int, local_tools: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Build the compact stand-in for a stored result.
+
+        Args:
+            result: Tool result
+            handle: Artifact handle of the result
+            size: Serialized size of the result
+            local_tools: Whether to point the model to the analytics tools
+
+        Returns:
+            Status, handle, size and a row or text preview
+        """
+        summary: Dict[str, Any] = {
+            "status": result.get("status", "success") if isinstance(result, dict) else "success",
+            "artifact": handle,
+            "size_bytes": size,
+        }
+        rows = result_rows(result)
+        if len(rows) > 1:
+            fields: Dict[str, None] = {}
+            for row in rows[: self.preview_rows]:
+                fields.update(dict.fromkeys(row))
+            summary.update(
+                rows=len(rows),
+                fields=list(fields),
+                preview=rows[: self.preview_rows],
+            )
+        else:
+            summary["preview"] = json.dumps(result)[: self.inline_limit // 2]
+        summary["note"] = "Full result stored out of band."
+        if local_tools:
+            summary["note"] += (
+                " Use select_rows or the compute_* tools with this tool_call_id to read it."
+            )
+        return summary
+
+    def clear(self) -> None:
+        """Drop every artifact."""
+        with self._lock:
+            if self.directory is not None:
+                for handle in self._sizes:
+                    self._path(handle).unlink(missing_ok=True)
+            self._sizes.clear()
+            self._blobs.clear()
+            self._owners.clear()
+            self._threads.clear()
+            self._thread_bytes.clear()
+            self._total = 0
+
+
+def _thread_key(thread_id: Optional[str]) -> str:
+    return _DEFAULT_THREAD if thread_id is None else thread_id
+
+
+def tool_results(
+    messages: Sequence[BaseMessage], store: Optional[ArtifactStore] = None
+) -> List[Dict[str, Any]]:
+    """
+    Collect the full tool results of the latest user turn.
+
+    Args:
+        messages: Conversation messages
+        store: Store resolving artifact handles
+
+    Returns:
+        One entry per tool call with its tool name, arguments and result
+    """
+    turn: List[BaseMessage] = []
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        turn.append(message)
+    turn.reverse()
+
+    args = {
+        call["id"]: call["args"]
+        for message in turn
+        if isinstance(message, AIMessage)
+        for call in message.tool_calls
+    }
+    results: List[Dict[str, Any]] = []
+    for message in turn:
+        if not isinstance(message, ToolMessage):
+            continue
+        value: Any = None
+        if store is not None and isinstance(message.artifact, str):
+            value = store.get(message.artifact)
+        if value is None:
+            try:
+                value = json.loads(str(message.content))
+            except json.JSONDecodeError:
+                value = message.content
+        results.append(
+            {
+                "tool": message.name,
+                "tool_call_id": message.tool_call_id,
+                "args": args.get(message.tool_call_id, {}),
+                "result": value,
+            }
+        )
+    return results
+
+
+__all__ = ["HANDLE_PREFIX", "ArtifactStore", "tool_results"]
@@ -0,0 +1,397 @@
+"""Multi-process batch runner for large offline question sets.
+
+One Python process answering questions is bound by the GIL on JSON handling
+and schema work long before it is bound by FMP or the model. ``run_batch``
+reads questions from a JSONL file and shards them over a process pool; each
+worker builds and warms its own tool once, then answers questions until the
+input runs out. Results are appended to an output JSONL file as they finish,
+one line per question, so the output file doubles as the checkpoint: a rerun
+skips the questions already answered and retries the failed ones.
+
+Input lines are either JSON strings or objects with a ``query`` and
+optionally an ``id`` (defaults to the line number) and a
+``response_format``. An optional global rate limit spaces question starts
+across all workers.
+"""
+
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Union
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from langchain_fmp_data.tools import FMPDataTool, ResponseFormat
+
+logger = logging.getLogger(__name__)
+
+#: Import path of the tool factory used when none is given
+DEFAULT_TOOL_FACTORY = "langchain_fmp_data.batch:default_tool_factory"
+
+ToolFactory = Union[str, Callable[[], BaseTool]]
+
+
+class BatchQuestion(BaseModel):
+    """One question of a batch."""
+
+    id: str = Field(description="Question id, unique within the input")
+    query: str = Field(description="Natural language query")
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.NATURAL_LANGUAGE, description="Format of the answer"
+    )
+
+
+class BatchReport(BaseModel):
+    """Progress and throughput of a batch run."""
+
+    total: int = Field(default=0, description="Questions in the input")
+    skipped: int = Field(default=0, description="Questions already answered by an earlier run")
+    completed: int = Field(default=0, description="Questions answered in this run")
+    failed: int = Field(default=0, description="Questions that failed in this run")
+    elapsed_seconds: float = Field(default=0.0, description="Wall time of this run so far")
+
+    @property
+    def done(self) -> int:
+        """Questions answered or failed, including skipped ones."""
+        return self.skipped + self.completed + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Questions finished per second in this run."""
+        finished = self.completed + self.failed
+        return finished / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds until the batch is finished."""
+        if not self.throughput:
+            return None
+        return (self.total - self.done) / self.throughput
+
+    def summary(self) -> str:
+        """One-line progress summary."""
+        eta = self.eta_seconds
+        return (
+            f"{self.done}/{self.total} done ({self.failed} failed, {self.skipped} skipped), "
+            f"{self.throughput:.2f} q/s"
+            + (f", ETA {eta:.0f}s" if eta is not None and self.done < self.total else "")
+        )
+
+
+class RateLimiter:
+    """
+    Rate limit shared by every process of a pool.
+
+    Each acquirer reserves the next free slot in shared memory and sleeps
+    until it comes, so starts are spaced ``1 / rate`` seconds apart however
+    many workers are running.
+    """
+
+    def __init__(self, rate: float, context: Any = None) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Acquisitions allowed per second
+            context: Multiprocessing context creating the shared value
+                (defaults to the default context)
+
+        Raises:
+            ValueError: If the rate is not positive
+        """
+        if rate <= 0:
+            raise ValueError("Rate limit must be positive")
+        self.interval = 1.0 / rate
+        self._next = (context or multiprocessing).Value("d", 0.0)
+
+    def acquire(self) -> float:
+        """
+        Wait for the next slot.
+
+        Returns:
+            Seconds waited
+        """
+        with self._next.get_lock():
+            now = time.monotonic()
+            slot = max(now, self._next.value)
+            self._next.value = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+        return max(0.0, slot - now)
+
+
+def default_tool_factory() -> BaseTool:
+    """Build an ``FMPDataTool`` from the FMP_API_KEY and OPENAI_API_KEY env vars."""
+    return FMPDataTool(raise_errors=True)
+
+
+def resolve_tool_factory(factory: ToolFactory) -> Callable[[], BaseTool]:
+    """
+    Resolve a tool factory given as a ``module:attribute`` import path.
+
+    Args:
+        factory: Import path, or the factory itself
+
+    Returns:
+        Callable building a tool
+
+    Raises:
+        ValueError: If the import path is malformed
+    """
+    if callable(factory):
+        return factory
+    module_name, _, attribute = factory.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Tool factory must look like 'module:function', got {factory!r}")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def read_questions(path: Union[str, Path]) -> Iterator[BatchQuestion]:
+    """
+    Read the questions of a JSONL input file.
+
+    Args:
+        path: Input file
+
+    Yields:
+        Questions in file order, skipping blank lines
+
+    Raises:
+        ValueError: If a line is not a string or an object with a query
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                record = {"query": record}
+            if not isinstance(record, dict) or "query" not in record:
+                raise ValueError(f"Line {line_number} of {path} has no query")
+            record["id"] = str(record.get("id", line_number))
+            yield BatchQuestion.model_validate(record)
+
+
+def answered_ids(path: Union[str, Path]) -> Set[str]:
+    """
+    Collect the ids answered successfully in an output file.
+
+    A line cut short by an interrupted run is ignored, so its question is
+    asked again.
+
+    Args:
+        path: Output file of an earlier run
+
+    Returns:
+        Ids of the successful results
+    """
+    ids: Set[str] = set()
+    if not os.path.exists(path):
+        return ids
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and record.get("status") == "success":
+                ids.add(str(record.get("id")))
+    return ids
+
+
+# Per-process state of a pool worker
+_tool: Optional[BaseTool] = None
+_limiter: Optional[RateLimiter] = None
+
+
+def _init_worker(factory: ToolFactory, limiter: Optional[RateLimiter], warmup: bool) -> None:
+    """Build and warm this worker's tool."""
+    global _tool, _limiter
+    _tool = resolve_tool_factory(factory)()
+    if isinstance(_tool, FMPDataTool):
+        # Otherwise failed queries come back as answers and are never retried
+        _tool.raise_errors = True
+    _limiter = limiter
+    warm = getattr(_tool, "warmup", None)
+    if warmup and warm is not None:
+        report = warm()
+        logger.info(f"Worker {os.getpid()} warmed up in {report.total_seconds:.2f}s")
+
+
+def _answer(question: BatchQuestion) -> Dict[str, Any]:
+    """Answer one question with this worker's tool."""
+    if _tool is None:
+        raise RuntimeError("Batch worker was not initialized")
+    if _limiter is not None:
+        _limiter.acquire()
+    record: Dict[str, Any] = {"id": question.id, "query": question.query}
+    start = time.perf_counter()
+    try:
+        answer = _tool.invoke(
+            {"query": question.query, "response_format": question.response_format}
+        )
+    except Exception as e:
+        record.update(status="error", error=str(e))
+    else:
+        if isinstance(answer, dict) and "error" in answer:
+            record.update(status="error", error=answer["error"])
+        else:
+            record.update(status="success", answer=answer)
+    record.update(seconds=time.perf_counter() - start, worker=os.getpid())
+    return record
+
+
+def run_batch(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    tool_factory: ToolFactory = DEFAULT_TOOL_FACTORY,
+    processes: Optional[int] = None,
+    rate_limit: Optional[float] = None,
+    resume: bool = True,
+    warmup: bool = True,
+    progress_interval: float = 10.0,
+    on_progress: Optional[Callable[[BatchReport], None]] = None,
+) -> BatchReport:
+    """
+    Answer every question of a JSONL file across a pool of processes.
+
+    Each result is appended to the output file as soon as it finishes, as
+    one JSON object with the question ``id`` and ``query``, a ``status`` of
+    ``success`` or ``error``, the ``answer`` or ``error``, and the
+    ``seconds`` and ``worker`` process id that answered it.
+
+    Args:
+        input_path: JSONL file of questions
+        output_path: JSONL file results are appended to
+        tool_factory: ``module:function`` import path, or a picklable
+            callable, building the tool each worker answers with (defaults
+            to an FMPDataTool from the environment's API keys)
+        processes: Worker processes (defaults to the CPU count; 0 answers in
+            this process, which is easier to debug)
+        rate_limit: Questions started per second across all workers
+            (defaults to no limit)
+        resume: Skip questions answered successfully in the output file;
+            otherwise the output file is overwritten
+        warmup: Warm each worker's tool before its first question
+        progress_interval: Seconds between progress reports
+        on_progress: Called with the report every ``progress_interval``
+            seconds and once at the end (defaults to logging it)
+
+    Returns:
+        Final report of the run
+    """
+    start = time.perf_counter()
+    questions = list(read_questions(input_path))
+    done = answered_ids(output_path) if resume else set()
+    pending = [q for q in questions if q.id not in done]
+    report = BatchReport(total=len(questions), skipped=len(questions) - len(pending))
+    if on_progress is None:
+
+        def on_progress(progress: BatchReport) -> None:
+            logger.info(f"Batch progress: {progress.summary()}")
+
+    processes = (os.cpu_count() or 1) if processes is None else processes
+    context = multiprocessing.get_context("spawn")
+    limiter = RateLimiter(rate_limit, context) if rate_limit is not None else None
+    last_report = time.perf_counter()
+
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as output:
+        # Start on a fresh line if an interrupted run left a partial one
+        if resume and output.tell() and not _ends_with_newline(output_path):
+            output.write("\n")
+
+        def write(record: Dict[str, Any]) -> None:
+            nonlocal last_report
+            output.write(json.dumps(record, default=str) + "\n")
+            output.flush()
+            if record["status"] == "success":
+                report.completed += 1
+            else:
+                report.failed += 1
+            report.elapsed_seconds = time.perf_counter() - start
+            if report.elapsed_seconds and time.perf_counter() - last_report >= progress_interval:
+                last_report = time.perf_counter()
+                on_progress(report)
+
+        if processes == 0:
+            _init_worker(tool_factory, limiter, warmup)
+            for question in pending:
+                write(_answer(question))
+        elif pending:
+            _run_pool(pending, write, tool_factory, limiter, warmup, processes, context)
+
+    report.elapsed_seconds = time.perf_counter() - start
+    on_progress(report)
+    return report
+
+
+def _run_pool(
+    pending: List[BatchQuestion],
+    write: Callable[[Dict[str, Any]], None],
+    tool_factory: ToolFactory,
+    limiter: Optional[RateLimiter],
+    warmup: bool,
+    processes: int,
+    context: Any,
+) -> None:
+    """Answer questions on a process pool, keeping a few in flight per worker."""
+    queue = iter(pending)
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(tool_factory, limiter, warmup),
+    ) as executor:
+        in_flight: Dict[Future, BatchQuestion] = {}
+
+        def submit(count: int) -> None:
+            for question in queue:
+                in_flight[executor.submit(_answer, question)] = question
+                count -= 1
+                if not count:
+                    break
+
+        submit(processes * 2)
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                question = in_flight.pop(future)
+                try:
+                    record = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    # The question could not be sent to or returned from a worker
+                    record = {
+                        "id": question.id,
+                        "query": question.query,
+                        "status": "error",
+                        "error": str(e),
+                    }
+                write(record)
+            submit(len(finished))
+
+
+def _ends_with_newline(path: Union[str, Path]) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+__all__ = [
+    "BatchQuestion",
+    "BatchReport",
+    "RateLimiter",
+    "answered_ids",
+    "default_tool_factory",
+    "read_questions",
+    "resolve_tool_factory",
+    "run_batch",
+]
@@ -0,0 +1,275 @@
+"""Delta checkpointing for the agent's message graph.
+
+``MemorySaver`` serializes a channel's whole value at every step it changes.
+The ``messages`` channel changes at every step, so a run of ``n`` steps
+stores ``n`` growing copies of the conversation, large ``ToolMessage``
+payloads included: memory and serialization time grow quadratically.
+
+``DeltaMemorySaver`` stores message lists content-addressed instead. Each
+message is serialized once, with the checkpoint serializer's msgpack
+encoding, into a payload store keyed by its digest; a checkpoint's
+``messages`` blob only holds the 16-byte digests of its messages. A step
+therefore adds the payloads of the messages it appended plus one digest per
+message, and unchanged payloads are shared between checkpoints, forks and
+threads. Pending writes hold a node's new messages before LangGraph assigns
+their ids, so a message may be stored once more there; growth stays linear.
+Payloads are reference-counted per thread and freed when the last thread
+holding them is deleted.
+
+Messages already in the graph state are not serialized again: the saver
+remembers the digest of each message object it stored, keyed by identity and
+message id. LangGraph treats messages in state as immutable, which this
+relies on.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
+
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    SerializerProtocol,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+#: Serialized type tag of a content-addressed message list
+MESSAGE_REFS_TYPE = "fmp-message-refs"
+
+#: Bytes of each message digest
+DIGEST_SIZE = 16
+
+
+class MessagePayloadStore:
+    """
+    Thread-safe content-addressed store of serialized messages.
+
+    Attributes:
+        payloads: Serialized messages keyed by digest
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.payloads: Dict[bytes, Tuple[str, bytes]] = {}
+        self._refs: Dict[bytes, int] = {}
+        self._threads: Dict[str, Set[bytes]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.payloads)
+
+    def __contains__(self, digest: object) -> bool:
+        with self._lock:
+            return digest in self.payloads
+
+    @property
+    def total_bytes(self) -> int:
+        """Size of the stored payloads."""
+        with self._lock:
+            return sum(len(payload[1]) for payload in self.payloads.values())
+
+    def add(
+        self, thread_id: str, digest: bytes, payload: Optional[Tuple[str, bytes]] = None
+    ) -> bool:
+        """
+        Store a payload, or reference it from another thread if already stored.
+
+        Args:
+            thread_id: Thread whose checkpoint references the payload
+            digest: Digest of the payload
+            payload: Serialized message (None to only reference a stored one)
+
+        Returns:
+            False if no payload was given and none is stored under the digest
+        """
+        with self._lock:
+            if payload is None:
+                if digest not in self.payloads:
+                    return False
+            else:
+                self.payloads.setdefault(digest, payload)
+            digests = self._threads.setdefault(thread_id, set())
+            if digest not in digests:
+                digests.add(digest)
+                self._refs[digest] = self._refs.get(digest, 0) + 1
+            return True
+
+    def get(self, digest: bytes) -> Tuple[str, bytes]:
+        """
+        Return a stored payload.
+
+        Raises:
+            KeyError: If no payload has the digest
+        """
+        with self._lock:
+            return self.payloads[digest]
+
+    def release(self, thread_id: str) -> None:
+        """Drop a thread's references, freeing payloads no thread holds."""
+        with self._lock:
+            for digest in self._threads.pop(thread_id, set()):
+                self._refs[digest] -= 1
+                if not self._refs[digest]:
+                    del self._refs[digest]
+                    del self.payloads[digest]
+
+
+class _MessageRefsSerializer:
+    """Serializer writing message lists as digests into a payload store."""
+
+    def __init__(self, serde: SerializerProtocol, saver: "DeltaMemorySaver") -> None:
+        self.serde = serde
+        self.saver = saver
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        thread_id = getattr(self.saver._local, "thread_id", None)
+        if (
+            thread_id is None
+            or not isinstance(obj, list)
+            or not obj
+            or not all(isinstance(m, BaseMessage) for m in obj)
+        ):
+            return self.serde.dumps_typed(obj)
+        digests = b"".join(self.saver._store_message(thread_id, m) for m in obj)
+        return MESSAGE_REFS_TYPE, digests
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, digests = data
+        if type_ != MESSAGE_REFS_TYPE:
+            return self.serde.loads_typed(data)
+        store = self.saver.payloads
+        return [
+            self.serde.loads_typed(store.get(digests[i : i + DIGEST_SIZE]))
+            for i in range(0, len(digests), DIGEST_SIZE)
+        ]
+
+
+class DeltaMemorySaver(MemorySaver):
+    """
+    In-memory checkpointer storing each message once across checkpoints.
+
+    A drop-in replacement for ``MemorySaver``; other channel values are
+    stored as usual.
+
+    Attributes:
+        payloads: Serialized messages shared by all checkpoints
+        memo_size: Number of message objects whose digest is remembered
+    """
+
+    def __init__(self, serde: Optional[SerializerProtocol] = None, memo_size: int = 1024) -> None:
+        """
+        Initialize the checkpointer.
+
+        Args:
+            serde: Serializer for payloads and other values (defaults to
+                LangGraph's msgpack-based serializer)
+            memo_size: Number of message objects whose digest is remembered,
+                so messages already stored are not serialized again
+        """
+        super().__init__(serde=serde)
+        self.payloads = MessagePayloadStore()
+        self.memo_size = memo_size
+        self._payload_serde = self.serde
+        self.serde = _MessageRefsSerializer(self.serde, self)
+        self._memo: OrderedDict[int, Tuple[BaseMessage, Optional[str], bytes]] = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _store_message(self, thread_id: str, message: BaseMessage) -> bytes:
+        """Store one message for a thread, returning its digest."""
+        with self._memo_lock:
+            entry = self._memo.get(id(message))
+            if entry is not None and entry[0] is message and entry[1] == message.id:
+                self._memo.move_to_end(id(message))
+                digest = entry[2]
+            else:
+                digest = b""
+
+        if digest and self.payloads.add(thread_id, digest):
+            return digest
+
+        payload = self._payload_serde.dumps_typed(message)
+        digest = hashlib.blake2b(
+            payload[0].encode() + b"\0" + payload[1], digest_size=DIGEST_SIZE
+        ).digest()
+        self.payloads.add(thread_id, digest, payload)
+        # Messages get their id when added to the state; only those are final
+        if message.id is not None:
+            with self._memo_lock:
+                # The memo holds the message so its id() is not reused
+                self._memo[id(message)] = (message, message.id, digest)
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return digest
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint, storing only the messages not stored yet."""
+        self._local.thread_id = config["configurable"]["thread_id"]
+        try:
+            return super().put(config, checkpoint, metadata, new_versions)
+        finally:
+            self._local.thread_id = None
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save a step's pending writes, storing new messages once."""
+        self._local.thread_id = config["configurable"]["thread_id"]
+        try:
+            super().put_writes(config, writes, task_id, task_path)
+        finally:
+            self._local.thread_id = None
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete a thread's checkpoints and the payloads only it referenced."""
+        super().delete_thread(thread_id)
+        self.payloads.release(thread_id)
+
+    def stored_bytes(self) -> Dict[str, int]:
+        """Return the bytes held in checkpoints, writes, blobs and payloads."""
+        return {**saver_bytes(self), "payloads": self.payloads.total_bytes}
+
+
+def saver_bytes(saver: MemorySaver) -> Dict[str, int]:
+    """
+    Measure the serialized bytes held by an in-memory checkpointer.
+
+    Args:
+        saver: ``MemorySaver`` or subclass
+
+    Returns:
+        Bytes of checkpoints, pending writes and channel blobs
+    """
+    checkpoints = sum(
+        len(entry[0][1]) + len(entry[1][1])
+        for namespaces in saver.storage.values()
+        for entries in namespaces.values()
+        for entry in entries.values()
+    )
+    writes = sum(
+        len(write[2][1]) for entries in saver.writes.values() for write in entries.values()
+    )
+    blobs = sum(len(blob[1]) for blob in saver.blobs.values())
+    return {"checkpoints": checkpoints, "writes": writes, "blobs": blobs}
+
+
+__all__ = [
+    "DeltaMemorySaver",
+    "MessagePayloadStore",
+    "saver_bytes",
+]
@@ -0,0 +1,164 @@
+"""Command line interface for langchain-fmp-data maintenance tasks."""
+
+import argparse
+import logging
+import os
+import sys
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _build_index(args: argparse.Namespace) -> int:
+    """Embed the endpoint catalog and write a prebuilt index artifact."""
+    from fmp_data.lc import create_vector_store
+
+    from langchain_fmp_data.endpoint_index import EndpointIndexConfig, build_endpoint_index
+
+    vector_store = create_vector_store(
+        fmp_api_key=args.fmp_api_key or os.getenv("FMP_API_KEY"),
+        openai_api_key=args.openai_api_key or os.getenv("OPENAI_API_KEY"),
+        cache_dir=args.cache_dir,
+        force_create=True,
+        embedding_model=args.embedding_model,
+    )
+    index_config = EndpointIndexConfig(
+        index_type=args.index_type,
+        quantization=args.quantization,
+        hnsw_ef_search=args.ef_search,
+        ivf_nprobe=args.nprobe,
+    )
+    index_metadata = build_endpoint_index(vector_store, args.output, index_config)
+    print(
+        f"Wrote {len(index_metadata.endpoints)} endpoints "
+        f"({index_config.index_type.value}, {index_config.quantization.value} vectors, "
+        f"{index_metadata.embedding_model}, fmp_data {index_metadata.fmp_data_version}) "
+        f"to {args.output}"
+    )
+    return 0
+
+
+def _build_specs(args: argparse.Namespace) -> int:
+    """Convert every endpoint tool schema and write the tool spec catalog."""
+    from fmp_data.lc import create_vector_store
+
+    from langchain_fmp_data.tool_specs import build_tool_spec_catalog, write_tool_spec_catalog
+
+    vector_store = create_vector_store(
+        fmp_api_key=args.fmp_api_key or os.getenv("FMP_API_KEY"),
+        openai_api_key=args.openai_api_key or os.getenv("OPENAI_API_KEY"),
+        cache_dir=args.cache_dir,
+    )
+    catalog = build_tool_spec_catalog(vector_store)
+    write_tool_spec_catalog(catalog, args.output)
+    print(f"Wrote {len(catalog)} tool specs (fmp_data {catalog.fmp_data_version}) to {args.output}")
+    return 0
+
+
+def _batch(args: argparse.Namespace) -> int:
+    """Answer a JSONL file of questions across a pool of worker processes."""
+    from langchain_fmp_data.batch import run_batch
+
+    report = run_batch(
+        args.input,
+        args.output,
+        tool_factory=args.tool_factory,
+        processes=args.processes,
+        rate_limit=args.rate_limit,
+        resume=not args.no_resume,
+        warmup=not args.no_warmup,
+        progress_interval=args.progress_interval,
+    )
+    print(f"Batch finished in {report.elapsed_seconds:.1f}s: {report.summary()}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    from langchain_fmp_data.batch import DEFAULT_TOOL_FACTORY
+    from langchain_fmp_data.endpoint_index import DEFAULT_INDEX_DIR, IndexType, Quantization
+    from langchain_fmp_data.tool_specs import DEFAULT_SPECS_PATH
+
+    parser = argparse.ArgumentParser(prog="langchain-fmp-data")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_index = subparsers.add_parser(
+        "build-index", help="Rebuild the prebuilt endpoint index after endpoints change"
+    )
+    build_index.add_argument(
+        "--output", default=str(DEFAULT_INDEX_DIR), help="Artifact directory to write"
+    )
+    build_index.add_argument("--embedding-model", default=None, help="OpenAI embedding model")
+    build_index.add_argument(
+        "--index-type",
+        choices=[t.value for t in IndexType],
+        default=IndexType.FLAT.value,
+        help="Exact flat search, or approximate HNSW or IVF search",
+    )
+    build_index.add_argument(
+        "--quantization",
+        choices=[q.value for q in Quantization],
+        default=Quantization.NONE.value,
+        help="Store vectors as float16, 8-bit scalars or product-quantized codes",
+    )
+    build_index.add_argument(
+        "--ef-search", type=int, default=64, help="HNSW candidate list size per search"
+    )
+    build_index.add_argument("--nprobe", type=int, default=8, help="IVF clusters per search")
+    build_index.add_argument("--cache-dir", default=None, help="Vector store cache directory")
+    build_index.add_argument("--fmp-api-key", default=None, help="FMP API key")
+    build_index.add_argument("--openai-api-key", default=None, help="OpenAI API key")
+    build_index.set_defaults(handler=_build_index)
+
+    build_specs = subparsers.add_parser(
+        "build-specs", help="Rebuild the precomputed OpenAI tool spec catalog"
+    )
+    build_specs.add_argument(
+        "--output", default=str(DEFAULT_SPECS_PATH), help="Catalog file to write"
+    )
+    build_specs.add_argument("--cache-dir", default=None, help="Vector store cache directory")
+    build_specs.add_argument("--fmp-api-key", default=None, help="FMP API key")
+    build_specs.add_argument("--openai-api-key", default=None, help="OpenAI API key")
+    build_specs.set_defaults(handler=_build_specs)
+
+    batch = subparsers.add_parser(
+        "batch", help="Answer a JSONL file of questions across worker processes"
+    )
+    batch.add_argument("input", help="JSONL file of questions")
+    batch.add_argument("output", help="JSONL file results are appended to")
+    batch.add_argument(
+        "--processes", type=int, default=None, help="Worker processes (defaults to CPU count)"
+    )
+    batch.add_argument(
+        "--rate-limit", type=float, default=None, help="Questions started per second, overall"
+    )
+    batch.add_argument(
+        "--tool-factory",
+        default=DEFAULT_TOOL_FACTORY,
+        help="module:function building each worker's tool",
+    )
+    batch.add_argument(
+        "--no-resume", action="store_true", help="Overwrite the output instead of resuming"
+    )
+    batch.add_argument("--no-warmup", action="store_true", help="Skip warming worker tools")
+    batch.add_argument(
+        "--progress-interval", type=float, default=10.0, help="Seconds between progress lines"
+    )
+    batch.set_defaults(handler=_batch)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface."""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    args = build_parser().parse_args(argv)
+    try:
+        return int(args.handler(args))
+    except Exception as e:
+        logger.error(f"{args.command} failed: {str(e)}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
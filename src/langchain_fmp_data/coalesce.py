@@ -0,0 +1,204 @@
+"""Coalescing of per-symbol tool calls into FMP batch endpoints.
+
+For a peer comparison the model typically emits one ``get_quote`` call per
+ticker in the same turn. FMP serves several of these endpoints for many
+symbols at once, so ``ToolCallCoalescer`` groups same-tool calls that differ
+only by symbol, plans one batch call per group, and splits the batch response
+back into one result per original ``tool_call_id``.
+
+Only endpoints with a real multi-symbol counterpart are coalesced; company
+profiles, for example, have no such endpoint and always run per symbol.
+
+The fmp_data batch tools advertise ``symbols`` as a comma-separated string but
+hand it to client methods expecting a list, which would join it character by
+character; ``split_batch_symbols`` wraps them to split the string first.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.tools import BaseTool, StructuredTool
+from pydantic import BaseModel, Field
+
+
+class BatchRule(BaseModel):
+    """How calls of a per-symbol tool map onto its batch tool."""
+
+    batch_tool: str = Field(..., description="Multi-symbol tool to call instead")
+    symbol_arg: str = Field(default="symbol", description="Symbol argument of the single tool")
+    batch_arg: str = Field(default="symbols", description="Symbols argument of the batch tool")
+    separator: str = Field(default=",", description="Separator joining batched symbols")
+
+
+#: Per-symbol tools with a multi-symbol FMP endpoint
+DEFAULT_BATCH_RULES: Dict[str, BatchRule] = {
+    "get_quote": BatchRule(batch_tool="get_quotes"),
+    "get_simple_quote": BatchRule(batch_tool="get_quotes_short"),
+    "get_market_cap": BatchRule(batch_tool="get_market_caps"),
+    "get_aftermarket_quote": BatchRule(batch_tool="get_aftermarket_quotes"),
+    "get_aftermarket_trade": BatchRule(batch_tool="get_aftermarket_trades"),
+}
+
+
+def split_batch_symbols(tool: BaseTool, rule: BatchRule) -> BaseTool:
+    """
+    Make a batch tool accept its symbols as a separated string.
+
+    Args:
+        tool: Batch tool created from the endpoint catalog
+        rule: Rule naming the symbols argument and separator
+
+    Returns:
+        Tool with the same name and schema splitting the symbols into a list
+        before calling the client, or ``tool`` itself if it cannot be wrapped
+    """
+    func = getattr(tool, "func", None)
+    if not isinstance(tool, StructuredTool) or func is None:
+        return tool
+
+    def run(**kwargs: Any) -> Any:
+        symbols = kwargs.get(rule.batch_arg)
+        if isinstance(symbols, str):
+            kwargs[rule.batch_arg] = [
+                symbol.strip() for symbol in symbols.split(rule.separator) if symbol.strip()
+            ]
+        return func(**kwargs)
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        func=run,
+    )
+
+
+class CoalescedBatch(BaseModel):
+    """One planned batch call and the tool calls it answers."""
+
+    tool_name: str
+    rule: BatchRule
+    tool_calls: List[Dict[str, Any]]
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols of the coalesced calls, in call order."""
+        return [str(call["args"][self.rule.symbol_arg]) for call in self.tool_calls]
+
+    @property
+    def batch_args(self) -> Dict[str, Any]:
+        """Arguments of the batch tool call."""
+        args = {
+            key: value
+            for key, value in self.tool_calls[0]["args"].items()
+            if key != self.rule.symbol_arg
+        }
+        args[self.rule.batch_arg] = self.rule.separator.join(dict.fromkeys(self.symbols))
+        return args
+
+
+class ToolCallCoalescer:
+    """
+    Groups per-symbol tool calls and splits batch results back per call.
+
+    Attributes:
+        rules: Batch rules keyed by per-symbol tool name
+        min_batch: Minimum number of calls worth batching
+        max_batch: Maximum number of symbols per batch call
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, BatchRule]] = None,
+        min_batch: int = 2,
+        max_batch: int = 50,
+    ) -> None:
+        """
+        Initialize the coalescer.
+
+        Args:
+            rules: Batch rules (defaults to ``DEFAULT_BATCH_RULES``)
+            min_batch: Minimum number of calls worth batching
+            max_batch: Maximum number of symbols per batch call
+
+        Raises:
+            ValueError: If the batch bounds are invalid
+        """
+        if min_batch < 2 or max_batch < min_batch:
+            raise ValueError("Batches need 2 <= min_batch <= max_batch")
+
+        self.rules = dict(DEFAULT_BATCH_RULES if rules is None else rules)
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+
+    def plan(self, tool_calls: Sequence[Dict[str, Any]]) -> List[CoalescedBatch]:
+        """
+        Group calls of the same tool that differ only by symbol.
+
+        Args:
+            tool_calls: Tool calls of one model message
+
+        Returns:
+            Batches of at least ``min_batch`` calls
+        """
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for call in tool_calls:
+            rule = self.rules.get(call["name"])
+            args = call.get("args") or {}
+            if rule is None or not isinstance(args.get(rule.symbol_arg), str):
+                continue
+            rest = sorted((k, repr(v)) for k, v in args.items() if k != rule.symbol_arg)
+            groups.setdefault((call["name"], repr(rest)), []).append(call)
+
+        batches: List[CoalescedBatch] = []
+        for (tool_name, _), calls in groups.items():
+            for start in range(0, len(calls), self.max_batch):
+                chunk = calls[start : start + self.max_batch]
+                if len(chunk) >= self.min_batch:
+                    batches.append(
+                        CoalescedBatch(
+                            tool_name=tool_name, rule=self.rules[tool_name], tool_calls=chunk
+                        )
+                    )
+        return batches
+
+    @staticmethod
+    def split(batch: CoalescedBatch, result: Any) -> Dict[str, Any]:
+        """
+        Split a batch tool result into per-call results.
+
+        Each answered call gets ``{"status": "success", "data": <row>}``, the
+        shape of a single-symbol tool result. Calls whose symbol is missing
+        from the response are left out so they can run on their own.
+
+        Args:
+            batch: Batch the result answers
+            result: Batch tool result
+
+        Returns:
+            Results keyed by tool call id
+        """
+        if not isinstance(result, dict) or result.get("status") != "success":
+            return {}
+        rows = result.get("data")
+        if not isinstance(rows, list):
+            return {}
+
+        by_symbol: Dict[str, Any] = {}
+        for row in rows:
+            if isinstance(row, dict) and isinstance(row.get("symbol"), str):
+                by_symbol.setdefault(row["symbol"].upper(), row)
+
+        results: Dict[str, Any] = {}
+        for call, symbol in zip(batch.tool_calls, batch.symbols):
+            row = by_symbol.get(symbol.upper())
+            if row is not None:
+                results[call["id"]] = {"status": "success", "data": row}
+        return results
+
+
+__all__ = [
+    "DEFAULT_BATCH_RULES",
+    "BatchRule",
+    "CoalescedBatch",
+    "ToolCallCoalescer",
+    "split_batch_symbols",
+]
@@ -0,0 +1,334 @@
+"""Per-endpoint circuit breaking and hedged requests for FMP tool calls.
+
+When one FMP endpoint slows down or starts failing, every conversation
+calling it waits for the full timeout. ``EndpointHealth`` tracks each
+endpoint's recent outcomes and latency. After ``failure_threshold``
+consecutive failures its circuit opens: calls return a short error result at
+once, so the model can use another tool, until ``recovery_seconds`` have
+passed and a single probe call is let through to test the endpoint again.
+
+With ``hedge_percentile`` set, a call still running after that percentile of
+the endpoint's recent latency gets a duplicate request, and the first result
+to arrive is used. FMP endpoint tools only read data, so duplicates are safe;
+the slower request is left to finish in the background.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+logger = logging.getLogger(__name__)
+
+#: Error types of fmp_data tool results that reflect on the endpoint; input
+#: validation errors and account-wide rate limits do not
+ENDPOINT_ERROR_TYPES = frozenset({"unexpected_error", "endpoint_unavailable"})
+
+
+class CircuitState(str, Enum):
+    """State of an endpoint's circuit."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class EndpointHealthConfig(BaseModel):
+    """Circuit breaker and hedging settings, applied to every endpoint."""
+
+    model_config = ConfigDict(frozen=True)
+
+    failure_threshold: int = Field(
+        default=5, gt=0, description="Consecutive failures opening the circuit"
+    )
+    recovery_seconds: float = Field(
+        default=30.0, gt=0, description="Seconds an open circuit waits before a probe call"
+    )
+    slow_call_seconds: Optional[float] = Field(
+        default=None, gt=0, description="Calls slower than this count as failures"
+    )
+    latency_window: int = Field(
+        default=200, gt=0, description="Recent successful call latencies kept per endpoint"
+    )
+    hedge_percentile: Optional[float] = Field(
+        default=None,
+        gt=0,
+        lt=100,
+        description="Latency percentile after which a duplicate request is sent "
+        "(None disables hedging)",
+    )
+    hedge_min_samples: int = Field(
+        default=20, gt=0, description="Latency samples needed before hedging an endpoint"
+    )
+    hedge_min_delay: float = Field(
+        default=0.05, ge=0, description="Shortest wait before sending a duplicate request"
+    )
+    max_hedge_workers: int = Field(
+        default=32, gt=0, description="Threads running hedged calls, across all endpoints"
+    )
+
+
+def is_endpoint_failure(result: Any) -> bool:
+    """Check whether a tool result reports a failure of the endpoint itself."""
+    return (
+        isinstance(result, dict)
+        and result.get("status") == "error"
+        and result.get("error_type") in ENDPOINT_ERROR_TYPES
+    )
+
+
+class _EndpointStats:
+    """Mutable health record of one endpoint (guarded by the owner's lock)."""
+
+    def __init__(self, latency_window: int) -> None:
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+
+class EndpointHealth:
+    """
+    Thread-safe per-endpoint circuit breaker with optional hedged requests.
+
+    One instance is shared by every workflow of a tool, so all conversations
+    see the same endpoint health.
+
+    Attributes:
+        config: Circuit breaker and hedging settings
+    """
+
+    def __init__(self, config: Optional[EndpointHealthConfig] = None) -> None:
+        """
+        Initialize the tracker.
+
+        Args:
+            config: Settings (defaults to EndpointHealthConfig())
+        """
+        self.config = config or EndpointHealthConfig()
+        self._stats: Dict[str, _EndpointStats] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get(self, name: str) -> _EndpointStats:
+        """Return an endpoint's record (caller holds the lock)."""
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _EndpointStats(self.config.latency_window)
+        return stats
+
+    def state(self, name: str) -> CircuitState:
+        """Return the circuit state of an endpoint."""
+        with self._lock:
+            return self._get(name).state
+
+    def allow(self, name: str) -> bool:
+        """
+        Check whether a call to an endpoint may go ahead.
+
+        An open circuit lets one probe call through once its recovery time
+        has passed; other calls are rejected until the probe completes.
+
+        Args:
+            name: Endpoint tool name
+
+        Returns:
+            True if the call may be made
+        """
+        with self._lock:
+            stats = self._get(name)
+            if stats.state == CircuitState.OPEN:
+                if time.monotonic() - stats.opened_at < self.config.recovery_seconds:
+                    stats.rejected += 1
+                    return False
+                stats.state = CircuitState.HALF_OPEN
+                stats.probing = False
+            if stats.state == CircuitState.HALF_OPEN:
+                if stats.probing:
+                    stats.rejected += 1
+                    return False
+                stats.probing = True
+            return True
+
+    def record(self, name: str, seconds: float, failed: bool = False) -> None:
+        """
+        Record the outcome of one call to an endpoint.
+
+        Args:
+            name: Endpoint tool name
+            seconds: Latency of the call
+            failed: Whether the call failed
+        """
+        slow = self.config.slow_call_seconds
+        failed = failed or (slow is not None and seconds > slow)
+        with self._lock:
+            stats = self._get(name)
+            stats.calls += 1
+            stats.probing = False
+            if not failed:
+                stats.latencies.append(seconds)
+                stats.consecutive_failures = 0
+                stats.state = CircuitState.CLOSED
+                return
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if (
+                stats.state == CircuitState.HALF_OPEN
+                or stats.consecutive_failures >= self.config.failure_threshold
+            ):
+                if stats.state != CircuitState.OPEN:
+                    logger.warning(f"Circuit for {name} opened after repeated failures")
+                stats.state = CircuitState.OPEN
+                stats.opened_at = time.monotonic()
+
+    def hedge_delay(self, name: str) -> Optional[float]:
+        """
+        Return how long to wait before hedging a call to an endpoint.
+
+        Args:
+            name: Endpoint tool name
+
+        Returns:
+            Seconds to wait, or None if the call should not be hedged
+        """
+        percentile = self.config.hedge_percentile
+        if percentile is None:
+            return None
+        with self._lock:
+            latencies = list(self._get(name).latencies)
+        if len(latencies) < self.config.hedge_min_samples:
+            return None
+        return max(self.config.hedge_min_delay, float(np.percentile(latencies, percentile)))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_hedge_workers, thread_name_prefix="fmp-hedge"
+                )
+            return self._executor
+
+    def _call_hedged(self, name: str, func: Callable[[], Any], delay: float) -> Any:
+        """
+        Run a call, sending a duplicate if it is still running after ``delay``.
+
+        The first successful result wins; a failure, raised or returned as an
+        error result, waits for the other request. When both fail, the error
+        result is returned, or else the exception raised.
+        """
+        executor = self._get_executor()
+        primary = executor.submit(func)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        hedge = executor.submit(func)
+        with self._lock:
+            self._get(name).hedges += 1
+        pending: Set[Future] = {primary, hedge}
+        error: BaseException = RuntimeError(f"Hedged call to {name} failed")
+        failure: Optional[Any] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exception = future.exception()
+                if exception is not None:
+                    error = exception
+                    continue
+                result = future.result()
+                # Tools report endpoint failures as error results, not exceptions
+                if is_endpoint_failure(result):
+                    failure = result
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self._get(name).hedge_wins += 1
+                return result
+        if failure is not None:
+            return failure
+        raise error
+
+    def call(self, name: str, func: Callable[[], Any]) -> Any:
+        """
+        Call an endpoint through its circuit breaker, hedging when enabled.
+
+        Errors never propagate: an open circuit or a raised exception becomes
+        an error result the model can read and route around.
+
+        Args:
+            name: Endpoint tool name
+            func: Makes the call and returns the tool result
+
+        Returns:
+            Tool result, or an error result if the call was rejected or failed
+        """
+        if not self.allow(name):
+            return {
+                "status": "error",
+                "error_type": "circuit_open",
+                "message": f"{name} is temporarily unavailable after repeated failures; "
+                "use another tool or try again later",
+            }
+
+        delay = self.hedge_delay(name)
+        start = time.perf_counter()
+        try:
+            result = func() if delay is None else self._call_hedged(name, func, delay)
+        except Exception as e:
+            self.record(name, time.perf_counter() - start, failed=True)
+            logger.warning(f"Call to {name} failed: {str(e)}")
+            return {
+                "status": "error",
+                "error_type": "endpoint_unavailable",
+                "message": f"{name} failed: {str(e)}",
+            }
+        self.record(name, time.perf_counter() - start, failed=is_endpoint_failure(result))
+        return result
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return each endpoint's circuit state, call counts and latency percentiles."""
+        with self._lock:
+            return {
+                name: {
+                    "state": stats.state.value,
+                    "calls": stats.calls,
+                    "failures": stats.failures,
+                    "rejected": stats.rejected,
+                    "hedges": stats.hedges,
+                    "hedge_wins": stats.hedge_wins,
+                    "p50_seconds": float(np.percentile(stats.latencies, 50))
+                    if stats.latencies
+                    else None,
+                    "p95_seconds": float(np.percentile(stats.latencies, 95))
+                    if stats.latencies
+                    else None,
+                }
+                for name, stats in self._stats.items()
+            }
+
+    def close(self) -> None:
+        """Shut down the hedging thread pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+__all__ = [
+    "CircuitState",
+    "EndpointHealth",
+    "EndpointHealthConfig",
+    "is_endpoint_failure",
+]
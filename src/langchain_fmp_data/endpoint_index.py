@@ -0,0 +1,478 @@
+"""Prebuilt endpoint index loaded memory-mapped and read-only.
+
+``create_vector_store`` builds or unpickles a FAISS store at runtime, so every
+worker process pays for embedding endpoint descriptions or deserializing an
+index into private memory. An endpoint index artifact is a raw FAISS index
+plus a compact JSON metadata table. Loading it memory-mapped lets forked
+workers share the index pages and makes startup close to instant.
+
+Build an artifact with ``langchain-fmp-data build-index``.
+
+The index is an exact flat search by default. For catalogs extended to
+thousands of endpoints, ``EndpointIndexConfig`` selects an approximate graph
+(HNSW) or inverted-file (IVF) index, optionally with scalar or product
+quantization of the vectors, trading a little recall for faster and smaller
+retrieval. ``scripts/bench_index_types.py`` measures that trade-off.
+"""
+
+import logging
+import math
+from datetime import datetime
+from enum import Enum
+from importlib import metadata as importlib_metadata
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+import faiss
+import numpy as np
+from fmp_data.exceptions import ConfigError
+from fmp_data.lc.vector_store import EndpointVectorStore, VectorStoreMetadata
+from langchain_core.documents import Document
+from pydantic import BaseModel, ConfigDict, Field, SecretStr
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "endpoints.faiss"
+METADATA_FILE = "endpoints.json"
+
+# IO_FLAG_MMAP alone still copies flat-index codes into private memory;
+# IO_FLAG_MMAP_IFC maps them from the file so forked workers share the pages.
+_MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+#: Location of the artifact shipped inside the package, when one was built
+DEFAULT_INDEX_DIR = Path(__file__).parent / "data" / "endpoint_index"
+
+
+def fmp_data_version() -> str:
+    """Return the installed fmp_data version."""
+    try:
+        return importlib_metadata.version("fmp-data")
+    except importlib_metadata.PackageNotFoundError:
+        return ""
+
+
+def embedding_model_name(embeddings: Any) -> str:
+    """Return the model name of a LangChain embeddings instance."""
+    return str(getattr(embeddings, "model", None) or getattr(embeddings, "model_name", "default"))
+
+
+class IndexType(str, Enum):
+    """Search structure of an endpoint index."""
+
+    FLAT = "flat"
+    HNSW = "hnsw"
+    IVF = "ivf"
+
+
+class Quantization(str, Enum):
+    """Encoding of the vectors stored in an endpoint index."""
+
+    NONE = "none"
+    FP16 = "fp16"
+    SQ8 = "sq8"
+    PQ = "pq"
+
+
+class EndpointIndexConfig(BaseModel):
+    """Index type and quantization of an endpoint index."""
+
+    model_config = ConfigDict(frozen=True)
+
+    index_type: IndexType = Field(default=IndexType.FLAT, description="Search structure")
+    quantization: Quantization = Field(
+        default=Quantization.NONE, description="Encoding of the stored vectors"
+    )
+    hnsw_m: int = Field(default=32, gt=1, description="Neighbors per HNSW graph node")
+    hnsw_ef_construction: int = Field(
+        default=200, gt=0, description="Candidate list size while building the HNSW graph"
+    )
+    hnsw_ef_search: int = Field(
+        default=64, gt=0, description="Candidate list size of an HNSW search"
+    )
+    ivf_lists: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="IVF clusters (defaults to 4 * sqrt(vectors), with at least 39 "
+        "training vectors per cluster)",
+    )
+    ivf_nprobe: int = Field(default=8, gt=0, description="IVF clusters visited per search")
+    pq_subquantizers: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="PQ code bytes per vector; must divide the dimension "
+        "(defaults to the largest divisor up to dimension / 16)",
+    )
+    pq_bits: int = Field(default=8, ge=1, le=12, description="Bits per PQ subquantizer")
+
+    def factory_string(self, dimension: int, num_vectors: int) -> str:
+        """
+        Describe the index in ``faiss.index_factory`` syntax.
+
+        Args:
+            dimension: Embedding dimension
+            num_vectors: Vectors the index is trained on
+
+        Returns:
+            Factory string, for example ``"IVF64,PQ96x8np"``
+
+        Raises:
+            ValueError: If the PQ subquantizers do not divide the dimension
+        """
+        if self.quantization == Quantization.NONE:
+            encoding = "Flat"
+        elif self.quantization == Quantization.FP16:
+            encoding = "SQfp16"
+        elif self.quantization == Quantization.SQ8:
+            encoding = "SQ8"
+        else:
+            subquantizers = self.pq_subquantizers or max(
+                m for m in range(1, max(1, dimension // 16) + 1) if dimension % m == 0
+            )
+            if dimension % subquantizers:
+                raise ValueError(
+                    f"PQ subquantizers ({subquantizers}) must divide the dimension ({dimension})"
+                )
+            # Each subquantizer is trained with 2**bits centroids; "np" skips
+            # polysemous training, which only serves Hamming-distance filtering
+            bits = min(self.pq_bits, max(1, int(math.log2(num_vectors))))
+            encoding = f"PQ{subquantizers}x{bits}np"
+
+        if self.index_type == IndexType.HNSW:
+            return f"HNSW{self.hnsw_m}" if encoding == "Flat" else f"HNSW{self.hnsw_m},{encoding}"
+        if self.index_type == IndexType.IVF:
+            lists = self.ivf_lists or int(4 * math.sqrt(num_vectors))
+            lists = max(1, min(lists, num_vectors // 39))
+            return f"IVF{lists},{encoding}"
+        return encoding
+
+
+def build_faiss_index(vectors: np.ndarray, config: EndpointIndexConfig) -> Any:
+    """
+    Build, train and fill a FAISS index with L2 distances.
+
+    Args:
+        vectors: Float32 matrix with one embedding per row
+        config: Index type and quantization
+
+    Returns:
+        FAISS index holding the vectors, with the configured search parameters
+
+    Raises:
+        ValueError: If there are no vectors or the PQ settings do not fit
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if vectors.ndim != 2 or not len(vectors):
+        raise ValueError("No vectors to index")
+    factory = config.factory_string(vectors.shape[1], len(vectors))
+    index = faiss.index_factory(vectors.shape[1], factory, faiss.METRIC_L2)
+    if config.index_type == IndexType.HNSW:
+        hnsw_index: Any = faiss.downcast_index(index)
+        hnsw_index.hnsw.efConstruction = config.hnsw_ef_construction
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    set_search_params(index, config)
+    logger.info(f"Built {factory} endpoint index with {index.ntotal} vectors")
+    return index
+
+
+def set_search_params(index: Any, config: EndpointIndexConfig) -> None:
+    """Apply the configured HNSW candidate list size or IVF probes to an index."""
+    concrete: Any = faiss.downcast_index(index)
+    if hasattr(concrete, "hnsw"):
+        concrete.hnsw.efSearch = config.hnsw_ef_search
+    if hasattr(concrete, "nprobe"):
+        concrete.nprobe = config.ivf_nprobe
+
+
+def apply_index_config(vector_store: EndpointVectorStore, config: EndpointIndexConfig) -> Any:
+    """
+    Replace the flat index of a runtime vector store with a configured one.
+
+    Endpoints added afterwards go into the new index; its vectors were
+    trained on the endpoints present now.
+
+    Args:
+        vector_store: Vector store created by ``create_vector_store``
+        config: Index type and quantization
+
+    Returns:
+        The new FAISS index
+    """
+    store = vector_store.vector_store
+    store.index = build_faiss_index(_index_vectors(store.index), config)
+    return store.index
+
+
+def _index_vectors(index: Any) -> np.ndarray:
+    """Read the stored vectors back from an exact index."""
+    try:
+        return index.reconstruct_n(0, index.ntotal)
+    except RuntimeError as e:
+        raise ValueError(f"Cannot read vectors back from the index: {str(e)}") from e
+
+
+class EndpointIndexMetadata(BaseModel):
+    """Metadata table stored next to the FAISS index."""
+
+    fmp_data_version: str = Field(..., description="fmp_data version the index was built from")
+    embedding_model: str = Field(..., description="Embedding model used for the vectors")
+    dimension: int = Field(..., gt=0, description="Embedding dimension")
+    endpoints: List[str] = Field(..., description="Endpoint name for each vector position")
+    index_config: EndpointIndexConfig = Field(
+        default_factory=EndpointIndexConfig, description="Index type and quantization"
+    )
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+def build_endpoint_index(
+    vector_store: EndpointVectorStore,
+    output_dir: Union[str, Path],
+    index_config: Optional[EndpointIndexConfig] = None,
+) -> EndpointIndexMetadata:
+    """
+    Write an endpoint index artifact from a populated vector store.
+
+    Args:
+        vector_store: Vector store holding endpoint embeddings
+        output_dir: Directory to write the artifact to
+        index_config: Index type and quantization (defaults to the exact
+            flat index)
+
+    Returns:
+        Metadata of the written artifact
+
+    Raises:
+        ValueError: If the vector store holds no vectors
+    """
+    store = vector_store.vector_store
+    index = store.index
+    if index.ntotal == 0:
+        raise ValueError("Vector store has no vectors to export")
+
+    endpoints: List[str] = []
+    for position in range(index.ntotal):
+        doc = store.docstore.search(store.index_to_docstore_id[position])
+        endpoint = doc.metadata.get("endpoint") if isinstance(doc, Document) else None
+        if not isinstance(endpoint, str):
+            raise ValueError(f"Vector {position} has no endpoint metadata")
+        endpoints.append(endpoint)
+
+    index_config = index_config or EndpointIndexConfig()
+    if index_config.index_type != IndexType.FLAT or index_config.quantization != Quantization.NONE:
+        index = build_faiss_index(_index_vectors(index), index_config)
+
+    index_metadata = EndpointIndexMetadata(
+        fmp_data_version=fmp_data_version(),
+        embedding_model=embedding_model_name(vector_store.embeddings),
+        dimension=index.d,
+        endpoints=endpoints,
+        index_config=index_config,
+    )
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    faiss.write_index(index, str(output_path / INDEX_FILE))
+    (output_path / METADATA_FILE).write_text(index_metadata.model_dump_json())
+
+    logger.info(f"Wrote endpoint index with {len(endpoints)} vectors to {output_path}")
+    return index_metadata
+
+
+def read_index_metadata(index_dir: Union[str, Path]) -> EndpointIndexMetadata:
+    """
+    Read the metadata table of an endpoint index artifact.
+
+    Args:
+        index_dir: Artifact directory
+
+    Returns:
+        Artifact metadata
+
+    Raises:
+        ConfigError: If the metadata cannot be read
+    """
+    path = Path(index_dir) / METADATA_FILE
+    try:
+        return EndpointIndexMetadata.model_validate_json(path.read_text())
+    except OSError as e:
+        raise ConfigError(f"Failed to read endpoint index metadata: {str(e)}") from e
+    except ValueError as e:
+        raise ConfigError(f"Invalid endpoint index metadata: {str(e)}") from e
+
+
+def index_exists(index_dir: Union[str, Path]) -> bool:
+    """Check whether a directory holds an endpoint index artifact."""
+    path = Path(index_dir)
+    return (path / INDEX_FILE).is_file() and (path / METADATA_FILE).is_file()
+
+
+class PrebuiltEndpointVectorStore(EndpointVectorStore):
+    """
+    Endpoint vector store backed by a prebuilt, read-only index artifact.
+
+    Nothing is embedded or unpickled at load time: the FAISS index is mapped
+    from disk and the docstore holds one small document per endpoint. Query
+    embedding still goes through ``embeddings``.
+
+    Attributes:
+        index_metadata: Metadata of the loaded artifact
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        registry: Any,
+        embeddings: Any,
+        index_dir: Union[str, Path],
+        mmap: bool = True,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Load an endpoint index artifact.
+
+        The parent initializer is bypassed on purpose: it creates a cache
+        directory and builds or unpickles a store, neither of which applies to
+        a read-only artifact.
+
+        Args:
+            client: FMP API client instance
+            registry: Endpoint registry instance
+            embeddings: Embeddings matching the artifact's model
+            index_dir: Artifact directory
+            mmap: Map the index read-only instead of reading it into memory
+            logger: Optional logger instance
+
+        Raises:
+            ConfigError: If the artifact cannot be loaded or does not match
+                the embeddings
+        """
+        self.client = client
+        self.registry = registry
+        self.embeddings = embeddings
+        self.logger = logger or logging.getLogger(__name__)
+        self._allow_dangerous_deserialization = False
+
+        self.cache_dir = Path(index_dir)
+        self.store_dir = self.cache_dir
+        self.index_path = self.cache_dir / INDEX_FILE
+        self.metadata_path = self.cache_dir / METADATA_FILE
+
+        self.index_metadata = read_index_metadata(self.cache_dir)
+        self._check_compatibility()
+        self.vector_store = self._load_faiss(mmap)
+        self.metadata = VectorStoreMetadata(
+            embedding_provider=self.embeddings.__class__.__name__,
+            embedding_model=self.index_metadata.embedding_model,
+            dimension=self.index_metadata.dimension,
+            num_vectors=len(self.index_metadata.endpoints),
+        )
+
+    def _check_compatibility(self) -> None:
+        """Reject artifacts built with other embeddings; warn on version drift."""
+        model = embedding_model_name(self.embeddings)
+        if model != "default" and model != self.index_metadata.embedding_model:
+            raise ConfigError(
+                f"Endpoint index was built with {self.index_metadata.embedding_model!r}, "
+                f"but embeddings use {model!r}"
+            )
+
+        installed = fmp_data_version()
+        if installed and installed != self.index_metadata.fmp_data_version:
+            self.logger.warning(
+                f"Endpoint index was built for fmp_data "
+                f"{self.index_metadata.fmp_data_version}, installed version is "
+                f"{installed}. Rebuild it with `langchain-fmp-data build-index`."
+            )
+
+    def _load_faiss(self, mmap: bool) -> Any:
+        """Map the FAISS index and build a minimal docstore around it."""
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        from langchain_community.vectorstores import FAISS
+
+        flags = _MMAP_FLAGS if mmap else 0
+        try:
+            index = faiss.read_index(str(self.index_path), flags)
+        except RuntimeError as e:
+            raise ConfigError(f"Failed to read endpoint index: {str(e)}") from e
+
+        endpoints = self.index_metadata.endpoints
+        if index.ntotal != len(endpoints) or index.d != self.index_metadata.dimension:
+            raise ConfigError("Endpoint index does not match its metadata table")
+        set_search_params(index, self.index_metadata.index_config)
+
+        docstore = InMemoryDocstore(
+            {name: Document(page_content=name, metadata={"endpoint": name}) for name in endpoints}
+        )
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=dict(enumerate(endpoints)),
+        )
+
+    def add_endpoint(self, name: str) -> None:
+        """Prebuilt indexes are read-only."""
+        raise ConfigError("Prebuilt endpoint index is read-only; rebuild it instead")
+
+    def add_endpoints(self, names: List[str]) -> int:
+        """Prebuilt indexes are read-only."""
+        raise ConfigError("Prebuilt endpoint index is read-only; rebuild it instead")
+
+
+def load_vector_store(
+    fmp_api_key: str,
+    openai_api_key: str,
+    index_dir: Union[str, Path] = DEFAULT_INDEX_DIR,
+    mmap: bool = True,
+) -> PrebuiltEndpointVectorStore:
+    """
+    Load an endpoint vector store from a prebuilt index artifact.
+
+    Args:
+        fmp_api_key: FMP API key
+        openai_api_key: OpenAI API key used to embed queries
+        index_dir: Artifact directory (defaults to the packaged artifact)
+        mmap: Map the index read-only instead of reading it into memory
+
+    Returns:
+        Vector store backed by the artifact
+
+    Raises:
+        ConfigError: If the artifact is missing or cannot be loaded
+    """
+    if not index_exists(index_dir):
+        raise ConfigError(f"No endpoint index found in {index_dir}")
+
+    from fmp_data import FMPDataClient
+    from fmp_data.lc import setup_registry
+    from fmp_data.lc.embedding import EmbeddingConfig, EmbeddingProvider
+
+    index_metadata = read_index_metadata(index_dir)
+    model_name = index_metadata.embedding_model
+    client = FMPDataClient(api_key=fmp_api_key)
+    registry, _ = setup_registry(client)
+    embeddings = EmbeddingConfig(
+        provider=EmbeddingProvider.OPENAI,
+        model_name=None if model_name == "default" else model_name,
+        api_key=SecretStr(openai_api_key),
+    ).get_embeddings()
+
+    return PrebuiltEndpointVectorStore(client, registry, embeddings, index_dir, mmap=mmap)
+
+
+__all__ = [
+    "DEFAULT_INDEX_DIR",
+    "EndpointIndexConfig",
+    "EndpointIndexMetadata",
+    "IndexType",
+    "PrebuiltEndpointVectorStore",
+    "Quantization",
+    "apply_index_config",
+    "build_endpoint_index",
+    "build_faiss_index",
+    "index_exists",
+    "load_vector_store",
+    "read_index_metadata",
+    "set_search_params",
+]
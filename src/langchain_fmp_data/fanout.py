@@ -0,0 +1,207 @@
+"""Parallel per-entity sub-agents for multi-company comparisons.
+
+"Compare margins of AAPL, MSFT, GOOGL and AMZN" runs as one agent loop that
+fetches each company's data in turn, so its latency grows with every
+company. ``EntityFanOut`` splits such a query into one sub-query per ticker,
+runs the sub-queries as independent agent runs on a bounded thread pool and
+builds a single synthesis prompt from their findings, so wall-clock time
+follows the slowest company instead of the sum of all of them.
+
+Decomposition is deterministic: a query is split when it names between
+``min_entities`` and ``max_entities`` tickers and reads as a comparison.
+Queries relating the companies to each other in one calculation, such as a
+correlation, do not match the default comparison pattern and run as usual.
+"""
+
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, Field
+
+from langchain_fmp_data.prompt_cache import SYSTEM_PROMPT
+from langchain_fmp_data.symbols import extract_tickers
+
+logger = logging.getLogger(__name__)
+
+#: Words marking a query as a per-company comparison
+DEFAULT_COMPARISON_PATTERN = (
+    r"\b(?:compare|compared|comparing|comparison|versus|vs|rank|ranking|each|which of)\b"
+)
+
+#: Sub-query asked for each company
+SUB_QUERY_TEMPLATE = (
+    "{query}\n\nAnswer for {entity} only, with the figures behind the answer; "
+    "the other companies are covered separately."
+)
+
+#: Prompt of the synthesis call merging the per-company findings
+SYNTHESIS_TEMPLATE = (
+    "Answer the question using the findings gathered for each company below. "
+    "Compare the companies directly and say when a company's data is missing.\n\n"
+    "Question: {query}\n\n{findings}"
+)
+
+
+class SubQuery(BaseModel):
+    """Part of a decomposed query covering one company."""
+
+    entity: str = Field(..., description="Ticker the sub-query covers")
+    query: str = Field(..., description="Query asked to the sub-agent")
+
+
+class SubResult(BaseModel):
+    """Outcome of one sub-agent run."""
+
+    entity: str
+    answer: str = ""
+    results: List[Dict[str, Any]] = Field(default_factory=list)
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+class EntityFanOut:
+    """
+    Splits comparison queries per company and runs the parts concurrently.
+
+    Attributes:
+        max_concurrency: Sub-agents running at once, across all calls
+        min_entities: Fewest tickers for a query to be split
+        max_entities: Most tickers for a query to be split; larger queries
+            run as one agent
+        pattern: Regex a query must match to be split
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        min_entities: int = 2,
+        max_entities: int = 8,
+        pattern: str = DEFAULT_COMPARISON_PATTERN,
+    ) -> None:
+        """
+        Initialize the fan-out.
+
+        Args:
+            max_concurrency: Sub-agents running at once, across all calls
+            min_entities: Fewest tickers for a query to be split
+            max_entities: Most tickers for a query to be split
+            pattern: Case-insensitive regex a query must match to be split
+
+        Raises:
+            ValueError: If the bounds are inconsistent
+        """
+        if max_concurrency < 1 or min_entities < 2 or max_entities < min_entities:
+            raise ValueError(
+                "max_concurrency must be positive and 2 <= min_entities <= max_entities"
+            )
+        self.max_concurrency = max_concurrency
+        self.min_entities = min_entities
+        self.max_entities = max_entities
+        self.pattern = re.compile(pattern, re.IGNORECASE)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def decompose(self, query: str) -> List[SubQuery]:
+        """
+        Split a comparison query into one sub-query per ticker.
+
+        Args:
+            query: Natural language query
+
+        Returns:
+            Sub-queries, or an empty list if the query should not be split
+        """
+        tickers = extract_tickers(query)
+        if not self.min_entities <= len(tickers) <= self.max_entities:
+            return []
+        if not self.pattern.search(query):
+            return []
+        return [
+            SubQuery(entity=ticker, query=SUB_QUERY_TEMPLATE.format(query=query, entity=ticker))
+            for ticker in tickers
+        ]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="fmp-fanout"
+                )
+            return self._executor
+
+    def run(
+        self,
+        sub_queries: List[SubQuery],
+        answer: Callable[[SubQuery], Tuple[str, List[Dict[str, Any]]]],
+    ) -> List[SubResult]:
+        """
+        Run the sub-queries concurrently.
+
+        A failing sub-query is recorded with its error instead of failing the
+        others.
+
+        Args:
+            sub_queries: Sub-queries to run
+            answer: Runs one sub-query, returning its answer and tool results
+
+        Returns:
+            One result per sub-query, in order
+        """
+
+        def run_one(sub_query: SubQuery) -> SubResult:
+            start = time.perf_counter()
+            try:
+                text, results = answer(sub_query)
+            except Exception as e:
+                logger.warning(f"Sub-query for {sub_query.entity} failed: {str(e)}")
+                return SubResult(
+                    entity=sub_query.entity, error=str(e), seconds=time.perf_counter() - start
+                )
+            return SubResult(
+                entity=sub_query.entity,
+                answer=text,
+                results=results,
+                seconds=time.perf_counter() - start,
+            )
+
+        executor = self._get_executor()
+        futures = [executor.submit(run_one, sub_query) for sub_query in sub_queries]
+        sub_results = [future.result() for future in futures]
+        logger.debug(
+            "Fan-out timings: " + ", ".join(f"{r.entity} {r.seconds:.2f}s" for r in sub_results)
+        )
+        return sub_results
+
+    @staticmethod
+    def synthesis_messages(query: str, sub_results: List[SubResult]) -> List[BaseMessage]:
+        """
+        Build the single model call merging the sub-agents' findings.
+
+        Args:
+            query: Original query
+            sub_results: Results of the sub-queries
+
+        Returns:
+            Messages for the synthesis call
+        """
+        findings = "\n\n".join(
+            f"## {r.entity}\n{r.answer if r.error is None else f'No data: {r.error}'}"
+            for r in sub_results
+        )
+        prompt = SYNTHESIS_TEMPLATE.format(query=query, findings=findings)
+        return [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=prompt)]
+
+    def close(self) -> None:
+        """Shut down the thread pool."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+__all__ = ["EntityFanOut", "SubQuery", "SubResult"]
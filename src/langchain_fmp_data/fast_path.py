@@ -0,0 +1,355 @@
+"""Deterministic fast path for templated queries.
+
+Many queries are templates such as "price of AAPL", "Apple's market cap" or
+"latest income statement for MSFT", yet each one costs at least two model
+round-trips through the agent graph. ``FastPathMatcher`` matches a query
+against anchored regular expressions, resolves the company through a local
+``SymbolTable``, calls the endpoint tool directly and fills a text template
+with the result. A query that does not match, names an unknown company, or
+whose result is an error or lacks a templated field falls through to the
+agent.
+"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from langchain_fmp_data.analytics import result_rows
+from langchain_fmp_data.symbols import extract_tickers
+
+logger = logging.getLogger(__name__)
+
+# Optional lead-in of a question or command, e.g. "what is the", "show me"
+_LEAD = r"(?:(?:what(?:'s| is| are)|get|show(?: me)?|give me|tell me) )?(?:the )?"
+
+# Company name suffixes ignored when looking up names
+_NAME_SUFFIXES = re.compile(
+    r"\b(?:inc|incorporated|corp|corporation|co|company|ltd|limited|plc|sa|ag|nv|"
+    r"holdings?|group|class [a-z])\b"
+)
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a company name for lookup: lower case, no punctuation or suffixes."""
+    text = re.sub(r"[^\w\s]", " ", name.lower().replace("'s", ""))
+    return " ".join(_NAME_SUFFIXES.sub(" ", text).split())
+
+
+class SymbolTable:
+    """
+    Local lookup of ticker symbols by symbol or company name.
+
+    Attributes:
+        names: Symbols keyed by normalized company name or alias
+        symbols: Known symbols (None accepts any upper-case ticker)
+    """
+
+    def __init__(
+        self,
+        names: Optional[Mapping[str, str]] = None,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Initialize the table.
+
+        Args:
+            names: Symbols keyed by company name or alias
+            symbols: Known symbols; when omitted, any upper-case ticker in the
+                query is accepted and lower-case ones are only found by name
+        """
+        self.names: Dict[str, str] = {
+            normalize_name(name): symbol.upper() for name, symbol in (names or {}).items()
+        }
+        self.symbols = {symbol.upper() for symbol in symbols} if symbols is not None else None
+        if self.symbols is not None:
+            self.symbols.update(self.names.values())
+        self._max_name_words = max((len(name.split()) for name in self.names), default=0)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any]) -> "SymbolTable":
+        """
+        Build a table from symbol list rows such as FMP's stock list.
+
+        Args:
+            rows: Dicts or models with ``symbol`` and ``name``
+
+        Returns:
+            Table knowing every listed symbol and name
+        """
+        names: Dict[str, str] = {}
+        symbols: List[str] = []
+        for row in rows:
+            data = row if isinstance(row, dict) else row.model_dump()
+            symbol = data.get("symbol")
+            if not symbol:
+                continue
+            symbols.append(symbol)
+            if data.get("name"):
+                # The first listing of a name wins, e.g. the primary share class
+                names.setdefault(data["name"], symbol)
+        return cls(names, symbols)
+
+    def resolve(self, entity: str) -> Optional[str]:
+        """
+        Resolve the company part of a query to a symbol.
+
+        Args:
+            entity: Ticker (optionally ``$``-prefixed) or company name
+
+        Returns:
+            Symbol, or None if the entity is not known
+        """
+        text = entity.strip()
+        tickers = extract_tickers(text)
+        if len(tickers) == 1 and text.lstrip("$") == tickers[0]:
+            if self.symbols is None or tickers[0] in self.symbols:
+                return tickers[0]
+        if self.symbols is not None and text.lstrip("$").upper() in self.symbols:
+            return text.lstrip("$").upper()
+        return self.names.get(normalize_name(text))
+
+    def find(self, text: str) -> List[str]:
+        """
+        Find every known company a query names, by ticker or company name.
+
+        Upper-case tickers are always found; lower-case tickers only when
+        the table knows its symbols. Company names are matched on whole
+        words, longest name first.
+
+        Args:
+            text: Natural language query
+
+        Returns:
+            Symbols found, without duplicates
+        """
+        found: Dict[str, None] = {}
+        for ticker in extract_tickers(text):
+            if self.symbols is None or ticker in self.symbols:
+                found[ticker] = None
+        words = normalize_name(text).split()
+        position = 0
+        while position < len(words):
+            for length in range(min(self._max_name_words, len(words) - position), 0, -1):
+                symbol = self.names.get(" ".join(words[position : position + length]))
+                if symbol is not None:
+                    found[symbol] = None
+                    position += length
+                    break
+            else:
+                word = words[position].upper()
+                if self.symbols is not None and word in self.symbols:
+                    found[word] = None
+                position += 1
+        return list(found)
+
+
+class FastPathRule(BaseModel):
+    """A templated query answered by one endpoint tool call."""
+
+    name: str = Field(..., description="Rule name")
+    patterns: List[str] = Field(
+        ..., description="Case-insensitive regexes matching the whole query, with an entity group"
+    )
+    tool: str = Field(..., description="Endpoint tool to call")
+    args: Dict[str, Any] = Field(default_factory=dict, description="Fixed tool arguments")
+    symbol_arg: str = Field(default="symbol", description="Symbol argument of the tool")
+    template: str = Field(
+        ..., description="str.format template over the first result row and symbol"
+    )
+
+
+#: Rules for quotes, market caps and latest income statements
+DEFAULT_FAST_PATH_RULES: List[FastPathRule] = [
+    FastPathRule(
+        name="quote",
+        patterns=[
+            _LEAD + r"(?:current |latest )?(?:stock |share )?(?:price|quote) (?:of|for) "
+            r"(?P<entity>.+)",
+            _LEAD + r"(?P<entity>.+?)(?:'s)? (?:current |latest )?(?:stock |share )?"
+            r"(?:price|quote)",
+        ],
+        tool="get_quote",
+        template=(
+            "{symbol} is trading at {price:,.2f}, {change_percentage:+.2f}% on the day "
+            "(range {day_low:,.2f} to {day_high:,.2f})."
+        ),
+    ),
+    FastPathRule(
+        name="market_cap",
+        patterns=[
+            _LEAD + r"(?:current |latest )?market cap(?:italization)? (?:of|for) (?P<entity>.+)",
+            _LEAD + r"(?P<entity>.+?)(?:'s)? (?:current |latest )?market cap(?:italization)?",
+        ],
+        tool="get_market_cap",
+        template="{symbol} has a market capitalization of {market_cap:,.0f}.",
+    ),
+    FastPathRule(
+        name="income_statement",
+        patterns=[
+            _LEAD + r"(?:latest |most recent |last )?(?:annual )?income statement (?:of|for) "
+            r"(?P<entity>.+)",
+            _LEAD + r"(?P<entity>.+?)(?:'s)? (?:latest |most recent |last )?(?:annual )?"
+            r"income statement",
+        ],
+        tool="get_income_statement",
+        args={"period": "annual", "limit": 1},
+        template=(
+            "{symbol} income statement for fiscal year {fiscal_year} (ended {date:.10}), "
+            "in {reported_currency}: revenue {revenue:,.0f}, gross profit {gross_profit:,.0f}, "
+            "operating income {operating_income:,.0f}, net income {net_income:,.0f}, "
+            "diluted EPS {eps_diluted:,.2f}."
+        ),
+    ),
+    FastPathRule(
+        name="quarterly_income_statement",
+        patterns=[
+            _LEAD + r"(?:latest |most recent |last )?quarterly income statement (?:of|for) "
+            r"(?P<entity>.+)",
+            _LEAD + r"(?P<entity>.+?)(?:'s)? (?:latest |most recent |last )?quarterly "
+            r"income statement",
+        ],
+        tool="get_income_statement",
+        args={"period": "quarter", "limit": 1},
+        template=(
+            "{symbol} income statement for {period} {fiscal_year} (ended {date:.10}), "
+            "in {reported_currency}: revenue {revenue:,.0f}, gross profit {gross_profit:,.0f}, "
+            "operating income {operating_income:,.0f}, net income {net_income:,.0f}, "
+            "diluted EPS {eps_diluted:,.2f}."
+        ),
+    ),
+]
+
+
+class FastPathMatch(BaseModel):
+    """A query matched by a rule, with the tool call answering it."""
+
+    rule: FastPathRule
+    symbol: str
+    args: Dict[str, Any]
+
+
+class FastPathAnswer(BaseModel):
+    """A query answered without the agent."""
+
+    rule: str
+    tool: str
+    args: Dict[str, Any]
+    result: Any
+    text: str
+
+
+class FastPathMatcher:
+    """
+    Answers templated queries with a direct endpoint tool call.
+
+    Attributes:
+        rules: Rules tried in order
+        symbols: Table resolving companies to symbols
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Sequence[FastPathRule]] = None,
+        symbols: Optional[SymbolTable] = None,
+    ) -> None:
+        """
+        Initialize the matcher.
+
+        Args:
+            rules: Rules tried in order (defaults to ``DEFAULT_FAST_PATH_RULES``)
+            symbols: Table resolving companies to symbols (defaults to
+                accepting upper-case tickers only)
+        """
+        self.rules = list(rules if rules is not None else DEFAULT_FAST_PATH_RULES)
+        self.symbols = symbols or SymbolTable()
+        self._compiled = [
+            (rule, [re.compile(pattern, re.IGNORECASE) for pattern in rule.patterns])
+            for rule in self.rules
+        ]
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Collapse whitespace, unify apostrophes and drop trailing punctuation."""
+        return " ".join(query.replace("’", "'").split()).rstrip("?.! ")
+
+    def match(self, query: str) -> Optional[FastPathMatch]:
+        """
+        Find the first rule matching a query with a known company.
+
+        Args:
+            query: Natural language query
+
+        Returns:
+            Match with the tool arguments, or None
+        """
+        text = self.normalize_query(query)
+        for rule, patterns in self._compiled:
+            for pattern in patterns:
+                found = pattern.fullmatch(text)
+                if found is None:
+                    continue
+                symbol = self.symbols.resolve(found.group("entity"))
+                if symbol is not None:
+                    args = {**rule.args, rule.symbol_arg: symbol}
+                    return FastPathMatch(rule=rule, symbol=symbol, args=args)
+        return None
+
+    def answer(
+        self, query: str, get_tool: Callable[[str], Optional[BaseTool]]
+    ) -> Optional[FastPathAnswer]:
+        """
+        Answer a query directly if a rule matches it.
+
+        Args:
+            query: Natural language query
+            get_tool: Lookup of endpoint tools by name
+
+        Returns:
+            Answer, or None when the query should go to the agent
+        """
+        found = self.match(query)
+        if found is None:
+            return None
+        tool = get_tool(found.rule.tool)
+        if tool is None:
+            logger.debug(f"Fast path tool {found.rule.tool} is not available")
+            return None
+
+        try:
+            result = tool.invoke(found.args)
+        except Exception as e:
+            logger.warning(f"Fast path {found.rule.name} failed, using the agent: {str(e)}")
+            return None
+        if isinstance(result, dict) and result.get("status") == "error":
+            logger.debug(f"Fast path {found.rule.name} failed: {result.get('message')}")
+            return None
+        rows = result_rows(result)
+        if not rows:
+            return None
+        try:
+            text = found.rule.template.format(**{**rows[0], "symbol": found.symbol})
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Fast path {found.rule.name} could not format the result: {str(e)}")
+            return None
+
+        logger.debug(f"Fast path {found.rule.name} answered query: {query}")
+        return FastPathAnswer(
+            rule=found.rule.name,
+            tool=found.rule.tool,
+            args=found.args,
+            result=result,
+            text=text,
+        )
+
+
+__all__ = [
+    "DEFAULT_FAST_PATH_RULES",
+    "FastPathAnswer",
+    "FastPathMatch",
+    "FastPathMatcher",
+    "FastPathRule",
+    "SymbolTable",
+]
@@ -0,0 +1,261 @@
+"""Process-wide HTTP connection pooling for FMP endpoint tools.
+
+Every ``FMPDataTool`` and ``FMPDataToolkit`` builds its own fmp_data client,
+and each client opens its own connections. Under concurrent load that means
+repeated TCP and TLS handshakes and ephemeral port churn. A ``SharedHTTPPool``
+owns one pooled transport (sync and async) per process; attaching it to an
+fmp_data client swaps the client's ``httpx`` clients for thin wrappers over
+the shared transport, keeping the client's own headers, timeouts and event
+hooks.
+"""
+
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+from pydantic import BaseModel, ConfigDict, Field
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPPoolConfig(BaseModel):
+    """Connection pool settings shared by all FMP endpoint tools."""
+
+    model_config = ConfigDict(frozen=True)
+
+    max_connections: int = Field(default=100, gt=0, description="Maximum open connections")
+    max_keepalive_connections: int = Field(
+        default=20, ge=0, description="Maximum idle connections kept alive"
+    )
+    keepalive_expiry: float = Field(
+        default=30.0, gt=0, description="Seconds an idle connection is kept alive"
+    )
+    http2: bool = Field(default=True, description="Use HTTP/2 when the h2 package is installed")
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """Connection limits for httpx transports."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def http2_enabled(self) -> bool:
+        """Whether HTTP/2 is requested and available."""
+        return self.http2 and importlib.util.find_spec("h2") is not None
+
+
+class _SharedTransport(httpx.BaseTransport):
+    """Delegates to the pool's transport; closing a client leaves it open."""
+
+    def __init__(self, transport: httpx.HTTPTransport) -> None:
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._transport.handle_request(request)
+
+    def close(self) -> None:
+        pass
+
+
+class _SharedAsyncTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of ``_SharedTransport``."""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class SharedHTTPPool:
+    """
+    One pooled HTTP transport shared by every attached fmp_data client.
+
+    Attributes:
+        config: Pool settings
+    """
+
+    def __init__(self, config: Optional[HTTPPoolConfig] = None) -> None:
+        """
+        Initialize the pool. Transports are created on first use.
+
+        Args:
+            config: Pool settings (defaults to HTTPPoolConfig())
+        """
+        self.config = config or HTTPPoolConfig()
+        self._lock = threading.Lock()
+        self._transport: Optional[httpx.HTTPTransport] = None
+        self._async_transport: Optional[httpx.AsyncHTTPTransport] = None
+        self._clients: "weakref.WeakSet[httpx.Client]" = weakref.WeakSet()
+
+    def _sync_transport(self) -> httpx.HTTPTransport:
+        with self._lock:
+            if self._transport is None:
+                self._transport = httpx.HTTPTransport(
+                    limits=self.config.limits, http2=self.config.http2_enabled
+                )
+            return self._transport
+
+    def _async_http_transport(self) -> httpx.AsyncHTTPTransport:
+        with self._lock:
+            if self._async_transport is None:
+                self._async_transport = httpx.AsyncHTTPTransport(
+                    limits=self.config.limits, http2=self.config.http2_enabled
+                )
+            return self._async_transport
+
+    def client(self, template: Optional[httpx.Client] = None) -> httpx.Client:
+        """
+        Build a sync client over the shared transport.
+
+        Args:
+            template: Client whose headers, timeout, redirect policy and event
+                hooks are copied
+
+        Returns:
+            Client sharing the pool's connections
+        """
+        transport = _SharedTransport(self._sync_transport())
+        if template is None:
+            return httpx.Client(transport=transport)
+        return httpx.Client(
+            transport=transport,
+            headers=template.headers,
+            timeout=template.timeout,
+            follow_redirects=template.follow_redirects,
+            event_hooks=template.event_hooks,
+        )
+
+    def async_client(self, template: Optional[httpx.AsyncClient] = None) -> httpx.AsyncClient:
+        """
+        Build an async client over the shared transport.
+
+        Args:
+            template: Client whose headers, timeout, redirect policy and event
+                hooks are copied
+
+        Returns:
+            Async client sharing the pool's connections
+        """
+        transport = _SharedAsyncTransport(self._async_http_transport())
+        if template is None:
+            return httpx.AsyncClient(transport=transport)
+        return httpx.AsyncClient(
+            transport=transport,
+            headers=template.headers,
+            timeout=template.timeout,
+            follow_redirects=template.follow_redirects,
+            event_hooks=template.event_hooks,
+        )
+
+    def attach(self, fmp_client: Any) -> bool:
+        """
+        Route an fmp_data client's requests through the pool.
+
+        Args:
+            fmp_client: fmp_data ``BaseClient`` instance
+
+        Returns:
+            True if the client was attached, False if it has no httpx client
+        """
+        private_client = getattr(fmp_client, "client", None)
+        if not isinstance(private_client, httpx.Client):
+            return False
+        if private_client in self._clients:
+            return True
+
+        shared_client = self.client(private_client)
+        self._clients.add(shared_client)
+        fmp_client.client = shared_client
+        private_client.close()
+
+        # The async client is created lazily by fmp_data; build it now so it
+        # carries the async-compatible event hooks, then swap its transport.
+        setup_async = getattr(fmp_client, "_setup_async_client", None)
+        if callable(setup_async):
+            fmp_client._async_client = self.async_client(setup_async())
+        return True
+
+    def close(self) -> None:
+        """Close the shared sync transport."""
+        with self._lock:
+            if self._transport is not None:
+                self._transport.close()
+                self._transport = None
+
+    async def aclose(self) -> None:
+        """Close both shared transports."""
+        with self._lock:
+            transport, self._async_transport = self._async_transport, None
+        if transport is not None:
+            await transport.aclose()
+        self.close()
+
+
+_pools: Dict[HTTPPoolConfig, SharedHTTPPool] = {}
+_pools_pid = os.getpid()
+_pools_lock = threading.Lock()
+
+
+def get_shared_http_pool(config: Optional[HTTPPoolConfig] = None) -> SharedHTTPPool:
+    """
+    Return the process-wide pool for the given settings.
+
+    Pools are never shared across a fork: a child process gets fresh ones.
+
+    Args:
+        config: Pool settings (defaults to HTTPPoolConfig())
+
+    Returns:
+        Shared pool
+    """
+    global _pools_pid
+    config = config or HTTPPoolConfig()
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(config)
+        if pool is None:
+            pool = _pools[config] = SharedHTTPPool(config)
+        return pool
+
+
+def attach_http_pool(vector_store: Any, pool: Optional[SharedHTTPPool] = None) -> bool:
+    """
+    Route every endpoint tool of a vector store through a shared pool.
+
+    Endpoint tools call the store's fmp_data client, so attaching the pool to
+    that client covers all of them.
+
+    Args:
+        vector_store: EndpointVectorStore instance
+        pool: Pool to use (defaults to the process-wide default pool)
+
+    Returns:
+        True if the pool was attached
+    """
+    pool = pool or get_shared_http_pool()
+    try:
+        return pool.attach(getattr(vector_store, "client", None))
+    except Exception as e:
+        logger.warning(f"Could not attach shared HTTP pool: {str(e)}")
+        return False
+
+
+__all__ = [
+    "HTTPPoolConfig",
+    "SharedHTTPPool",
+    "attach_http_pool",
+    "get_shared_http_pool",
+]
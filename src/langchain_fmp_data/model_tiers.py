@@ -0,0 +1,201 @@
+"""Model tiering: a fast model for tool-calling steps, the main model for answers.
+
+Most agent steps only pick the next FMP calls, yet every step waited on the
+main model. With a ``ModelRouter``, ``call_model`` sends each step to a
+smaller, lower-latency model first. Its response is kept when it makes valid
+calls to bound tools; when it answers instead, the main model writes the
+final answer from the same messages, and when it fails or calls unknown
+tools, the main model takes the step. ``TierStats`` records the calls and
+latency of each tier.
+"""
+
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Collection, Dict, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+logger = logging.getLogger(__name__)
+
+
+class ModelTier(str, Enum):
+    """Model tiers of the agent."""
+
+    FAST = "fast"
+    MAIN = "main"
+
+
+class TierStats:
+    """
+    Thread-safe running totals of model calls per tier.
+
+    Attributes:
+        calls: Number of calls per tier
+        seconds: Total call latency per tier
+        failures: Number of failed calls per tier
+        escalations: Fast-model answers replaced by a main-model answer
+        fallbacks: Fast-model steps redone by the main model after a failure
+            or invalid tool calls
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty totals."""
+        self.calls: Dict[ModelTier, int] = dict.fromkeys(ModelTier, 0)
+        self.seconds: Dict[ModelTier, float] = dict.fromkeys(ModelTier, 0.0)
+        self.failures: Dict[ModelTier, int] = dict.fromkeys(ModelTier, 0)
+        self.escalations = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def record(self, tier: ModelTier, seconds: float, failed: bool = False) -> None:
+        """
+        Add one model call.
+
+        Args:
+            tier: Tier of the model called
+            seconds: Latency of the call
+            failed: Whether the call raised
+        """
+        with self._lock:
+            self.calls[tier] += 1
+            self.seconds[tier] += seconds
+            if failed:
+                self.failures[tier] += 1
+
+    def count(self, escalation: bool = False, fallback: bool = False) -> None:
+        """Count an escalation or a fallback to the main model."""
+        with self._lock:
+            self.escalations += int(escalation)
+            self.fallbacks += int(fallback)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current totals as a dictionary."""
+        with self._lock:
+            tiers = {
+                tier.value: {
+                    "calls": self.calls[tier],
+                    "failures": self.failures[tier],
+                    "mean_seconds": self.seconds[tier] / self.calls[tier]
+                    if self.calls[tier]
+                    else 0.0,
+                }
+                for tier in ModelTier
+            }
+            return {**tiers, "escalations": self.escalations, "fallbacks": self.fallbacks}
+
+
+class ModelRouter:
+    """
+    Routes agent steps between a fast model and the main model.
+
+    Attributes:
+        fast_model: Model tried first for each step
+        max_fast_steps: Tool-calling steps per user turn sent to the fast
+            model before later steps go straight to the main model
+            (None for no limit)
+        escalate_answers: Have the main model write the answer when the fast
+            model answers without calling tools
+        stats: Calls and latency per tier
+    """
+
+    def __init__(
+        self,
+        fast_model: BaseChatModel,
+        max_fast_steps: Optional[int] = None,
+        escalate_answers: bool = True,
+        stats: Optional[TierStats] = None,
+    ) -> None:
+        """
+        Initialize the router.
+
+        Args:
+            fast_model: Smaller, lower-latency model supporting tool binding
+            max_fast_steps: Tool-calling steps per user turn sent to the fast
+                model (defaults to no limit)
+            escalate_answers: Have the main model write final answers
+                (default: True)
+            stats: Recorder of calls per tier (defaults to a new one)
+        """
+        self.fast_model = fast_model
+        self.max_fast_steps = max_fast_steps
+        self.escalate_answers = escalate_answers
+        self.stats = stats if stats is not None else TierStats()
+
+    def use_fast_model(self, messages: Sequence[BaseMessage]) -> bool:
+        """Check whether the fast model may take the next step of the turn."""
+        if self.max_fast_steps is None:
+            return True
+        steps = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            if isinstance(message, AIMessage) and message.tool_calls:
+                steps += 1
+        return steps < self.max_fast_steps
+
+    def _call(
+        self,
+        tier: ModelTier,
+        model: Any,
+        tools: Sequence[Any],
+        messages: Sequence[BaseMessage],
+        invoke: Callable[[Any, Sequence[BaseMessage]], BaseMessage],
+    ) -> BaseMessage:
+        """Invoke a model with the tools bound, recording its latency."""
+        runnable = model.bind_tools(tools=tools) if tools else model
+        start = time.perf_counter()
+        try:
+            response = invoke(runnable, messages)
+        except Exception:
+            self.stats.record(tier, time.perf_counter() - start, failed=True)
+            raise
+        self.stats.record(tier, time.perf_counter() - start)
+        return response
+
+    def invoke(
+        self,
+        main_model: Any,
+        tools: Sequence[Any],
+        tool_names: Collection[str],
+        messages: Sequence[BaseMessage],
+        invoke: Callable[[Any, Sequence[BaseMessage]], BaseMessage],
+    ) -> BaseMessage:
+        """
+        Run one agent step on the fast model, falling back to the main model.
+
+        Args:
+            main_model: Model writing answers and taking failed steps
+            tools: Tools to bind
+            tool_names: Names of the bound tools, to validate tool calls
+            messages: Conversation messages
+            invoke: Function invoking a runnable on the messages
+
+        Returns:
+            Model response for the step
+        """
+        if self.use_fast_model(messages):
+            try:
+                response = self._call(ModelTier.FAST, self.fast_model, tools, messages, invoke)
+            except Exception as e:
+                logger.warning(f"Fast model failed, using the main model: {str(e)}")
+                self.stats.count(fallback=True)
+            else:
+                calls = getattr(response, "tool_calls", None) or []
+                invalid = getattr(response, "invalid_tool_calls", None)
+                if calls and not invalid and all(call["name"] in tool_names for call in calls):
+                    return response
+                if not calls and not invalid and not self.escalate_answers:
+                    return response
+                if calls or invalid:
+                    logger.debug("Fast model made invalid tool calls, using the main model")
+                    self.stats.count(fallback=True)
+                else:
+                    self.stats.count(escalation=True)
+
+        return self._call(ModelTier.MAIN, main_model, tools, messages, invoke)
+
+
+__all__ = ["ModelRouter", "ModelTier", "TierStats"]
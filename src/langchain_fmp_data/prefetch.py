@@ -0,0 +1,209 @@
+"""Speculative prefetching of predictable FMP tool calls.
+
+For common question shapes ("price of X", "latest income statement of X") the
+tool calls the model will make can be predicted from the query and the
+retrieved toolset. The prefetcher starts those calls in the background while
+the model is still thinking, and parks the results in a short-lived cache that
+``BasicToolNode`` checks before calling a tool itself.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from langchain_fmp_data.symbols import extract_tickers
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchRule(BaseModel):
+    """Maps a question intent to the tool call it usually triggers."""
+
+    tool_name: str = Field(..., description="Endpoint tool to call")
+    keywords: List[str] = Field(..., description="Phrases that signal the intent")
+    args: Dict[str, Any] = Field(
+        default_factory=dict, description="Fixed arguments added to every call"
+    )
+    symbol_arg: str = Field(default="symbol", description="Argument receiving the ticker")
+
+
+DEFAULT_PREFETCH_RULES: List[PrefetchRule] = [
+    PrefetchRule(
+        tool_name="get_quote",
+        keywords=["price", "quote", "trading at", "share price", "stock price"],
+    ),
+    PrefetchRule(
+        tool_name="get_market_cap",
+        keywords=["market cap", "market capitalization", "valuation"],
+    ),
+    PrefetchRule(
+        tool_name="get_profile",
+        keywords=["profile", "company info", "sector", "industry", "ceo"],
+    ),
+    PrefetchRule(
+        tool_name="get_income_statement",
+        keywords=["income statement", "revenue", "net income", "earnings"],
+    ),
+]
+
+
+def tool_call_key(tool_name: str, args: Dict[str, Any]) -> str:
+    """Build a canonical cache key for a tool call, ignoring unset arguments."""
+    canonical = {k: v for k, v in args.items() if v is not None}
+    return f"{tool_name}:{json.dumps(canonical, sort_keys=True, default=str)}"
+
+
+class ToolResultCache:
+    """
+    Short-lived cache of in-flight or completed tool results.
+
+    Entries are futures, so a lookup made while the prefetch is still running
+    waits for it instead of issuing a duplicate request.
+
+    Attributes:
+        ttl: Seconds an entry stays valid
+        max_entries: Maximum number of cached calls
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 256) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, Future]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, tool_name: str, args: Dict[str, Any], future: Future) -> None:
+        """Store the pending result of a tool call."""
+        key = tool_call_key(tool_name, args)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, future)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, tool_name: str, args: Dict[str, Any]) -> Optional[Future]:
+        """Return the pending result of a tool call, if cached and fresh."""
+        key = tool_call_key(tool_name, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, future = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return future
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SpeculativePrefetcher:
+    """
+    Starts likely FMP tool calls in the background.
+
+    Attributes:
+        rules: Intent rules used to predict tool calls
+        max_prefetch: Maximum number of calls started per query
+        cache: Cache holding prefetched results
+    """
+
+    def __init__(
+        self,
+        rules: Optional[List[PrefetchRule]] = None,
+        max_workers: int = 4,
+        max_prefetch: int = 4,
+        ttl: float = 30.0,
+    ) -> None:
+        """
+        Initialize the prefetcher.
+
+        Args:
+            rules: Intent rules (defaults to DEFAULT_PREFETCH_RULES)
+            max_workers: Number of background threads
+            max_prefetch: Maximum number of calls started per query
+            ttl: Seconds a prefetched result stays valid
+        """
+        self.rules = list(rules) if rules is not None else list(DEFAULT_PREFETCH_RULES)
+        self.max_prefetch = max_prefetch
+        self.cache = ToolResultCache(ttl=ttl)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fmp-prefetch"
+        )
+
+    def plan(self, query: str, available_tools: Iterable[str]) -> List[Tuple[str, Dict]]:
+        """
+        Predict the tool calls a query will need.
+
+        Args:
+            query: Natural language query
+            available_tools: Names of the tools bound for this query
+
+        Returns:
+            List of (tool name, arguments) pairs
+        """
+        tickers = extract_tickers(query)
+        if not tickers:
+            return []
+
+        available = set(available_tools)
+        lowered = query.lower()
+        calls: List[Tuple[str, Dict]] = []
+        for rule in self.rules:
+            if rule.tool_name not in available:
+                continue
+            if not any(keyword in lowered for keyword in rule.keywords):
+                continue
+            for ticker in tickers:
+                calls.append((rule.tool_name, {**rule.args, rule.symbol_arg: ticker}))
+        return calls[: self.max_prefetch]
+
+    def prefetch(
+        self,
+        query: str,
+        available_tools: Iterable[str],
+        resolve_tool: Callable[[str], Optional[BaseTool]],
+    ) -> int:
+        """
+        Start the predicted tool calls in the background.
+
+        Args:
+            query: Natural language query
+            available_tools: Names of the tools bound for this query
+            resolve_tool: Returns the tool instance for a tool name
+
+        Returns:
+            Number of calls started
+        """
+        started = 0
+        for tool_name, args in self.plan(query, available_tools):
+            if self.cache.get(tool_name, args) is not None:
+                continue
+            tool = resolve_tool(tool_name)
+            if tool is None:
+                continue
+            self.cache.put(tool_name, args, self._executor.submit(tool.invoke, args))
+            started += 1
+        if started:
+            logger.debug(f"Prefetching {started} tool calls")
+        return started
+
+    def shutdown(self) -> None:
+        """Stop the background threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = [
+    "DEFAULT_PREFETCH_RULES",
+    "PrefetchRule",
+    "SpeculativePrefetcher",
+    "ToolResultCache",
+    "tool_call_key",
+]
@@ -0,0 +1,369 @@
+"""Local incremental store for historical price series.
+
+Backtests and trend questions ask for overlapping date ranges of the same
+symbols again and again, and every historical price tool call downloads the
+whole range from FMP. ``PriceStore`` keeps one memory-mapped NumPy file per
+endpoint and symbol next to the list of date ranges already fetched, and
+``cache_price_history`` wraps a historical price tool so it only requests the
+ranges missing locally, appends them and answers the rest from disk.
+
+Coverage is tracked by requested range rather than by the rows returned, so
+weekends and holidays inside a fetched range are not requested again. The
+current day is never recorded as covered since its bar changes until the
+close.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from langchain_core.tools import BaseTool, StructuredTool
+
+logger = logging.getLogger(__name__)
+
+#: Historical price tools served from the store, with the date field of their rows
+PRICE_HISTORY_ENDPOINTS: Dict[str, str] = {
+    "get_historical_prices": "date",
+    "get_crypto_historical": "price_date",
+    "get_forex_historical": "price_date",
+    "get_commodity_historical": "price_date",
+}
+
+DEFAULT_DATE_FIELD = "date"
+DATA_FILE = "prices.npy"
+META_FILE = "meta.json"
+
+DateRange = Tuple[date, date]
+
+_ONE_DAY = timedelta(days=1)
+
+
+def to_date(value: Union[date, str]) -> date:
+    """Parse a date, datetime or ISO date(time) string into a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _merge_ranges(ranges: Sequence[DateRange]) -> List[DateRange]:
+    """Merge overlapping or adjacent date ranges."""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + _ONE_DAY:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class PriceStore:
+    """
+    On-disk store of daily price series with fetched-range tracking.
+
+    Each series lives in ``<root_dir>/<endpoint>/<SYMBOL>/`` as a structured
+    ``prices.npy`` array sorted by date (the date first, then the numeric
+    fields of the rows) and a ``meta.json`` listing covered ranges. Files are
+    replaced atomically, and reads memory-map the array. Writes are
+    serialized within a process; use one writing process per directory.
+
+    Attributes:
+        root_dir: Directory holding the series
+    """
+
+    def __init__(self, root_dir: Union[str, Path]) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            root_dir: Directory holding the series (created on first write)
+        """
+        self.root_dir = Path(root_dir).expanduser()
+        self._lock = threading.RLock()
+
+    def _series_dir(self, endpoint: str, symbol: str) -> Path:
+        return self.root_dir / endpoint / re.sub(r"[^A-Z0-9._-]", "_", symbol.upper())
+
+    def _read_meta(self, series_dir: Path) -> Dict[str, Any]:
+        try:
+            with open(series_dir / META_FILE, encoding="utf-8") as f:
+                return dict(json.load(f))
+        except FileNotFoundError:
+            return {"coverage": [], "int_columns": []}
+
+    @staticmethod
+    def _replace(path: Path, write: Any) -> None:
+        """Write a file through a temporary sibling and an atomic rename."""
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def coverage(self, endpoint: str, symbol: str) -> List[DateRange]:
+        """
+        Return the merged date ranges already fetched for a series.
+
+        Args:
+            endpoint: Historical price tool name
+            symbol: Symbol of the series
+
+        Returns:
+            Covered ranges in ascending order
+        """
+        meta = self._read_meta(self._series_dir(endpoint, symbol))
+        return [(date.fromisoformat(a), date.fromisoformat(b)) for a, b in meta["coverage"]]
+
+    def missing_ranges(self, endpoint: str, symbol: str, start: date, end: date) -> List[DateRange]:
+        """
+        Return the parts of a date range not fetched yet.
+
+        Args:
+            endpoint: Historical price tool name
+            symbol: Symbol of the series
+            start: First day of the range
+            end: Last day of the range
+
+        Returns:
+            Uncovered sub-ranges in ascending order
+        """
+        missing: List[DateRange] = []
+        cursor = start
+        for covered_start, covered_end in self.coverage(endpoint, symbol):
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start - _ONE_DAY))
+            cursor = covered_end + _ONE_DAY
+            if cursor > end:
+                return missing
+        missing.append((cursor, end))
+        return missing
+
+    def write(
+        self,
+        endpoint: str,
+        symbol: str,
+        rows: Sequence[Dict[str, Any]],
+        start: date,
+        end: date,
+        date_field: str = DEFAULT_DATE_FIELD,
+    ) -> None:
+        """
+        Merge fetched rows into a series and record their range as covered.
+
+        Rows replace stored rows of the same day. The current day and later
+        are stored but not marked covered.
+
+        Args:
+            endpoint: Historical price tool name
+            symbol: Symbol of the series
+            rows: Rows returned for the range
+            start: First day of the fetched range
+            end: Last day of the fetched range
+            date_field: Name of the date field of the rows
+        """
+        series_dir = self._series_dir(endpoint, symbol)
+        with self._lock:
+            series_dir.mkdir(parents=True, exist_ok=True)
+            meta = self._read_meta(series_dir)
+            existing = self._load(series_dir)
+
+            names = (
+                set(existing.dtype.names or ()) - {date_field} if existing is not None else set()
+            )
+            int_columns = set(meta["int_columns"])
+            new_names = {
+                key
+                for row in rows
+                for key, value in row.items()
+                if key != date_field and _is_number(value)
+            }
+            for name in new_names:
+                values = [row.get(name) for row in rows if row.get(name) is not None]
+                is_int = all(isinstance(v, int) and not isinstance(v, bool) for v in values)
+                if is_int and (name in int_columns or name not in names):
+                    int_columns.add(name)
+                else:
+                    int_columns.discard(name)
+            columns = sorted(names | new_names)
+
+            dtype = [(date_field, "datetime64[D]")] + [(name, "f8") for name in columns]
+            fetched = np.zeros(len(rows), dtype=dtype)
+            fetched[date_field] = [np.datetime64(to_date(row[date_field]), "D") for row in rows]
+            for name in columns:
+                fetched[name] = [
+                    float(row[name]) if _is_number(row.get(name)) else math.nan for row in rows
+                ]
+
+            if existing is not None:
+                kept = existing[~np.isin(existing[date_field], fetched[date_field])]
+                merged = np.zeros(len(kept), dtype=dtype)
+                merged[date_field] = kept[date_field]
+                for name in columns:
+                    merged[name] = kept[name] if name in names else math.nan
+                fetched = np.concatenate([merged, fetched])
+                del existing, kept
+            fetched = fetched[np.argsort(fetched[date_field], kind="stable")]
+
+            covered_end = min(end, date.today() - _ONE_DAY)
+            coverage = self.coverage(endpoint, symbol)
+            if start <= covered_end:
+                coverage.append((start, covered_end))
+            meta = {
+                "coverage": [[a.isoformat(), b.isoformat()] for a, b in _merge_ranges(coverage)],
+                "int_columns": sorted(int_columns & set(columns)),
+            }
+
+            # Data before metadata: a crash in between only loses coverage
+            self._replace(series_dir / DATA_FILE, lambda f: np.save(f, fetched))
+            self._replace(
+                series_dir / META_FILE, lambda f: f.write(json.dumps(meta).encode("utf-8"))
+            )
+        logger.debug(f"Stored {len(rows)} {endpoint} rows for {symbol} ({start} to {end})")
+
+    @staticmethod
+    def _load(series_dir: Path) -> Optional[np.ndarray]:
+        try:
+            return np.load(series_dir / DATA_FILE, mmap_mode="r")
+        except FileNotFoundError:
+            return None
+
+    def read(self, endpoint: str, symbol: str, start: date, end: date) -> List[Dict[str, Any]]:
+        """
+        Return the stored rows of a date range, newest first as FMP does.
+
+        Args:
+            endpoint: Historical price tool name
+            symbol: Symbol of the series
+            start: First day of the range
+            end: Last day of the range
+
+        Returns:
+            Rows with the date as ``YYYY-MM-DD``, the stored numeric fields
+            and missing values as None
+        """
+        series_dir = self._series_dir(endpoint, symbol)
+        with self._lock:
+            meta = self._read_meta(series_dir)
+            prices = self._load(series_dir)
+        if prices is None:
+            return []
+
+        date_field = (prices.dtype.names or (DEFAULT_DATE_FIELD,))[0]
+        int_columns = set(meta["int_columns"])
+        dates = prices[date_field]
+        lo = int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+        hi = int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        names = [name for name in prices.dtype.names or () if name != date_field]
+
+        rows: List[Dict[str, Any]] = []
+        for record in prices[lo:hi][::-1]:
+            row: Dict[str, Any] = {date_field: str(record[date_field])}
+            for name in names:
+                value = float(record[name])
+                if math.isnan(value):
+                    row[name] = None
+                else:
+                    row[name] = int(value) if name in int_columns else value
+            rows.append(row)
+        return rows
+
+
+def _history_rows(result: Any) -> Optional[List[Dict[str, Any]]]:
+    """Rows of a successful historical price tool result, None otherwise."""
+    if not isinstance(result, dict) or result.get("status") != "success":
+        return None
+    data = result.get("data")
+    rows = data.get("historical") if isinstance(data, dict) else None
+    return rows if isinstance(rows, list) else None
+
+
+def cache_price_history(
+    tool: BaseTool, store: PriceStore, date_field: str = DEFAULT_DATE_FIELD
+) -> BaseTool:
+    """
+    Serve a historical price tool from a local store.
+
+    Requests with a start date only fetch the sub-ranges not stored yet and
+    are answered from the store. Requests without one leave the window to
+    FMP, and their rows are stored for later requests. Error results are
+    returned as they are.
+
+    Args:
+        tool: Historical price tool taking ``symbol``, ``start_date`` and
+            ``end_date``
+        store: Store holding the series
+        date_field: Name of the date field of the tool's rows
+
+    Returns:
+        Tool with the same name and schema backed by the store, or ``tool``
+        itself if it cannot be wrapped
+    """
+    func = getattr(tool, "func", None)
+    if not isinstance(tool, StructuredTool) or func is None:
+        return tool
+    endpoint = tool.name
+
+    def run(**kwargs: Any) -> Any:
+        symbol = kwargs.get("symbol")
+        if not isinstance(symbol, str) or not symbol:
+            return func(**kwargs)
+        end_date = kwargs.get("end_date")
+        end = to_date(end_date) if end_date is not None else date.today()
+
+        if kwargs.get("start_date") is None:
+            result = func(**kwargs)
+            rows = _history_rows(result)
+            if rows:
+                first = min(to_date(row[date_field]) for row in rows)
+                store.write(endpoint, symbol, rows, first, end, date_field)
+            return result
+
+        start = to_date(kwargs["start_date"])
+        if start > end:
+            return func(**kwargs)
+        for missing_start, missing_end in store.missing_ranges(endpoint, symbol, start, end):
+            result = func(**{**kwargs, "start_date": missing_start, "end_date": missing_end})
+            rows = _history_rows(result)
+            if rows is None:
+                return result
+            store.write(endpoint, symbol, rows, missing_start, missing_end, date_field)
+
+        return {
+            "status": "success",
+            "data": {"symbol": symbol, "historical": store.read(endpoint, symbol, start, end)},
+        }
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        func=run,
+    )
+
+
+__all__ = [
+    "PRICE_HISTORY_ENDPOINTS",
+    "PriceStore",
+    "cache_price_history",
+    "to_date",
+]
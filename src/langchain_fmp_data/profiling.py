@@ -0,0 +1,351 @@
+"""Sampled CPU and allocation profiling of production queries.
+
+A slow or memory-heavy query seen in production rarely reproduces locally.
+``QueryProfiler`` captures evidence while it happens: per-node timings of the
+agent graph (``agent`` is ``call_model``, ``tools`` is ``BasicToolNode``) and
+of ``format_response`` for every query, plus a ``cProfile`` CPU profile and a
+``tracemalloc`` allocation summary for a sampled share of queries. Sampled
+queries, and queries slower than ``slow_query_seconds``, are written as local
+artifacts named after their thread id: a JSON report and, when the CPU
+profiler ran, a ``.prof`` file readable with ``pstats`` or snakeviz.
+
+One query is profiled at a time, since ``tracemalloc`` is process-wide and
+so is ``cProfile`` on Python 3.12+, where it also records work other threads
+did meanwhile. On Python 3.10 and 3.11, ``cProfile`` only profiles the thread
+that runs the query: work in the tool node's worker threads is missing from
+the CPU profile, though the per-node timings still cover it. Queries arriving
+while another is profiled only get timings.
+"""
+
+import cProfile
+import json
+import logging
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from pydantic import BaseModel, ConfigDict, Field
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingConfig(BaseModel):
+    """When to profile queries and where to write the artifacts."""
+
+    model_config = ConfigDict(frozen=True)
+
+    sample_rate: float = Field(
+        default=0.01, ge=0, le=1, description="Share of queries profiled and written"
+    )
+    slow_query_seconds: Optional[float] = Field(
+        default=None, gt=0, description="Queries slower than this are written too"
+    )
+    profile_all_queries: bool = Field(
+        default=False,
+        description="Run the profilers on every query, so slow queries are written with "
+        "a CPU profile and allocations instead of timings only (adds profiler overhead)",
+    )
+    output_dir: str = Field(default="fmp_profiles", description="Directory for the artifacts")
+    memory: bool = Field(default=True, description="Trace allocations with tracemalloc")
+    traceback_frames: int = Field(
+        default=1, gt=0, description="Frames tracemalloc keeps per allocation"
+    )
+    top_entries: int = Field(
+        default=25, gt=0, description="Functions and allocation sites listed in each report"
+    )
+
+
+class NodeTimer(BaseCallbackHandler):
+    """Callback handler timing each node run of a LangGraph graph."""
+
+    def __init__(self, profile: "QueryProfile") -> None:
+        """
+        Initialize the handler.
+
+        Args:
+            profile: Profile receiving the timings
+        """
+        self.profile = profile
+        self._starts: Dict[UUID, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Start timing a run if it is a graph node."""
+        node = (metadata or {}).get("langgraph_node")
+        # Runs nested in a node inherit its metadata; only the node run has its name
+        if node is not None and kwargs.get("name") == node:
+            with self._lock:
+                self._starts[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Record the timing of a finished node run."""
+        self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        """Record the timing of a failed node run."""
+        self._finish(run_id)
+
+    def _finish(self, run_id: UUID) -> None:
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+        if started is not None:
+            self.profile.add_timing(started[0], time.perf_counter() - started[1])
+
+
+class QueryProfile:
+    """
+    Timings of one query, collected while it runs.
+
+    Attributes:
+        query: Natural language query
+        thread_id: Conversation the query belongs to
+        timings: Name and seconds of each timed node run or phase, in order
+        callbacks: Callback handlers to pass in the graph's run config
+    """
+
+    def __init__(self, query: str, thread_id: str) -> None:
+        """
+        Initialize an empty profile.
+
+        Args:
+            query: Natural language query
+            thread_id: Conversation the query belongs to
+        """
+        self.query = query
+        self.thread_id = thread_id
+        self.timings: List[Tuple[str, float]] = []
+        self.callbacks: List[BaseCallbackHandler] = [NodeTimer(self)]
+        self._lock = threading.Lock()
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        """Record the duration of a node run or phase."""
+        with self._lock:
+            self.timings.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a block of code.
+
+        Args:
+            name: Phase name
+
+        Yields:
+            None, while the phase runs
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - start)
+
+    def totals(self) -> Dict[str, float]:
+        """Return the total seconds per node or phase."""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for name, seconds in self.timings:
+                totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+
+_active_profile: ContextVar[Optional[QueryProfile]] = ContextVar("fmp_active_profile", default=None)
+
+
+def active_profile() -> Optional[QueryProfile]:
+    """Return the profile of the query running in this context, if any."""
+    return _active_profile.get()
+
+
+def profile_phase(name: str) -> ContextManager[None]:
+    """Time a block as a phase of the active query profile, if any."""
+    profile = _active_profile.get()
+    return profile.phase(name) if profile is not None else nullcontext()
+
+
+class QueryProfiler:
+    """
+    Thread-safe sampler capturing query profiles and writing them to disk.
+
+    Attributes:
+        config: Sampling and output settings
+        written: Number of reports written
+    """
+
+    def __init__(self, config: Optional[ProfilingConfig] = None) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            config: Settings (defaults to ProfilingConfig())
+        """
+        self.config = config or ProfilingConfig()
+        self.written = 0
+        self._slot = threading.Lock()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def capture(self, query: str, thread_id: str) -> Iterator[QueryProfile]:
+        """
+        Profile one query, writing the artifacts if it is sampled or slow.
+
+        Args:
+            query: Natural language query
+            thread_id: Conversation the query belongs to
+
+        Yields:
+            Profile collecting the query's timings; pass its ``callbacks`` in
+            the graph's run config to time each node
+        """
+        config = self.config
+        sampled = random.random() < config.sample_rate  # nosec B311
+        profiler: Optional[cProfile.Profile] = None
+        tracing = False
+        if (sampled or config.profile_all_queries) and self._slot.acquire(blocking=False):
+            profiler, tracing = self._start_profilers()
+            if profiler is None and not tracing:
+                self._slot.release()
+
+        profile = QueryProfile(query, thread_id)
+        token = _active_profile.set(profile)
+        started_at = datetime.now()
+        start = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            yield profile
+        except BaseException as e:
+            error = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            _active_profile.reset(token)
+            memory = self._stop_profilers(profiler, tracing)
+            if profiler is not None or tracing:
+                self._slot.release()
+
+            slow = config.slow_query_seconds is not None and seconds > config.slow_query_seconds
+            if sampled or slow:
+                report = {
+                    "thread_id": thread_id,
+                    "query": query,
+                    "reason": "sampled" if sampled else "slow",
+                    "started_at": started_at.isoformat(),
+                    "seconds": seconds,
+                    "error": error,
+                    "timings": [{"name": n, "seconds": s} for n, s in profile.timings],
+                    "node_seconds": profile.totals(),
+                    "memory": memory,
+                }
+                try:
+                    self._write(report, profiler)
+                except OSError as e:
+                    # Profiling must never fail the query it observes
+                    logger.warning(f"Failed to write query profile: {str(e)}")
+
+    def _start_profilers(self) -> Tuple[Optional[cProfile.Profile], bool]:
+        """Start the CPU profiler and allocation tracing (caller holds the slot)."""
+        profiler: Optional[cProfile.Profile] = cProfile.Profile()
+        try:
+            profiler.enable()  # type: ignore[union-attr]
+        except ValueError as e:
+            # Another profiler outside this class is active
+            logger.debug(f"CPU profiler unavailable: {str(e)}")
+            profiler = None
+
+        tracing = self.config.memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start(self.config.traceback_frames)
+        return profiler, tracing
+
+    def _stop_profilers(
+        self, profiler: Optional[cProfile.Profile], tracing: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Stop the profilers and summarize the allocations of the query."""
+        if profiler is not None:
+            profiler.disable()
+        if not tracing:
+            return None
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        snapshot = snapshot.filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        )
+        return {
+            "peak_bytes": peak,
+            "top": [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[: self.config.top_entries]
+            ],
+        }
+
+    def _write(self, report: Dict[str, Any], profiler: Optional[cProfile.Profile]) -> Path:
+        """Write a report, and the CPU profile if one was taken."""
+        output_dir = Path(self.config.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        thread = re.sub(r"[^\w.-]", "_", report["thread_id"])[:64]
+        stem = f"{datetime.now():%Y%m%dT%H%M%S}-{thread}-{uuid.uuid4().hex[:8]}"
+
+        report["profile_file"] = None
+        report["cpu_top"] = []
+        if profiler is not None:
+            profile_path = output_dir / f"{stem}.prof"
+            profiler.dump_stats(str(profile_path))
+            report["profile_file"] = profile_path.name
+            report["cpu_top"] = _top_functions(profiler, self.config.top_entries)
+
+        report_path = output_dir / f"{stem}.json"
+        report_path.write_text(json.dumps(report, indent=2, default=str))
+        with self._lock:
+            self.written += 1
+        logger.info(
+            f"Wrote {report['reason']} query profile ({report['seconds']:.2f}s) to {report_path}"
+        )
+        return report_path
+
+
+def _top_functions(profiler: cProfile.Profile, count: int) -> List[Dict[str, Any]]:
+    """List the functions with the most cumulative time."""
+    stats: Dict[Any, Any] = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:count]
+    return [
+        {
+            "function": f"{filename}:{lineno}({name})",
+            "calls": calls,
+            "total_seconds": total,
+            "cumulative_seconds": cumulative,
+        }
+        for (filename, lineno, name), (_, calls, total, cumulative, _) in rows
+    ]
+
+
+__all__ = [
+    "NodeTimer",
+    "ProfilingConfig",
+    "QueryProfile",
+    "QueryProfiler",
+    "active_profile",
+    "profile_phase",
+]
@@ -0,0 +1,94 @@
+"""Provider prompt-prefix cache friendliness.
+
+OpenAI caches the longest previously seen prompt prefix (from 1024 tokens
+on) and serializes tool definitions ahead of the messages. The prefix only
+repeats if the bound tools come in the same order and the system prompt does
+not change, so ``PromptCacheConfig`` binds tools in a canonical order, with an
+optional pinned set first, and ``PromptCacheStats`` records the cached-token
+counts the provider reports so hit rates and latency can be compared.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+#: System prompt of the FMP data agent; kept constant so it stays cacheable
+SYSTEM_PROMPT = (
+    "You are working as an expert financial analyst, helping an "
+    "AI assistant with financial related data gathering "
+    "and analysis. "
+    "Provide concise, accurate answers using the available tools. "
+    "Focus on delivering precise information without asking "
+    "follow-up questions."
+)
+
+
+class PromptCacheConfig(BaseModel):
+    """How bound tools are arranged to keep the prompt prefix stable."""
+
+    canonical_tool_order: bool = Field(
+        default=True, description="Bind retrieved tools sorted by name instead of by score"
+    )
+    pinned_tools: List[str] = Field(
+        default_factory=list,
+        description="Tools always bound first, in this order, so every request shares them",
+    )
+
+
+class PromptCacheStats:
+    """
+    Thread-safe running totals of provider-reported prompt cache usage.
+
+    Attributes:
+        calls: Number of recorded model calls
+        input_tokens: Total prompt tokens
+        cached_tokens: Prompt tokens served from the provider's cache
+        seconds: Total model call latency
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty totals."""
+        self.calls = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, message: Any, seconds: float = 0.0) -> None:
+        """
+        Add the usage reported on a model response.
+
+        Args:
+            message: AI message returned by the model
+            seconds: Latency of the model call
+        """
+        usage: Optional[Dict[str, Any]] = getattr(message, "usage_metadata", None)
+        usage = usage or {}
+        details = usage.get("input_token_details") or {}
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += int(usage.get("input_tokens") or 0)
+            self.cached_tokens += int(details.get("cache_read") or 0)
+            self.seconds += seconds
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of prompt tokens served from the cache."""
+        with self._lock:
+            return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current totals as a dictionary."""
+        with self._lock:
+            calls = self.calls
+            return {
+                "calls": calls,
+                "input_tokens": self.input_tokens,
+                "cached_tokens": self.cached_tokens,
+                "hit_rate": self.cached_tokens / self.input_tokens if self.input_tokens else 0.0,
+                "mean_seconds": self.seconds / calls if calls else 0.0,
+            }
+
+
+__all__ = ["SYSTEM_PROMPT", "PromptCacheConfig", "PromptCacheStats"]
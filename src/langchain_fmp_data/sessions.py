@@ -0,0 +1,158 @@
+"""Conversation sessions sharing one checkpointer.
+
+One ``FMPDataTool`` instance serves many conversations at once. Each call
+names its conversation by LangGraph thread id; ``SessionManager`` owns the
+checkpointer holding every conversation, serializes calls on the same thread
+while letting different threads run in parallel, and deletes conversations
+that have been idle too long or exceed the session limit. Callbacks registered
+with ``on_delete`` free other per-conversation state, such as stored
+artifacts, along with the conversation.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 1800.0
+DEFAULT_MAX_SESSIONS = 1000
+
+
+class SessionManager:
+    """
+    Thread-safe registry of conversations stored in a shared checkpointer.
+
+    Attributes:
+        checkpointer: Checkpointer holding the conversations
+        idle_timeout: Seconds after its last call before a conversation is deleted
+        max_sessions: Maximum number of conversations kept; the least recently
+            used idle ones are deleted first
+    """
+
+    def __init__(
+        self,
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+    ) -> None:
+        """
+        Initialize the session manager.
+
+        Args:
+            checkpointer: Checkpointer holding the conversations (defaults to
+                an in-memory one); it must support ``delete_thread``
+            idle_timeout: Seconds after its last call before a conversation
+                is deleted
+            max_sessions: Maximum number of conversations kept
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if idle_timeout <= 0 or max_sessions < 1:
+            raise ValueError("idle_timeout and max_sessions must be positive")
+
+        self.checkpointer = checkpointer if checkpointer is not None else MemorySaver()
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._last_used: OrderedDict[str, float] = OrderedDict()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._active: Dict[str, int] = {}
+        self._on_delete: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._locks)
+
+    def __contains__(self, thread_id: object) -> bool:
+        with self._lock:
+            return thread_id in self._locks
+
+    def on_delete(self, callback: Callable[[str], None]) -> None:
+        """
+        Register a callback run with the thread id of each deleted conversation.
+
+        Args:
+            callback: Quick callback freeing the conversation's state; it
+                must not call back into the session manager
+        """
+        with self._lock:
+            if callback not in self._on_delete:
+                self._on_delete.append(callback)
+
+    @contextmanager
+    def session(self, thread_id: str, keep: bool = True) -> Iterator[None]:
+        """
+        Hold a conversation for the duration of one call.
+
+        Calls on the same thread wait for each other; calls on different
+        threads do not.
+
+        Args:
+            thread_id: LangGraph thread id of the conversation
+            keep: Keep the conversation after the call (False deletes it,
+                for one-off queries)
+
+        Yields:
+            None, while the conversation is held
+        """
+        with self._lock:
+            lock = self._locks.setdefault(thread_id, threading.Lock())
+            self._active[thread_id] = self._active.get(thread_id, 0) + 1
+            self._last_used.pop(thread_id, None)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                self._active[thread_id] -= 1
+                if not self._active[thread_id]:
+                    del self._active[thread_id]
+                    if keep:
+                        self._last_used[thread_id] = time.monotonic()
+                    else:
+                        self._delete(thread_id)
+            self.evict()
+
+    def _delete(self, thread_id: str) -> None:
+        """Delete an inactive conversation (caller holds the lock)."""
+        self._locks.pop(thread_id, None)
+        self._last_used.pop(thread_id, None)
+        self.checkpointer.delete_thread(thread_id)
+        for callback in self._on_delete:
+            try:
+                callback(thread_id)
+            except Exception as e:
+                logger.warning(f"Failed to free session {thread_id}: {str(e)}")
+
+    def evict(self) -> List[str]:
+        """
+        Delete idle conversations and those over the session limit.
+
+        Conversations with a call in progress are never deleted.
+
+        Returns:
+            Thread ids of the deleted conversations
+        """
+        evicted: List[str] = []
+        with self._lock:
+            cutoff = time.monotonic() - self.idle_timeout
+            # _last_used only holds inactive threads, least recently used first
+            for thread_id, last_used in list(self._last_used.items()):
+                if last_used > cutoff and len(self._locks) <= self.max_sessions:
+                    break
+                self._delete(thread_id)
+                evicted.append(thread_id)
+        if evicted:
+            logger.debug(f"Evicted {len(evicted)} idle sessions")
+        return evicted
+
+
+__all__ = ["SessionManager"]
@@ -0,0 +1,79 @@
+"""Ticker symbol extraction from natural language queries."""
+
+import re
+from typing import List
+
+# Upper-case words that look like tickers but are common in financial questions
+_NON_TICKERS = frozenset(
+    {
+        "A",
+        "AI",
+        "AND",
+        "API",
+        "CEO",
+        "CFO",
+        "CPI",
+        "EBIT",
+        "EBITDA",
+        "EPS",
+        "ETF",
+        "EU",
+        "FCF",
+        "FMP",
+        "FOR",
+        "FX",
+        "GDP",
+        "I",
+        "IPO",
+        "OF",
+        "OR",
+        "PE",
+        "Q1",
+        "Q2",
+        "Q3",
+        "Q4",
+        "ROA",
+        "ROE",
+        "SEC",
+        "THE",
+        "TTM",
+        "UK",
+        "US",
+        "USA",
+        "USD",
+        "VS",
+        "YOY",
+        "YTD",
+    }
+)
+
+# $AAPL, AAPL, BRK.B, BRK-B, BTCUSD
+_TICKER_PATTERN = re.compile(r"(?<![\w$])\$?([A-Z][A-Z0-9]{0,5}(?:[.-][A-Z]{1,3})?)(?![\w])")
+
+
+def extract_tickers(text: str) -> List[str]:
+    """
+    Extract ticker symbols from a query.
+
+    Symbols are recognized as upper-case tokens (optionally prefixed with ``$``)
+    that are not common financial abbreviations. Order of first appearance is
+    preserved and duplicates are removed.
+
+    Args:
+        text: Natural language query
+
+    Returns:
+        List of ticker symbols
+    """
+    tickers: List[str] = []
+    for match in _TICKER_PATTERN.finditer(text):
+        symbol = match.group(1)
+        explicit = match.group(0).startswith("$")
+        if not explicit and symbol in _NON_TICKERS:
+            continue
+        if symbol not in tickers:
+            tickers.append(symbol)
+    return tickers
+
+
+__all__ = ["extract_tickers"]
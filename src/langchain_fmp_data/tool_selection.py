@@ -0,0 +1,63 @@
+"""Adaptive toolset sizing from retrieval scores.
+
+Binding a fixed number of tools wastes prompt tokens when a query clearly
+matches one endpoint. ``AdaptiveToolSelection`` keeps adding retrieved tools,
+best first, only while their similarity score stays above an absolute floor
+and within a relative gap of the top hit, between a minimum and maximum count.
+"""
+
+from typing import List, Sequence
+
+from fmp_data.lc.vector_store import SearchResult
+from pydantic import BaseModel, Field, model_validator
+
+
+class AdaptiveToolSelection(BaseModel):
+    """Score-based bounds on the number of tools bound per step.
+
+    Scores are the vector store's similarity scores (``1 / (1 + L2)``), so
+    they are comparable across queries for one embedding model.
+    """
+
+    min_tools: int = Field(default=2, ge=1, description="Tools always kept, best first")
+    max_tools: int = Field(default=10, ge=1, description="Tools kept at most")
+    min_score: float = Field(
+        default=0.3, ge=0, le=1, description="Tools scoring below this are dropped"
+    )
+    max_relative_gap: float = Field(
+        default=0.1,
+        ge=0,
+        le=1,
+        description="Tools scoring more than this fraction below the top hit are dropped",
+    )
+
+    @model_validator(mode="after")
+    def _check_bounds(self) -> "AdaptiveToolSelection":
+        if self.min_tools > self.max_tools:
+            raise ValueError("min_tools must not exceed max_tools")
+        return self
+
+    def select(self, results: Sequence[SearchResult]) -> List[SearchResult]:
+        """
+        Choose which retrieved tools to bind.
+
+        Args:
+            results: Search results, in any order
+
+        Returns:
+            Selected results, best first
+        """
+        ranked = sorted(results, key=lambda r: r.score, reverse=True)[: self.max_tools]
+        if not ranked:
+            return []
+
+        cutoff = max(self.min_score, ranked[0].score * (1 - self.max_relative_gap))
+        selected = ranked[: self.min_tools]
+        for result in ranked[self.min_tools :]:
+            if result.score < cutoff:
+                break
+            selected.append(result)
+        return selected
+
+
+__all__ = ["AdaptiveToolSelection"]
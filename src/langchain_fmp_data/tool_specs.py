@@ -0,0 +1,204 @@
+"""Precomputed OpenAI function specs for the endpoint tool catalog.
+
+Binding tools to a chat model converts each tool's pydantic argument schema
+into OpenAI function JSON. The endpoint catalog is static for a given fmp_data
+version, so the conversion is done once at build time and the resulting specs
+are looked up by tool name when binding.
+
+Build a catalog with ``langchain-fmp-data build-specs``.
+"""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from fmp_data.exceptions import ConfigError
+from fmp_data.lc.vector_store import EndpointVectorStore, SearchResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, Field
+
+from langchain_fmp_data.endpoint_index import fmp_data_version
+
+logger = logging.getLogger(__name__)
+
+SPECS_FILE = "tool_specs.json"
+
+#: Location of the catalog shipped inside the package, when one was built
+DEFAULT_SPECS_PATH = Path(__file__).parent / "data" / SPECS_FILE
+
+
+class ToolSpecCatalog(BaseModel):
+    """OpenAI tool specs for every endpoint tool, keyed by tool name."""
+
+    fmp_data_version: str = Field(..., description="fmp_data version the specs were built from")
+    specs: Dict[str, Dict[str, Any]] = Field(..., description="OpenAI tool spec per tool name")
+    created_at: datetime = Field(default_factory=datetime.now)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.specs
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def is_current(self) -> bool:
+        """Check whether the catalog was built for the installed fmp_data."""
+        return self.fmp_data_version == fmp_data_version()
+
+
+def tool_spec(tool: Any) -> Dict[str, Any]:
+    """Convert a tool into the OpenAI tool spec passed to ``bind_tools``."""
+    return dict(convert_to_openai_tool(tool))
+
+
+def build_tool_spec_catalog(vector_store: EndpointVectorStore) -> ToolSpecCatalog:
+    """
+    Convert every non-deprecated endpoint tool into an OpenAI tool spec.
+
+    Args:
+        vector_store: Vector store whose registry and client back the tools
+
+    Returns:
+        Catalog of tool specs
+    """
+    specs: Dict[str, Dict[str, Any]] = {}
+    for info in vector_store.registry.list_endpoints().values():
+        if info.semantics.deprecated:
+            continue
+        specs[info.semantics.method_name] = tool_spec(vector_store.create_tool(info))
+
+    return ToolSpecCatalog(fmp_data_version=fmp_data_version(), specs=dict(sorted(specs.items())))
+
+
+def write_tool_spec_catalog(catalog: ToolSpecCatalog, path: Union[str, Path]) -> None:
+    """
+    Write a tool spec catalog to a JSON file.
+
+    Args:
+        catalog: Catalog to write
+        path: Output file
+    """
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(catalog.model_dump_json())
+    logger.info(f"Wrote {len(catalog)} tool specs to {output_path}")
+
+
+def load_tool_spec_catalog(path: Union[str, Path] = DEFAULT_SPECS_PATH) -> ToolSpecCatalog:
+    """
+    Load a tool spec catalog and check it matches the installed fmp_data.
+
+    Specs describe the arguments the model may send, so a catalog built for
+    another fmp_data version is refused rather than used with a warning.
+
+    Args:
+        path: Catalog file (defaults to the packaged catalog)
+
+    Returns:
+        Loaded catalog
+
+    Raises:
+        ConfigError: If the catalog cannot be read or was built for another
+            fmp_data version
+    """
+    try:
+        catalog = ToolSpecCatalog.model_validate_json(Path(path).read_text())
+    except OSError as e:
+        raise ConfigError(f"Failed to read tool spec catalog: {str(e)}") from e
+    except ValueError as e:
+        raise ConfigError(f"Invalid tool spec catalog: {str(e)}") from e
+
+    if not catalog.is_current():
+        raise ConfigError(
+            f"Tool spec catalog was built for fmp_data {catalog.fmp_data_version}, "
+            f"installed version is {fmp_data_version()}. "
+            f"Rebuild it with `langchain-fmp-data build-specs`."
+        )
+    return catalog
+
+
+def find_tool_spec_catalog(path: Optional[Union[str, Path]] = None) -> Optional[ToolSpecCatalog]:
+    """
+    Load a tool spec catalog if one is usable, falling back to None.
+
+    Args:
+        path: Catalog file; the packaged catalog is used when not given
+
+    Returns:
+        Loaded catalog, or None if there is none or it is stale
+    """
+    catalog_path = Path(path) if path is not None else DEFAULT_SPECS_PATH
+    if path is None and not catalog_path.is_file():
+        return None
+    try:
+        return load_tool_spec_catalog(catalog_path)
+    except ConfigError as e:
+        logger.warning(f"{str(e)} Converting tool schemas at runtime instead.")
+        return None
+
+
+def specs_for_results(
+    vector_store: EndpointVectorStore,
+    results: Sequence[SearchResult],
+    catalog: Optional[ToolSpecCatalog] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Return the OpenAI tool specs of search results, in order.
+
+    Specs are looked up in the catalog; tools missing from it (or all tools,
+    without a catalog) are converted on the fly.
+
+    Args:
+        vector_store: Vector store whose registry and client back the tools
+        results: Search results to bind
+        catalog: Optional precomputed tool specs
+
+    Returns:
+        OpenAI tool specs ready for ``bind_tools``
+    """
+    specs: List[Dict[str, Any]] = []
+    for result in results:
+        name = result.info.semantics.method_name
+        if catalog is not None and name in catalog:
+            specs.append(catalog.specs[name])
+        else:
+            if catalog is not None:
+                logger.debug(f"Tool {name} missing from spec catalog, converting")
+            specs.append(tool_spec(vector_store.create_tool(result.info)))
+    return specs
+
+
+def retrieve_tool_specs(
+    vector_store: EndpointVectorStore,
+    catalog: ToolSpecCatalog,
+    query: str,
+    k: int,
+    threshold: float = 0.3,
+) -> List[Dict[str, Any]]:
+    """
+    Retrieve the specs of the tools most relevant to a query.
+
+    Args:
+        vector_store: Vector store for tool retrieval
+        catalog: Precomputed tool specs
+        query: Retrieval query
+        k: Maximum number of tools
+        threshold: Minimum similarity score (same default as ``get_tools``)
+
+    Returns:
+        OpenAI tool specs ready for ``bind_tools``
+    """
+    results = vector_store.search(query, k=k, threshold=threshold)
+    return specs_for_results(vector_store, results, catalog)
+
+
+__all__ = [
+    "DEFAULT_SPECS_PATH",
+    "ToolSpecCatalog",
+    "build_tool_spec_catalog",
+    "find_tool_spec_catalog",
+    "load_tool_spec_catalog",
+    "retrieve_tool_specs",
+    "specs_for_results",
+    "write_tool_spec_catalog",
+]
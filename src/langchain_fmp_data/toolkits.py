@@ -1,10 +1,14 @@
 """FMPData toolkit for accessing financial market data."""
 
 import os
-from typing import Any, List, Optional
+import time
+from typing import Any, Dict, List, Optional
 
 from langchain_core.tools import BaseTool, BaseToolkit
-from pydantic import PrivateAttr
+from pydantic import ConfigDict, PrivateAttr
+
+from langchain_fmp_data.http_pool import SharedHTTPPool, attach_http_pool
+from langchain_fmp_data.warmup import WarmupReport, warm_connections
 
 
 class FMPDataToolkit(BaseToolkit):
@@ -92,22 +96,41 @@ class FMPDataToolkit(BaseToolkit):
 
     Notes:
         - The toolkit uses vector similarity search to find relevant financial data
+        - All endpoint tools share one pooled HTTP client per process; pass
+            ``http_pool`` to use a pool with custom limits
+        - A prebuilt endpoint index (``endpoint_index_dir``, or the packaged
+            one when present) is loaded memory-mapped instead of creating the
+            vector store at runtime
         - Number of results can be adjusted via num_results parameter
         - API keys can be provided either
             as environment variables or constructor arguments
         - The query parameter accepts natural language input to find relevant tools
+        - ``warmup()`` opens FMP connections ahead of the first query, and
+            reports how long each startup step took
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     _vector_store: Any = PrivateAttr()
     _tools: List[BaseTool] = PrivateAttr()
+    _startup_phases: Dict[str, float] = PrivateAttr(default_factory=dict)
     fmp_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
     query: Optional[str]
     num_results: int = 3
+    http_pool: Optional[SharedHTTPPool] = None
+    endpoint_index_dir: Optional[str] = None
+    warmup_report: Optional[WarmupReport] = None
 
     def __init__(self, query: str, **data: Any) -> None:
         try:
             from fmp_data.lc import create_vector_store
+
+            from langchain_fmp_data.endpoint_index import (
+                DEFAULT_INDEX_DIR,
+                index_exists,
+                load_vector_store,
+            )
         except ImportError:
             raise ImportError(
                 "Could not import fmp_data python package. "
@@ -122,10 +145,25 @@ class FMPDataToolkit(BaseToolkit):
         self._validate_and_set_api_keys()
 
         # Initialize vector store and tools
-        self._vector_store = create_vector_store(
-            fmp_api_key=self.fmp_api_key, openai_api_key=self.openai_api_key
-        )
+        start = time.perf_counter()
+        index_dir = self.endpoint_index_dir
+        if index_dir is None and index_exists(DEFAULT_INDEX_DIR):
+            index_dir = str(DEFAULT_INDEX_DIR)
+        if index_dir is not None:
+            self._vector_store = load_vector_store(
+                fmp_api_key=str(self.fmp_api_key),
+                openai_api_key=str(self.openai_api_key),
+                index_dir=index_dir,
+            )
+        else:
+            self._vector_store = create_vector_store(
+                fmp_api_key=self.fmp_api_key, openai_api_key=self.openai_api_key
+            )
+        attach_http_pool(self._vector_store, self.http_pool)
+        self._startup_phases["vector_store"] = time.perf_counter() - start
+        start = time.perf_counter()
         self._tools = self._vector_store.get_tools(query=self.query, k=self.num_results)
+        self._startup_phases["tools"] = time.perf_counter() - start
 
     def _validate_and_set_api_keys(self) -> None:
         """Validate and set API keys from arguments or environment variables."""
@@ -152,3 +190,24 @@ class FMPDataToolkit(BaseToolkit):
             List[BaseTool]: A list of tools for interacting with financial data.
         """
         return self._tools
+
+    def warmup(self, connections: int = 1) -> WarmupReport:
+        """Open connections to FMP ahead of the first request.
+
+        The vector store is loaded and the tools retrieved by the constructor;
+        their times are reported as the first phases. The toolkit hands its
+        tools to the caller's agent, which converts them and embeds its own
+        queries, so opening connections is the only cost left to pay here. A
+        failed phase is recorded in the report rather than raised.
+
+        Args:
+            connections: Number of HTTP connections to FMP to open
+
+        Returns:
+            WarmupReport: Seconds spent in each phase, with any errors.
+        """
+        report = WarmupReport(phases=dict(self._startup_phases))
+        with report.phase("connections"):
+            report.connections = warm_connections(self._vector_store, connections)
+        self.warmup_report = report
+        return report
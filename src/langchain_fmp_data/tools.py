@@ -3,21 +3,52 @@
 import json
 import logging
 import os
+import threading
+import time
 import uuid
 from enum import Enum
-from typing import Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, cast
 
 from fmp_data.exceptions import AuthenticationError, ConfigError
 from fmp_data.lc import EndpointVectorStore, create_vector_store
 from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool
 from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.errors import GraphRecursionError
-from pydantic import BaseModel, Field, SecretStr
-
-from langchain_fmp_data.agent import create_fmp_data_workflow
+from pydantic import BaseModel, Field, PrivateAttr, SecretStr
+
+from langchain_fmp_data.agent import (
+    RetrievalPolicy,
+    ToolCallBudgetExceededError,
+    create_fmp_data_workflow,
+    endpoint_tool_factories,
+)
+from langchain_fmp_data.analytics import create_analytics_tools
+from langchain_fmp_data.answer_cache import SemanticAnswerCache, install_query_embedding_cache
+from langchain_fmp_data.artifacts import ArtifactStore, tool_results
+from langchain_fmp_data.coalesce import ToolCallCoalescer
+from langchain_fmp_data.endpoint_health import EndpointHealth
+from langchain_fmp_data.endpoint_index import DEFAULT_INDEX_DIR, index_exists, load_vector_store
+from langchain_fmp_data.fanout import EntityFanOut, SubQuery
+from langchain_fmp_data.fast_path import FastPathAnswer, FastPathMatcher
+from langchain_fmp_data.http_pool import SharedHTTPPool, attach_http_pool
+from langchain_fmp_data.model_tiers import ModelRouter
+from langchain_fmp_data.prefetch import SpeculativePrefetcher
+from langchain_fmp_data.price_store import PriceStore
+from langchain_fmp_data.profiling import QueryProfiler, active_profile, profile_phase
+from langchain_fmp_data.prompt_cache import SYSTEM_PROMPT, PromptCacheConfig, PromptCacheStats
+from langchain_fmp_data.sessions import SessionManager
+from langchain_fmp_data.tool_selection import AdaptiveToolSelection
+from langchain_fmp_data.tool_specs import ToolSpecCatalog, find_tool_spec_catalog
+from langchain_fmp_data.warmup import WarmupReport, pre_embed_queries, warm_connections
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +77,10 @@ class FMPDataToolInput(BaseModel):
         default=ResponseFormat.NATURAL_LANGUAGE,
         description=("Format of the response (natural language, data structure, or both)"),
     )
+    thread_id: Optional[str] = Field(
+        default=None,
+        description="Conversation to continue; omit for a standalone query",
+    )
 
 
 class FMPDataTool(BaseTool):
@@ -57,6 +92,11 @@ class FMPDataTool(BaseTool):
     - Financial statements
     - Company information
     - Economic indicators
+
+    One instance can be shared across threads. Each call names its
+    conversation with a thread id, passed in the input or as
+    ``configurable.thread_id`` in the run config; calls without one are
+    standalone queries.
     """
 
     name: str = "FMP Data"
@@ -69,27 +109,130 @@ class FMPDataTool(BaseTool):
     fmp_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
     max_iterations: int = 30
+    max_tool_calls: Optional[int] = None
+    retrieval_policy: RetrievalPolicy = RetrievalPolicy.ONCE_PER_USER_TURN
+    prefetcher: Optional[SpeculativePrefetcher] = None
+    tool_specs: Optional[ToolSpecCatalog] = None
+    tool_selection: Optional[AdaptiveToolSelection] = None
+    prompt_cache: Optional[PromptCacheConfig] = None
+    prompt_cache_stats: PromptCacheStats = Field(default_factory=PromptCacheStats)
+    answer_cache: Optional[SemanticAnswerCache] = None
+    coalescer: Optional[ToolCallCoalescer] = None
+    price_store: Optional[PriceStore] = None
+    local_tools: List[BaseTool] = Field(default_factory=list)
+    artifact_store: Optional[ArtifactStore] = None
+    fast_path: Optional[FastPathMatcher] = None
+    sessions: SessionManager = Field(default_factory=SessionManager)
+    model_router: Optional[ModelRouter] = None
+    fan_out: Optional[EntityFanOut] = None
+    endpoint_health: Optional[EndpointHealth] = None
+    profiler: Optional[QueryProfiler] = None
+    raise_errors: bool = False
+    warmup_report: Optional[WarmupReport] = None
 
     llm: Optional[ChatOpenAI] = None
     vector_store: Optional[EndpointVectorStore] = None
     thread_id: Optional[str] = None
 
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _agents: Dict[bool, Any] = PrivateAttr(default_factory=dict)
+    _tool_factories: Optional[Dict[str, Callable[[], BaseTool]]] = PrivateAttr(default=None)
+    _startup_phases: Dict[str, float] = PrivateAttr(default_factory=dict)
+
     def __init__(
         self,
         fmp_api_key: Optional[str] = None,
         openai_api_key: Optional[str] = None,
         max_iterations: int = 30,
         temperature: float = 0,
+        max_tool_calls: Optional[int] = None,
+        retrieval_policy: RetrievalPolicy = RetrievalPolicy.ONCE_PER_USER_TURN,
+        enable_prefetch: bool = False,
+        http_pool: Optional[SharedHTTPPool] = None,
+        endpoint_index_dir: Optional[str] = None,
+        tool_specs_path: Optional[str] = None,
+        tool_selection: Optional[AdaptiveToolSelection] = None,
+        prompt_cache: Optional[PromptCacheConfig] = None,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        coalesce_tool_calls: bool = True,
+        price_store: Optional[PriceStore] = None,
+        analytics_tools: bool = False,
+        offload_large_results: bool = False,
+        artifact_store: Optional[ArtifactStore] = None,
+        fast_path: Optional[FastPathMatcher] = None,
+        sessions: Optional[SessionManager] = None,
+        model_router: Optional[ModelRouter] = None,
+        fan_out: Optional[EntityFanOut] = None,
+        endpoint_health: Optional[EndpointHealth] = None,
+        profiler: Optional[QueryProfiler] = None,
+        raise_errors: bool = False,
     ) -> None:
         """Initialize FMP Data tool.
 
         Args:
             fmp_api_key: FMP API key (defaults to FMP_API_KEY env var)
             openai_api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
-            max_iterations: Maximum number of agent iterations
+            max_iterations: Maximum number of agent iterations, enforced as the
+                LangGraph recursion limit (each model or tool step counts once)
             temperature: Temperature for ChatOpenAI
-            cache_dir: Directory for vector store cache
-            store_name: Name for the vector store
+            max_tool_calls: Maximum number of FMP tool calls per query
+                (defaults to no limit)
+            retrieval_policy: When the agent retrieves a fresh toolset
+                (defaults to once per user turn)
+            enable_prefetch: Start likely FMP calls in the background while the
+                model is generating its first response
+            http_pool: Connection pool for FMP requests (defaults to the
+                process-wide shared pool)
+            endpoint_index_dir: Prebuilt endpoint index to load memory-mapped
+                (defaults to the packaged index when one was built, otherwise
+                the vector store is created at runtime)
+            tool_specs_path: Precomputed OpenAI tool spec catalog (defaults to
+                the packaged catalog when one was built; a catalog built for
+                another fmp_data version is ignored)
+            tool_selection: Score-based toolset sizing (defaults to binding a
+                fixed number of tools)
+            prompt_cache: Arrange bound tools so the provider's prompt prefix
+                cache hits across steps and users; cached-token counts are
+                recorded in ``prompt_cache_stats`` either way
+            answer_cache: Semantic cache answering paraphrased queries for the
+                same tickers and periods without running the agent (defaults
+                to no cache)
+            coalesce_tool_calls: Answer per-symbol quote and market cap calls
+                of one step with a single FMP batch request
+            price_store: Local store serving historical price calls, fetching
+                only the date ranges it does not hold yet (defaults to none)
+            analytics_tools: Bind local tools computing CAGR, rolling returns,
+                ratios and z-scores over fetched data, so the model does not
+                do arithmetic over raw JSON (off by default, since their specs
+                are sent at every step)
+            offload_large_results: Keep large tool results out of the messages
+                sent back to the model, which sees a preview instead (off by
+                default, since the model then sees only the first rows)
+            artifact_store: Store holding the large results, scoped per
+                conversation and freed when ``sessions`` deletes it (defaults
+                to an in-memory store when ``offload_large_results`` is set)
+            fast_path: Matcher answering templated queries ("price of AAPL")
+                with a direct endpoint call instead of the agent (defaults to
+                always running the agent)
+            sessions: Conversations kept between calls naming a thread id,
+                with their checkpointer and idle eviction (defaults to an
+                in-memory manager)
+            model_router: Router sending tool-calling steps to a faster model
+                and answers to the main model; per-tier timings are recorded
+                in its ``stats`` (defaults to the main model for every step)
+            fan_out: Split comparison queries over several tickers into
+                per-ticker sub-agents run concurrently, merged by one
+                synthesis call (defaults to a single agent per query)
+            endpoint_health: Per-endpoint circuit breaker, shared by all
+                conversations, returning a short error for a failing endpoint
+                instead of waiting on it, with optional hedged requests
+                (defaults to calling endpoints directly)
+            profiler: Sampled CPU and allocation profiling of queries, writing
+                reports with per-node timings for sampled and slow queries
+                (defaults to no profiling)
+            raise_errors: Raise errors of failed queries instead of returning
+                them as the answer, for callers such as the batch runner that
+                must tell failures apart from answers
 
         Raises:
             ValueError: If required API keys are missing
@@ -113,105 +256,433 @@ class FMPDataTool(BaseTool):
             )
 
         self.max_iterations = max_iterations
+        self.max_tool_calls = max_tool_calls
+        self.retrieval_policy = retrieval_policy
+        self.prefetcher = SpeculativePrefetcher() if enable_prefetch else None
+        self.tool_specs = find_tool_spec_catalog(tool_specs_path)
+        self.tool_selection = tool_selection
+        self.prompt_cache = prompt_cache
+        self.answer_cache = answer_cache
+        self.coalescer = ToolCallCoalescer() if coalesce_tool_calls else None
+        self.price_store = price_store
+        self.local_tools = create_analytics_tools() if analytics_tools else []
+        if artifact_store is None and offload_large_results:
+            artifact_store = ArtifactStore()
+        self.artifact_store = artifact_store
+        self.fast_path = fast_path
+        if sessions is not None:
+            self.sessions = sessions
+        if self.artifact_store is not None:
+            self.sessions.on_delete(self.artifact_store.release)
+        self.model_router = model_router
+        self.fan_out = fan_out
+        self.endpoint_health = endpoint_health
+        self.profiler = profiler
+        self.raise_errors = raise_errors
         self.llm = ChatOpenAI(
             temperature=temperature,
             api_key=SecretStr(self.openai_api_key) if self.openai_api_key else None,
         )
 
         # Initialize vector store
+        if endpoint_index_dir is None and index_exists(DEFAULT_INDEX_DIR):
+            endpoint_index_dir = str(DEFAULT_INDEX_DIR)
+
+        start = time.perf_counter()
         try:
-            self.vector_store = create_vector_store(
-                fmp_api_key=self.fmp_api_key,
-                openai_api_key=self.openai_api_key,
-            )
+            if endpoint_index_dir is not None:
+                self.vector_store = load_vector_store(
+                    fmp_api_key=self.fmp_api_key,
+                    openai_api_key=self.openai_api_key,
+                    index_dir=endpoint_index_dir,
+                )
+            else:
+                self.vector_store = create_vector_store(
+                    fmp_api_key=self.fmp_api_key,
+                    openai_api_key=self.openai_api_key,
+                )
             if not self.vector_store:
                 raise RuntimeError("Vector store initialization failed")
+            attach_http_pool(self.vector_store, http_pool)
+            if answer_cache is not None:
+                install_query_embedding_cache(self.vector_store)
         except (ConfigError, AuthenticationError) as e:
             raise ValueError(f"Failed to initialize vector store: {str(e)}")
         except Exception as e:
             raise RuntimeError(f"Unexpected error initializing vector store: {str(e)}")
+        self._startup_phases["vector_store"] = time.perf_counter() - start
+
+    def warmup(self, queries: Optional[Sequence[str]] = None, connections: int = 1) -> WarmupReport:
+        """
+        Pay the first query's one-time costs ahead of time.
+
+        Indexes the endpoint tools, compiles the agent graph for both
+        response modes, opens connections to FMP and optionally embeds
+        common queries into the retrieval cache. The vector store is loaded
+        by the constructor; its load time is reported as the first phase.
+        A failed phase is recorded in the report rather than raised. The
+        report is also kept in ``warmup_report`` for readiness probes.
+
+        Args:
+            queries: Common queries to pre-embed (defaults to none)
+            connections: Number of HTTP connections to FMP to open
+
+        Returns:
+            Seconds spent in each phase, with any errors
+        """
+        report = WarmupReport(phases=dict(self._startup_phases))
+        with report.phase("tools"):
+            self.get_tool_factories()
+        with report.phase("graph"):
+            self.get_agent()
+            self.get_agent(data_only=True)
+        with report.phase("connections"):
+            report.connections = warm_connections(self.vector_store, connections)
+        if queries:
+            with report.phase("embeddings"):
+                report.embedded_queries = pre_embed_queries(self.vector_store, queries)
+
+        logger.info(
+            f"Warmup finished in {report.total_seconds:.2f}s: "
+            + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in report.phases.items())
+        )
+        self.warmup_report = report
+        return report
+
+    def get_tool_factories(self) -> Dict[str, Callable[[], BaseTool]]:
+        """Return the endpoint tool factories used by the fast path, built once."""
+        with self._lock:
+            if self._tool_factories is None:
+                if self.vector_store is None:
+                    raise RuntimeError("Tool not properly initialized")
+                self._tool_factories = endpoint_tool_factories(self.vector_store, self.price_store)
+            return self._tool_factories
+
+    def get_agent(self, data_only: bool = False) -> Any:
+        """
+        Return the compiled agent graph, compiling it on first use.
+
+        The graph holds no per-conversation state, so one compiled graph per
+        response mode serves every call; conversations live in the session
+        manager's checkpointer.
+
+        Args:
+            data_only: Whether the graph ends after fetching data (used for
+                ``ResponseFormat.DATA_STRUCTURE``)
+
+        Returns:
+            Compiled LangGraph graph
+        """
+        with self._lock:
+            agent = self._agents.get(data_only)
+            if agent is not None:
+                return agent
+            if self.vector_store is None or self.llm is None:
+                raise RuntimeError("Tool not properly initialized")
+
+            workflow = create_fmp_data_workflow(
+                self.vector_store,
+                self.llm,
+                max_tool_calls=self.max_tool_calls,
+                retrieval_policy=self.retrieval_policy,
+                prefetcher=self.prefetcher,
+                tool_specs=self.tool_specs,
+                tool_selection=self.tool_selection,
+                prompt_cache=self.prompt_cache,
+                prompt_cache_stats=self.prompt_cache_stats,
+                coalescer=self.coalescer,
+                price_store=self.price_store,
+                local_tools=self.local_tools,
+                artifact_store=self.artifact_store,
+                stop_after_data=data_only,
+                model_router=self.model_router,
+                endpoint_health=self.endpoint_health,
+            )
+            agent = workflow.compile(checkpointer=self.sessions.checkpointer)
+            self._agents[data_only] = agent
+            return agent
 
     def _run(
         self,
         query: str,
         refresh_answer: bool = False,
         response_format: ResponseFormat = ResponseFormat.NATURAL_LANGUAGE,
+        thread_id: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
+        config: RunnableConfig = cast(RunnableConfig, {}),
     ) -> str | dict:
-        """Execute the tool with better error handling and response formatting."""
-        try:
-            thread_id = self.get_thread_id(refresh_answer)
-
-            # Ensure vector_store and llm are initialized
-            if self.vector_store is None or self.llm is None:
-                raise RuntimeError("Tool not properly initialized")
-
-            workflow = create_fmp_data_workflow(self.vector_store, self.llm)
-            agent = workflow.compile(checkpointer=MemorySaver())
-
-            messages = [
-                SystemMessage(
-                    content=(
-                        "You are working as an expert financial analyst, helping an "
-                        "AI assistant with financial related data gathering "
-                        "and analysis. "
-                        "Provide concise, accurate answers using the available tools. "
-                        "Focus on delivering precise information without asking "
-                        "follow-up questions."
-                    )
-                ),
-                HumanMessage(content=query),
-            ]
-
-            config = {
-                "configurable": {
-                    "recursion_limit": self.max_iterations,
-                    "thread_id": thread_id,
-                }
-            }
+        """
+        Answer a query, continuing a conversation when a thread id is given.
 
-            final_state = agent.invoke({"messages": messages}, config=config)  # type: ignore[arg-type]
-            response = final_state.get("messages", [])[-1].content
+        Args:
+            query: Natural language query
+            refresh_answer: Bypass the semantic answer cache
+            response_format: Format of the response
+            thread_id: Conversation to continue (defaults to
+                ``configurable.thread_id`` of the run config, then to a
+                standalone query)
+            run_manager: Callback manager of the tool run
+            config: Run config, injected by LangChain
+
+        Returns:
+            Answer in the requested format, or an error message
 
-            return self.format_response(response, response_format)
+        Raises:
+            Exception: Whatever failed the query, when ``raise_errors`` is set
+        """
+        thread_id = thread_id or (config.get("configurable") or {}).get("thread_id")
+        keep = thread_id is not None
+        thread_id = str(thread_id) if thread_id is not None else str(uuid.uuid4())
+        try:
+            with self.sessions.session(thread_id, keep=keep):
+                if self.profiler is None:
+                    return self._answer(query, thread_id, keep, refresh_answer, response_format)
+                with self.profiler.capture(query, thread_id):
+                    return self._answer(query, thread_id, keep, refresh_answer, response_format)
 
-        except GraphRecursionError:
-            error_msg = f"Analysis exceeded {self.max_iterations} iterations"
-            logger.error(error_msg)
-            return (
-                {"error": error_msg}
-                if response_format != ResponseFormat.NATURAL_LANGUAGE
-                else error_msg
-            )
         except Exception as e:
-            error_msg = f"Error processing query: {str(e)}"
-            logger.error(error_msg, exc_info=True)
+            if self.raise_errors:
+                raise
+            if isinstance(e, GraphRecursionError):
+                error_msg = f"Analysis exceeded {self.max_iterations} iterations"
+                logger.error(error_msg)
+            elif isinstance(e, ToolCallBudgetExceededError):
+                error_msg = f"Analysis exceeded {e.budget} tool calls"
+                logger.error(error_msg)
+            else:
+                error_msg = f"Error processing query: {str(e)}"
+                logger.error(error_msg, exc_info=True)
             return (
                 {"error": error_msg}
                 if response_format != ResponseFormat.NATURAL_LANGUAGE
                 else error_msg
             )
 
+    def _answer(
+        self,
+        query: str,
+        thread_id: str,
+        continued: bool,
+        refresh_answer: bool,
+        response_format: ResponseFormat,
+    ) -> str | dict:
+        """Answer a query within a held session."""
+        # Ensure vector_store and llm are initialized
+        if self.vector_store is None or self.llm is None:
+            raise RuntimeError("Tool not properly initialized")
+
+        data_only = response_format == ResponseFormat.DATA_STRUCTURE
+
+        # recursion_limit is a top-level config key; LangGraph ignores it
+        # when nested under "configurable".
+        config: Dict[str, Any] = {
+            "recursion_limit": self.max_iterations,
+            "configurable": {"thread_id": thread_id},
+        }
+        profile = active_profile()
+        if profile is not None:
+            config["callbacks"] = profile.callbacks
+        history: List[BaseMessage] = []
+        if continued:
+            history = self.get_agent(data_only).get_state(config).values.get("messages", [])
+
+        # Shortcuts answer the query on its own, so only a conversation's
+        # first query may take them
+        embedding: Optional[List[float]] = None
+        cache_key: Tuple[str, ...] = ()
+        if not history:
+            if self.fast_path is not None:
+                factories = self.get_tool_factories()
+                answer = self.fast_path.answer(
+                    query, lambda name: factories[name]() if name in factories else None
+                )
+                if answer is not None:
+                    return self.format_fast_path(answer, response_format)
+
+            # The query embedding is memoized on the vector store, so tool
+            # retrieval for this query reuses it after a cache miss.
+            # Cached answers are prose; structured formats return tool data.
+            # Queries naming no recognized ticker are not cached at all;
+            # the key also holds the years and periods the query asks for.
+            if self.answer_cache is not None:
+                cache_key = self.answer_cache.key(query)
+            if self.answer_cache is not None and cache_key:
+                embedding = self.vector_store.embeddings.embed_query(query)
+                if not refresh_answer and response_format == ResponseFormat.NATURAL_LANGUAGE:
+                    cached = self.answer_cache.get(embedding, cache_key)
+                    if cached is not None:
+                        logger.debug(f"Semantic answer cache hit for query: {query}")
+                        return self.format_response(cached, response_format)
+
+            if self.fan_out is not None:
+                sub_queries = self.fan_out.decompose(query)
+                if sub_queries:
+                    return self._answer_fanned_out(
+                        query,
+                        sub_queries,
+                        thread_id,
+                        continued,
+                        embedding,
+                        cache_key,
+                        response_format,
+                    )
+
+        # The system prompt is constant and comes first so it stays part of
+        # the provider's cached prompt prefix; the query goes last.
+        messages: List[BaseMessage] = [HumanMessage(content=query)]
+        if not history:
+            messages.insert(0, SystemMessage(content=SYSTEM_PROMPT))
+
+        final_state = self.get_agent(data_only).invoke({"messages": messages}, config=config)
+        final_messages = final_state.get("messages", [])
+        response = final_messages[-1].content
+
+        # A data-only run ends on tool results, which are not an answer
+        if (
+            embedding is not None
+            and self.answer_cache is not None
+            and not isinstance(final_messages[-1], ToolMessage)
+        ):
+            self.answer_cache.put(embedding, cache_key, response)
+
+        results = tool_results(final_messages, self.artifact_store)
+        if results and response_format != ResponseFormat.NATURAL_LANGUAGE:
+            return self.format_tool_data(response, results, response_format)
+        return self.format_response(response, response_format)
+
+    def _answer_fanned_out(
+        self,
+        query: str,
+        sub_queries: List[SubQuery],
+        thread_id: str,
+        continued: bool,
+        embedding: Optional[List[float]],
+        cache_key: Tuple[str, ...],
+        response_format: ResponseFormat,
+    ) -> str | dict:
+        """Answer a comparison query with concurrent per-ticker sub-agents."""
+        if self.fan_out is None or self.llm is None:
+            raise RuntimeError("Tool not properly initialized")
+        data_only = response_format == ResponseFormat.DATA_STRUCTURE
+        agent = self.get_agent(data_only)
+        # Sub-agents run on other threads, outside the active profile's context
+        profile = active_profile()
+
+        def answer(sub_query: SubQuery) -> Tuple[str, List[Dict[str, Any]]]:
+            # Each sub-agent runs in its own throwaway conversation
+            sub_thread = str(uuid.uuid4())
+            with self.sessions.session(sub_thread, keep=False):
+                final_state = agent.invoke(
+                    {
+                        "messages": [
+                            SystemMessage(content=SYSTEM_PROMPT),
+                            HumanMessage(content=sub_query.query),
+                        ]
+                    },
+                    config={
+                        "recursion_limit": self.max_iterations,
+                        "configurable": {"thread_id": sub_thread},
+                        "callbacks": profile.callbacks if profile is not None else None,
+                    },
+                )
+                # Deleting the throwaway conversation frees its artifacts
+                final_messages = final_state.get("messages", [])
+                results = tool_results(final_messages, self.artifact_store)
+            last = final_messages[-1]
+            text = "" if isinstance(last, ToolMessage) else str(last.content)
+            return text, results
+
+        sub_results = self.fan_out.run(sub_queries, answer)
+        if all(sub.error is not None for sub in sub_results):
+            raise RuntimeError(f"Every sub-query failed; first error: {sub_results[0].error}")
+        results = [result for sub in sub_results for result in sub.results]
+        if data_only:
+            errors = {sub.entity: sub.error for sub in sub_results if sub.error is not None}
+            return {"results": results, "errors": errors} if errors else {"results": results}
+
+        synthesis = self.llm.invoke(self.fan_out.synthesis_messages(query, sub_results))
+        response = str(synthesis.content)
+
+        if continued:
+            # Record the turn so follow-up questions see it
+            self.get_agent(data_only).update_state(
+                {"configurable": {"thread_id": thread_id}},
+                {
+                    "messages": [
+                        SystemMessage(content=SYSTEM_PROMPT),
+                        HumanMessage(content=query),
+                        AIMessage(content=response),
+                    ]
+                },
+                as_node="agent",
+            )
+        if embedding is not None and self.answer_cache is not None:
+            self.answer_cache.put(embedding, cache_key, response)
+
+        if results and response_format == ResponseFormat.BOTH:
+            return self.format_tool_data(response, results, response_format)
+        return self.format_response(response, response_format)
+
     def get_thread_id(self, refresh: bool = False) -> str:
-        """Get or create thread ID for conversation tracking."""
-        if refresh or not self.thread_id:
-            self.thread_id = str(uuid.uuid4())
-        return self.thread_id
+        """
+        Get or create this instance's default thread ID.
+
+        Pass it as ``thread_id`` to continue one conversation across calls.
+
+        Args:
+            refresh: Start a new default conversation
+
+        Returns:
+            Thread ID
+        """
+        with self._lock:
+            if refresh or not self.thread_id:
+                self.thread_id = str(uuid.uuid4())
+            return self.thread_id
+
+    @classmethod
+    def format_fast_path(
+        cls, answer: FastPathAnswer, response_format: ResponseFormat
+    ) -> str | dict:
+        """Format a fast path answer like an agent answer with its tool data."""
+        if response_format == ResponseFormat.NATURAL_LANGUAGE:
+            return answer.text
+        results = [
+            {
+                "tool": answer.tool,
+                "tool_call_id": None,
+                "args": answer.args,
+                "result": answer.result,
+            }
+        ]
+        return cls.format_tool_data(answer.text, results, response_format)
+
+    @staticmethod
+    def format_tool_data(
+        content: str, results: List[Dict[str, Any]], response_format: ResponseFormat
+    ) -> dict:
+        """Return the full tool results of a query, with the answer for BOTH."""
+        with profile_phase("format_tool_data"):
+            data = {"results": results}
+            if response_format == ResponseFormat.BOTH:
+                return {"natural_language": content, "data": data}
+            return data
 
     @staticmethod
     def format_response(content: str, response_format: ResponseFormat) -> str | dict:
         """Format response based on specified format."""
-        try:
-            if response_format == ResponseFormat.DATA_STRUCTURE:
-                # Attempt to parse response as JSON if it's structured data
-                return json.loads(content)
-            elif response_format == ResponseFormat.BOTH:
-                return {
-                    "natural_language": content,
-                    "data": json.loads(content) if "{" in content else None,
-                }
-            return content
-        except json.JSONDecodeError:
-            if response_format != ResponseFormat.NATURAL_LANGUAGE:
-                logger.warning("Failed to parse response as JSON, returning raw content")
-            return content
+        with profile_phase("format_response"):
+            try:
+                if response_format == ResponseFormat.DATA_STRUCTURE:
+                    # Attempt to parse response as JSON if it's structured data
+                    return json.loads(content)
+                elif response_format == ResponseFormat.BOTH:
+                    return {
+                        "natural_language": content,
+                        "data": json.loads(content) if "{" in content else None,
+                    }
+                return content
+            except json.JSONDecodeError:
+                if response_format != ResponseFormat.NATURAL_LANGUAGE:
+                    logger.warning("Failed to parse response as JSON, returning raw content")
+                return content
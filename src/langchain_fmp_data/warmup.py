@@ -0,0 +1,119 @@
+"""Warmup of a worker before it takes its first query.
+
+A fresh worker pays for loading the endpoint vector store, indexing the
+endpoint tools, compiling the agent graph, opening HTTP connections and
+loading the embedding tokenizer on its first query. ``FMPDataTool.warmup``
+pays these costs ahead of time, optionally embedding common queries into the
+retrieval cache, and ``FMPDataToolkit.warmup`` opens the connections. Both
+return a ``WarmupReport`` timing each phase so a readiness probe can wait for
+it.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Sequence
+
+import httpx
+from pydantic import BaseModel, Field
+
+from langchain_fmp_data.answer_cache import install_query_embedding_cache
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupReport(BaseModel):
+    """Outcome of a warmup, one entry per phase."""
+
+    phases: Dict[str, float] = Field(
+        default_factory=dict, description="Seconds spent in each phase, in order"
+    )
+    errors: Dict[str, str] = Field(default_factory=dict, description="Error of each failed phase")
+    connections: int = Field(default=0, description="HTTP connections opened to FMP")
+    embedded_queries: int = Field(default=0, description="Queries added to the embedding cache")
+
+    @property
+    def total_seconds(self) -> float:
+        """Total time of all phases."""
+        return sum(self.phases.values())
+
+    @property
+    def ok(self) -> bool:
+        """Whether every phase succeeded."""
+        return not self.errors
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time one phase, recording its error instead of raising it.
+
+        Args:
+            name: Phase name
+
+        Yields:
+            None, while the phase runs
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            logger.warning(f"Warmup phase {name} failed: {str(e)}")
+            self.errors[name] = str(e)
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+
+def warm_connections(vector_store: Any, connections: int = 1) -> int:
+    """
+    Open keep-alive connections to FMP through a vector store's client.
+
+    Each connection makes one HEAD request to the API host without an API
+    key, so nothing counts against the plan's quota; only the TCP and TLS
+    handshakes matter. With the shared HTTP pool attached, the connections
+    are reused by every endpoint tool.
+
+    Args:
+        vector_store: EndpointVectorStore whose fmp_data client to warm
+        connections: Number of connections to open concurrently
+
+    Returns:
+        Number of connections opened
+
+    Raises:
+        httpx.HTTPError: If the API host cannot be reached
+    """
+    fmp_client: Any = getattr(vector_store, "client", None)
+    http_client = getattr(fmp_client, "client", None)
+    if not isinstance(http_client, httpx.Client) or connections < 1:
+        return 0
+    url = str(fmp_client.config.base_url)
+
+    def head(_: int) -> None:
+        http_client.head(url, follow_redirects=False)
+
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="fmp-warmup") as pool:
+        list(pool.map(head, range(connections)))
+    return connections
+
+
+def pre_embed_queries(vector_store: Any, queries: Sequence[str]) -> int:
+    """
+    Embed expected queries into the vector store's query embedding cache.
+
+    Tool retrieval and the semantic answer cache then skip the embedding call
+    for these queries. The first embedding call also loads the tokenizer.
+
+    Args:
+        vector_store: EndpointVectorStore whose query embeddings to memoize
+        queries: Queries to embed, in one batched call
+
+    Returns:
+        Number of queries newly embedded
+    """
+    if not queries:
+        return 0
+    return install_query_embedding_cache(vector_store).prime(queries)
+
+
+__all__ = ["WarmupReport", "pre_embed_queries", "warm_connections"]
@@ -1,15 +1,21 @@
 """Unit tests for agent module"""
 
+from itertools import count
 from unittest.mock import MagicMock, patch
 
 import pytest
-from langchain_core.messages import ToolMessage
-from langchain_core.tools import BaseTool
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import BaseTool, tool
+from langgraph.errors import GraphRecursionError
 
 from langchain_fmp_data.agent import (
     BasicToolNode,
+    RetrievalPolicy,
+    ToolCallBudgetExceededError,
     ToolExecutionError,
     create_fmp_data_workflow,
+    endpoint_tool_factories,
+    select_retrieval_query,
     should_continue,
     validate_workflow_params,
 )
@@ -103,6 +109,203 @@ class TestBasicToolNode:
         with pytest.raises(ToolExecutionError, match="Failed to execute failing_tool"):
             node(state)
 
+    def test_tool_call_budget_exceeded(self):
+        """Test tool calls beyond the per-query budget are refused"""
+        tool = MagicMock(spec=BaseTool)
+        tool.name = "test_tool"
+        tool.invoke.return_value = {"result": "success"}
+
+        node = BasicToolNode([tool], max_tool_calls=2)
+
+        history = [
+            HumanMessage(content="first question"),
+            ToolMessage(content="{}", tool_call_id="a"),
+            ToolMessage(content="{}", tool_call_id="b"),
+            HumanMessage(content="second question"),
+            ToolMessage(content="{}", tool_call_id="c"),
+        ]
+        message = MagicMock()
+        message.tool_calls = [
+            {"name": "test_tool", "args": {}, "id": "d"},
+            {"name": "test_tool", "args": {}, "id": "e"},
+        ]
+
+        with pytest.raises(ToolCallBudgetExceededError, match="budget of 2"):
+            node({"messages": [*history, message]})
+        tool.invoke.assert_not_called()
+
+        # Calls made before the latest human message do not count
+        message.tool_calls = message.tool_calls[:1]
+        result = node({"messages": [*history, message]})
+        assert len(result["messages"]) == 1
+
+    def test_factory_tools_built_on_first_use(self):
+        """Test factory tools are only built when the model calls them"""
+        tool = MagicMock(spec=BaseTool)
+        tool.name = "lazy_tool"
+        tool.invoke.return_value = {"result": "success"}
+        factory = MagicMock(return_value=tool)
+        unused_factory = MagicMock()
+
+        node = BasicToolNode(
+            [], tool_factories={"lazy_tool": factory, "unused_tool": unused_factory}
+        )
+        assert node.has_tool("unused_tool")
+        factory.assert_not_called()
+
+        message = MagicMock()
+        message.tool_calls = [
+            {"name": "lazy_tool", "args": {}, "id": "1"},
+            {"name": "lazy_tool", "args": {}, "id": "2"},
+        ]
+        result = node({"messages": [message]})
+
+        assert len(result["messages"]) == 2
+        factory.assert_called_once_with()
+        unused_factory.assert_not_called()
+
+    def test_factory_tool_cache_is_bounded(self):
+        """Test least recently used factory tools are dropped from the cache"""
+        factories = {}
+        for name in ("a", "b", "c"):
+            factories[name] = MagicMock(side_effect=lambda: MagicMock(spec=BaseTool))
+
+        node = BasicToolNode([], tool_factories=factories, max_cached_tools=2)
+        first = node.get_tool("a")
+        node.get_tool("b")
+        assert node.get_tool("a") is first  # cache hit refreshes "a"
+        node.get_tool("c")  # evicts "b"
+        node.get_tool("b")
+
+        assert factories["a"].call_count == 1
+        assert factories["b"].call_count == 2
+        assert node.get_tool("missing") is None
+
+
+def _catalog_store(tools):
+    """Build a mock vector store whose registry catalogs the given tools."""
+    vector_store = MagicMock()
+    endpoints = {}
+    for catalog_tool in tools:
+        info = MagicMock()
+        info.semantics.method_name = catalog_tool.name
+        info.semantics.deprecated = False
+        info.tool = catalog_tool
+        endpoints[f"{catalog_tool.name}_endpoint"] = info
+    vector_store.registry.list_endpoints.return_value = endpoints
+    vector_store.registry.get_endpoint.side_effect = endpoints.get
+    vector_store.create_tool.side_effect = lambda info: info.tool
+    return vector_store
+
+
+def _looping_workflow(**kwargs):
+    """Build a workflow whose model requests a tool call on every turn."""
+
+    @tool
+    def echo() -> dict:
+        """Return a constant payload."""
+        return {"status": "success"}
+
+    call_ids = count()
+    bound_model = MagicMock()
+    bound_model.invoke.side_effect = lambda messages: AIMessage(
+        content="",
+        tool_calls=[{"name": "echo", "args": {}, "id": f"call_{next(call_ids)}"}],
+    )
+    model = MagicMock()
+    model.bind_tools.return_value = bound_model
+
+    vector_store = _catalog_store([echo])
+    vector_store.get_tools.return_value = [
+        {"name": "echo", "description": "Echo", "parameters": {}}
+    ]
+
+    workflow = create_fmp_data_workflow(vector_store, model, **kwargs)
+    return workflow.compile(), bound_model, vector_store
+
+
+def _retrieval_queries(vector_store):
+    """Return the queries the vector store was asked to retrieve tools for."""
+    return [c.args[0] for c in vector_store.get_tools.call_args_list if c.args]
+
+
+class TestIterationBounds:
+    """Test suite for bounding runaway agent loops"""
+
+    def test_recursion_limit_stops_loop(self):
+        """Test the agent loop stops at the configured recursion limit"""
+        agent, bound_model, _ = _looping_workflow()
+
+        with pytest.raises(GraphRecursionError):
+            agent.invoke(
+                {"messages": [HumanMessage(content="loop forever")]},
+                config={"recursion_limit": 6},
+            )
+
+        # agent -> tools three times, then the fourth model step is refused
+        assert bound_model.invoke.call_count == 3
+
+    def test_max_tool_calls_stops_loop(self):
+        """Test the agent loop stops once the tool call budget is spent"""
+        agent, bound_model, _ = _looping_workflow(max_tool_calls=2)
+
+        with pytest.raises(ToolCallBudgetExceededError):
+            agent.invoke(
+                {"messages": [HumanMessage(content="loop forever")]},
+                config={"recursion_limit": 100},
+            )
+
+        assert bound_model.invoke.call_count == 3
+
+    def test_invalid_max_tool_calls(self):
+        """Test workflow creation fails with invalid max_tool_calls"""
+        with pytest.raises(ValueError, match="max_tool_calls must be greater"):
+            create_fmp_data_workflow(MagicMock(), MagicMock(), max_tool_calls=0)
+
+
+class TestRetrievalPolicy:
+    """Test suite for tool retrieval across agent steps"""
+
+    def test_select_query_skips_tool_results(self):
+        """Test tool results are never used as the retrieval query"""
+        messages = [
+            HumanMessage(content="price of AAPL", id="h1"),
+            AIMessage(content="", tool_calls=[{"name": "echo", "args": {}, "id": "1"}]),
+            ToolMessage(content='{"data": [1, 2, 3]}', tool_call_id="1"),
+            HumanMessage(content="and MSFT?", id="h2"),
+            ToolMessage(content='{"data": [4, 5, 6]}', tool_call_id="2"),
+        ]
+
+        assert select_retrieval_query(messages, RetrievalPolicy.ONCE_PER_USER_TURN) == (
+            "h2",
+            "and MSFT?",
+        )
+        assert select_retrieval_query(messages, RetrievalPolicy.ORIGINAL_QUESTION) == (
+            "h1",
+            "price of AAPL",
+        )
+
+    def test_once_per_user_turn_reuses_toolset(self):
+        """Test the toolset is retrieved once per user turn"""
+        agent, bound_model, vector_store = _looping_workflow(max_tool_calls=3)
+
+        with pytest.raises(ToolCallBudgetExceededError):
+            agent.invoke({"messages": [HumanMessage(content="price of AAPL")]})
+
+        assert bound_model.invoke.call_count == 4
+        assert _retrieval_queries(vector_store) == ["price of AAPL"]
+
+    def test_latest_human_message_retrieves_every_step(self):
+        """Test the latest human message is re-retrieved at every step"""
+        agent, bound_model, vector_store = _looping_workflow(
+            max_tool_calls=3, retrieval_policy=RetrievalPolicy.LATEST_HUMAN_MESSAGE
+        )
+
+        with pytest.raises(ToolCallBudgetExceededError):
+            agent.invoke({"messages": [HumanMessage(content="price of AAPL")]})
+
+        assert _retrieval_queries(vector_store) == ["price of AAPL"] * 4
+
 
 class TestShouldContinue:
     """Test suite for should_continue function"""
@@ -164,7 +367,6 @@ class TestCreateFmpDataWorkflow:
     def test_workflow_creation(self, mock_tool_node, mock_state_graph):
         """Test workflow creation with valid parameters"""
         mock_vs = MagicMock()
-        mock_vs.get_tools.return_value = []
         mock_model = MagicMock()
         mock_workflow = MagicMock()
         mock_state_graph.return_value = mock_workflow
@@ -174,6 +376,28 @@ class TestCreateFmpDataWorkflow:
         # Test behavior: workflow object is returned
         assert workflow is not None
 
+    def test_workflow_does_not_build_tools(self):
+        """Test workflow creation indexes the catalog without building tools"""
+        vector_store = _catalog_store([MagicMock(), MagicMock()])
+
+        create_fmp_data_workflow(vector_store, MagicMock())
+
+        vector_store.get_tools.assert_not_called()
+        vector_store.create_tool.assert_not_called()
+
+    def test_endpoint_tool_factories_skip_deprecated(self):
+        """Test deprecated endpoints are left out of the tool index"""
+        current, deprecated = MagicMock(), MagicMock()
+        current.name, deprecated.name = "get_quote", "get_old_quote"
+        vector_store = _catalog_store([current, deprecated])
+        endpoints = vector_store.registry.list_endpoints.return_value
+        endpoints["get_old_quote_endpoint"].semantics.deprecated = True
+
+        factories = endpoint_tool_factories(vector_store)
+
+        assert list(factories) == ["get_quote"]
+        assert factories["get_quote"]() is current
+
     def test_workflow_invalid_max_toolset_size(self):
         """Test workflow creation fails with invalid max_toolset_size"""
         with pytest.raises(ValueError, match="max_toolset_size must be greater"):
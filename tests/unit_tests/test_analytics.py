@@ -0,0 +1,208 @@
+"""Unit tests for analytics module"""
+
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from langchain_fmp_data.agent import BasicToolNode, create_fmp_data_workflow
+from langchain_fmp_data.analytics import (
+    SessionData,
+    cagr,
+    create_analytics_tools,
+    rolling_returns,
+    zscores,
+)
+
+PRICES = {
+    "status": "success",
+    "data": {
+        "symbol": "AAPL",
+        "historical": [
+            {"date": "2024-01-05T00:00:00", "close": 110.0},
+            {"date": "2024-01-04T00:00:00", "close": 100.0},
+            {"date": "2024-01-03T00:00:00", "close": 105.0},
+            {"date": "2024-01-02T00:00:00", "close": 100.0},
+        ],
+    },
+}
+INCOME = {
+    "status": "success",
+    "data": [
+        {"date": "2023-09-30", "revenue": 383.0, "net_income": 97.0},
+        {"date": "2022-09-30", "revenue": 394.0, "net_income": 99.8},
+        {"date": "2021-09-30", "revenue": 365.0, "net_income": 94.7},
+    ],
+}
+
+
+def _result(call_id, result, name="get_historical_prices"):
+    return ToolMessage(content=json.dumps(result), tool_call_id=call_id, name=name)
+
+
+def _tools():
+    return {tool.name: tool for tool in create_analytics_tools()}
+
+
+class TestAnalyticsFunctions:
+    """Test suite for the vectorized analytics functions"""
+
+    def test_cagr(self):
+        """Test the compound growth rate and its input checks"""
+        assert cagr(100.0, 121.0, 2.0) == pytest.approx(0.1)
+        with pytest.raises(ValueError, match="positive"):
+            cagr(-1.0, 121.0, 2.0)
+
+    def test_rolling_returns(self):
+        """Test returns are computed over the window"""
+        returns = rolling_returns(np.array([100.0, 105.0, 100.0, 110.0]), 2)
+
+        np.testing.assert_allclose(returns, [0.0, 110.0 / 105.0 - 1.0])
+        with pytest.raises(ValueError, match="observations"):
+            rolling_returns(np.array([1.0, 2.0]), 2)
+
+    def test_zscores(self):
+        """Test whole-series and trailing-window z-scores"""
+        values = np.array([1.0, 2.0, 3.0, 4.0, 10.0])
+
+        np.testing.assert_allclose(zscores(values), (values - values.mean()) / values.std())
+        windowed = zscores(values, window=3)
+        assert len(windowed) == 3
+        assert windowed[-1] == pytest.approx((10.0 - 17 / 3) / np.std([3.0, 4.0, 10.0]))
+
+
+class TestSessionData:
+    """Test suite for SessionData"""
+
+    def test_series_is_chronological(self):
+        """Test nested price rows come back oldest first"""
+        session = SessionData.from_messages([HumanMessage(content="q"), _result("c1", PRICES)])
+
+        dates, values = session.series("c1", "close")
+
+        assert [str(day) for day in dates] == [
+            "2024-01-02",
+            "2024-01-03",
+            "2024-01-04",
+            "2024-01-05",
+        ]
+        np.testing.assert_allclose(values, [100.0, 105.0, 100.0, 110.0])
+
+    def test_undated_rows_are_skipped(self):
+        """Test rows without a date in a dated result are left out, not fatal"""
+        rows = {
+            "status": "success",
+            "data": [{"date": "2024-01-03", "close": 105.0}, {"close": 1.0}, {"date": None}],
+        }
+        session = SessionData.from_messages([_result("c1", rows)])
+
+        dates, values = session.series("c1", "close")
+        selected = _tools()["select_rows"].invoke(
+            {"source": "c1", "start_date": "2024-01-01", "session": session}
+        )
+
+        assert [str(day) for day in dates] == ["2024-01-03"]
+        np.testing.assert_allclose(values, [105.0])
+        assert selected["data"]["rows"] == [{"date": "2024-01-03", "close": 105.0}]
+
+    def test_unknown_source_lists_available_results(self):
+        """Test a bad reference names the results that can be used"""
+        session = SessionData.from_messages([_result("c1", PRICES)])
+
+        with pytest.raises(ValueError, match=r"c1 \(get_historical_prices\)"):
+            session.get("c9")
+
+
+class TestAnalyticsTools:
+    """Test suite for the analytics tools"""
+
+    def test_session_hidden_from_model(self):
+        """Test the injected session is not part of the tool call schema"""
+        for tool in create_analytics_tools():
+            assert "session" not in tool.tool_call_schema.model_json_schema()["properties"]
+
+    def test_ratio_aligns_by_date(self):
+        """Test margins are computed per period across two results"""
+        revenue = {"status": "success", "data": [{"date": "2023-09-30", "revenue": 383.0}]}
+        session = SessionData.from_messages(
+            [_result("c1", INCOME, "get_income_statement"), _result("c2", revenue)]
+        )
+
+        result = _tools()["compute_ratio"].invoke(
+            {
+                "source": "c1",
+                "numerator": "net_income",
+                "denominator": "revenue",
+                "denominator_source": "c2",
+                "session": session,
+            }
+        )
+
+        assert result["data"]["count"] == 1
+        assert result["data"]["values"] == [{"date": "2023-09-30", "value": 0.253264}]
+
+    def test_cagr_without_dates_needs_periods(self):
+        """Test undated rows use periods_per_year and errors are returned"""
+        rows = {"status": "success", "data": [{"eps": 1.21}, {"eps": 1.1}, {"eps": 1.0}]}
+        session = SessionData.from_messages([_result("c1", rows, "get_earnings")])
+        compute_cagr = _tools()["compute_cagr"]
+
+        result = compute_cagr.invoke(
+            {"source": "c1", "field": "eps", "periods_per_year": 1, "session": session}
+        )
+        missing = compute_cagr.invoke({"source": "c1", "field": "eps", "session": session})
+
+        assert result["data"]["cagr"] == pytest.approx(0.1)
+        assert missing == {
+            "status": "error",
+            "message": "Rows have no dates; pass periods_per_year",
+        }
+
+
+class TestAnalyticsInToolNode:
+    """Test suite for analytics tools run by BasicToolNode"""
+
+    def test_local_tool_reads_session_outside_budget(self):
+        """Test local tools see earlier results and do not use the FMP budget"""
+        node = BasicToolNode([], max_tool_calls=1, local_tools=create_analytics_tools())
+        message = AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": "compute_rolling_returns",
+                    "args": {"source": "c1", "field": "close", "window": 1},
+                    "id": "c2",
+                }
+            ],
+        )
+        messages = [HumanMessage(content="AAPL momentum"), _result("c1", PRICES), message]
+
+        output = node({"messages": messages})["messages"][0]
+
+        summary = json.loads(output.content)["data"]
+        assert summary["latest"] == 0.1
+        assert summary["min_date"] == "2024-01-04"
+
+    def test_local_tools_always_bound(self):
+        """Test the workflow binds local tools ahead of retrieved tools"""
+        vector_store = MagicMock()
+        vector_store.registry.list_endpoints.return_value = {}
+        vector_store.get_tools.return_value = []
+        model = MagicMock()
+        model.bind_tools.return_value.invoke.return_value = AIMessage(content="done")
+
+        agent = create_fmp_data_workflow(
+            vector_store, model, local_tools=create_analytics_tools()
+        ).compile()
+        agent.invoke({"messages": [HumanMessage(content="AAPL margins")]})
+
+        bound = model.bind_tools.call_args.kwargs["tools"]
+        assert [spec["function"]["name"] for spec in bound] == [
+            "compute_cagr",
+            "compute_rolling_returns",
+            "compute_ratio",
+            "compute_zscores",
+            "select_rows",
+        ]
@@ -0,0 +1,185 @@
+"""Unit tests for answer_cache module"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fmp_data import FMPDataClient
+from fmp_data.lc import setup_registry
+from fmp_data.lc.vector_store import EndpointVectorStore
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from langchain_fmp_data.answer_cache import (
+    CachingEmbeddings,
+    SemanticAnswerCache,
+    install_query_embedding_cache,
+)
+from langchain_fmp_data.fast_path import SymbolTable
+from langchain_fmp_data.tools import FMPDataTool
+
+
+class _CountingEmbedding(DeterministicFakeEmbedding):
+    """Fake embeddings counting query embedding calls."""
+
+    calls: int = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return super().embed_query(text)
+
+
+class TestCachingEmbeddings:
+    """Test suite for CachingEmbeddings"""
+
+    def test_embed_query_is_memoized(self):
+        """Test identical queries are embedded once and the memo is bounded"""
+        inner = _CountingEmbedding(size=8)
+        embeddings = CachingEmbeddings(inner, max_entries=2)
+
+        first = embeddings.embed_query("price of AAPL")
+        assert embeddings.embed_query("price of AAPL") == first
+        assert inner.calls == 1
+
+        embeddings.embed_query("price of MSFT")
+        embeddings.embed_query("price of TSLA")  # evicts AAPL
+        embeddings.embed_query("price of AAPL")
+        assert inner.calls == 4
+        assert embeddings.size == 8  # attributes of the wrapped embeddings
+
+    def test_retrieval_reuses_query_embedding(self, tmp_path):
+        """Test tool retrieval reuses an embedding computed for the cache lookup"""
+        inner = _CountingEmbedding(size=16)
+        client = FMPDataClient(api_key="test")
+        registry, _ = setup_registry(client)
+        store = EndpointVectorStore(client, registry, inner, cache_dir=str(tmp_path))
+        store.add_endpoints(["get_quote", "get_profile"])
+
+        embeddings = install_query_embedding_cache(store)
+        assert install_query_embedding_cache(store) is embeddings
+        calls_before = inner.calls
+        embeddings.embed_query("price of AAPL")
+        store.search("price of AAPL", k=1, threshold=0)
+
+        assert inner.calls == calls_before + 1
+
+
+class TestSemanticAnswerCache:
+    """Test suite for SemanticAnswerCache"""
+
+    def test_similar_query_same_tickers_hits(self):
+        """Test a close embedding for the same tickers returns the answer"""
+        cache = SemanticAnswerCache(similarity_threshold=0.9)
+        cache.put([1.0, 0.0, 0.1], ["AAPL"], "AAPL trades at 150")
+
+        assert cache.get([1.0, 0.05, 0.1], ["AAPL"]) == "AAPL trades at 150"
+        assert cache.get([0.0, 1.0, 0.0], ["AAPL"]) is None
+
+    def test_different_tickers_never_collide(self):
+        """Test identical wording for other symbols misses"""
+        cache = SemanticAnswerCache()
+        cache.put([1.0, 0.0], ["AAPL", "MSFT"], "comparison")
+
+        assert cache.get([1.0, 0.0], ["MSFT", "AAPL"]) == "comparison"
+        assert cache.get([1.0, 0.0], ["AAPL"]) is None
+        assert cache.get([1.0, 0.0], []) is None
+
+    def test_queries_without_tickers_are_not_cached(self):
+        """Test lower-case tickers and company names never share the empty key"""
+        cache = SemanticAnswerCache()
+        assert cache.tickers("price of aapl") == cache.tickers("Apple stock price") == []
+        cache.put([1.0, 0.0], [], "AAPL trades at 150")
+
+        assert len(cache) == 0
+        assert cache.get([1.0, 0.0], []) is None
+
+    def test_symbol_table_resolves_names_and_lower_case(self):
+        """Test a symbol table keys company names and lower-case tickers by symbol"""
+        symbols = SymbolTable({"Apple Inc.": "AAPL", "Microsoft Corporation": "MSFT"}, ["AAPL"])
+        cache = SemanticAnswerCache(symbols=symbols)
+        cache.put([1.0, 0.0], cache.tickers("Apple stock price"), "AAPL trades at 150")
+
+        assert cache.tickers("price of aapl") == ["AAPL"]
+        assert cache.get([1.0, 0.0], cache.tickers("price of aapl")) == "AAPL trades at 150"
+        assert cache.get([1.0, 0.0], cache.tickers("Microsoft stock price")) is None
+        assert cache.get([1.0, 0.0], cache.tickers("price of msft")) is None
+
+    def test_periods_are_part_of_the_key(self):
+        """Test queries differing only by year or period never hit each other"""
+        cache = SemanticAnswerCache()
+        cache.put([1.0, 0.0], cache.key("AAPL revenue 2020"), "274.5B")
+
+        assert cache.key("AAPL quarterly revenue Q3 2021") == ("AAPL", "2021", "Q3", "quarterly")
+        assert cache.get([1.0, 0.0], cache.key("What was AAPL's revenue in 2020?")) == "274.5B"
+        assert cache.get([1.0, 0.0], cache.key("AAPL revenue 2021")) is None
+        assert cache.get([1.0, 0.0], cache.key("AAPL quarterly revenue 2020")) is None
+        assert cache.key("revenue 2020") == ()
+
+    def test_entries_expire(self):
+        """Test answers are dropped after the TTL"""
+        cache = SemanticAnswerCache(ttl=10)
+        with patch("langchain_fmp_data.answer_cache.time.monotonic", return_value=100.0):
+            cache.put([1.0, 0.0], ["AAPL"], "old answer")
+        with patch("langchain_fmp_data.answer_cache.time.monotonic", return_value=111.0):
+            assert cache.get([1.0, 0.0], ["AAPL"]) is None
+            cache.put([0.0, 1.0], ["MSFT"], "new answer")
+
+        assert len(cache) == 1
+
+    def test_capacity_evicts_oldest(self):
+        """Test the oldest answers are evicted beyond max_entries"""
+        cache = SemanticAnswerCache(max_entries=2)
+        for i, symbol in enumerate(["AAPL", "MSFT", "TSLA"]):
+            cache.put([1.0, float(i)], [symbol], symbol)
+
+        assert len(cache) == 2
+        assert cache.get([1.0, 0.0], ["AAPL"]) is None
+        assert cache.get([1.0, 2.0], ["TSLA"]) == "TSLA"
+
+    def test_invalid_threshold(self):
+        """Test out of range thresholds are rejected"""
+        with pytest.raises(ValueError, match="similarity_threshold"):
+            SemanticAnswerCache(similarity_threshold=1.5)
+
+
+class TestAnswerCacheInTool:
+    """Test suite for FMPDataTool with a semantic answer cache"""
+
+    @pytest.fixture(autouse=True)
+    def setup_env(self, monkeypatch):
+        """Setup test environment"""
+        monkeypatch.setenv("FMP_API_KEY", "test_fmp_key")
+        monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
+
+    @patch("langchain_fmp_data.tools.create_vector_store")
+    @patch("langchain_fmp_data.tools.ChatOpenAI")
+    def test_paraphrase_served_from_cache(self, mock_chat, mock_create_vs):
+        """Test a paraphrased query for the same ticker skips the agent"""
+        vector_store = MagicMock()
+        vector_store.embeddings = DeterministicFakeEmbedding(size=8)
+        mock_create_vs.return_value = vector_store
+        tool = FMPDataTool(answer_cache=SemanticAnswerCache(similarity_threshold=0.9))
+        # Paraphrases embed alike; different symbols are kept apart by tickers
+        vector_store.embeddings.embed_query = MagicMock(return_value=[1.0, 0.0])
+
+        with patch("langchain_fmp_data.tools.create_fmp_data_workflow") as mock_workflow:
+            mock_agent = mock_workflow.return_value.compile.return_value
+            mock_agent.invoke.return_value = {"messages": [MagicMock(content="150")]}
+
+            assert tool.invoke({"query": "AAPL share price now"}) == "150"
+            assert tool.invoke({"query": "current AAPL stock price"}) == "150"
+            assert mock_agent.invoke.call_count == 1
+
+            tool.invoke({"query": "MSFT share price now"})
+            tool._run("AAPL share price now", refresh_answer=True)
+            assert mock_agent.invoke.call_count == 3
+
+            # Lower-case tickers and names are not recognized, so never served
+            tool.invoke({"query": "price of aapl"})
+            tool.invoke({"query": "price of msft"})
+            assert mock_agent.invoke.call_count == 5
+
+            # The same wording for another year asks for other data
+            tool.invoke({"query": "AAPL revenue 2020"})
+            tool.invoke({"query": "AAPL revenue 2021"})
+            assert mock_agent.invoke.call_count == 7
+
+        assert isinstance(vector_store.embeddings, CachingEmbeddings)
@@ -0,0 +1,300 @@
+"""Unit tests for artifacts module"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.tools import StructuredTool
+
+from langchain_fmp_data.agent import BasicToolNode, create_fmp_data_workflow
+from langchain_fmp_data.analytics import create_analytics_tools
+from langchain_fmp_data.artifacts import ArtifactStore, tool_results
+from langchain_fmp_data.sessions import SessionManager
+from langchain_fmp_data.tools import FMPDataTool, ResponseFormat
+
+HISTORY = {
+    "status": "success",
+    "data": {
+        "symbol": "AAPL",
+        "historical": [
+            {"date": f"2024-01-{day:02d}", "close": 100.0 + day, "volume": 1000 + day}
+            for day in range(28, 0, -1)
+        ],
+    },
+}
+
+
+def _call(name, args, call_id):
+    return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": call_id}])
+
+
+def _history_tool():
+    return StructuredTool.from_function(
+        func=lambda symbol: HISTORY, name="get_historical_prices", description="Prices"
+    )
+
+
+class TestArtifactStore:
+    """Test suite for ArtifactStore"""
+
+    def test_small_results_stay_inline(self):
+        """Test results under the inline limit are serialized as they are"""
+        store = ArtifactStore(inline_limit=1000)
+
+        content, handle = store.offload({"status": "success", "data": {"price": 150.0}})
+
+        assert handle is None
+        assert json.loads(content) == {"status": "success", "data": {"price": 150.0}}
+        assert len(store) == 0
+
+    def test_large_results_are_previewed(self):
+        """Test a large result is stored and replaced by a row preview"""
+        store = ArtifactStore(inline_limit=200, preview_rows=2)
+
+        content, handle = store.offload(HISTORY)
+
+        preview = json.loads(content)
+        assert handle is not None and preview["artifact"] == handle
+        assert preview["rows"] == 28
+        assert preview["fields"] == ["date", "close", "volume"]
+        assert preview["preview"] == HISTORY["data"]["historical"][:2]
+        assert len(content) < len(json.dumps(HISTORY))
+        assert store.get(handle) == HISTORY
+
+    def test_lru_eviction_by_size(self):
+        """Test the least recently used artifacts are evicted over the budget"""
+        store = ArtifactStore(max_bytes=250)
+        first = store.put({"rows": "a" * 100})
+        second = store.put({"rows": "b" * 100})
+        store.get(first)
+        third = store.put({"rows": "c" * 100})
+
+        assert first in store and third in store
+        assert store.get(second) is None
+        assert store.total_bytes <= 250
+
+    def test_conversations_have_their_own_budget(self):
+        """Test a busy conversation evicts only its own artifacts"""
+        store = ArtifactStore(max_bytes=250)
+        kept = store.put({"rows": "a" * 100}, thread_id="quiet")
+        for i in range(5):
+            store.put({"rows": str(i) * 100}, thread_id="busy")
+
+        assert store.get(kept, thread_id="quiet") == {"rows": "a" * 100}
+        assert store.thread_bytes("busy") <= 250
+        assert len(store) == 3
+
+    def test_release_keeps_shared_artifacts(self):
+        """Test releasing a conversation frees only what no other one holds"""
+        store = ArtifactStore()
+        shared = store.put(HISTORY, thread_id="a")
+        assert store.put(HISTORY, thread_id="b") == shared
+        own = store.put({"rows": "a"}, thread_id="a")
+
+        store.release("a")
+
+        assert own not in store and shared in store
+        store.release("b")
+        assert len(store) == 0 and store.total_bytes == 0
+
+    def test_deleted_sessions_free_artifacts(self):
+        """Test deleting a conversation through SessionManager frees its artifacts"""
+        store = ArtifactStore()
+        sessions = SessionManager(max_sessions=1)
+        sessions.on_delete(store.release)
+        with sessions.session("a"):
+            first = store.put(HISTORY, thread_id="a")
+        with sessions.session("b"):
+            second = store.put({"rows": "b"}, thread_id="b")
+
+        assert first not in store and second in store
+        with sessions.session("c", keep=False):
+            third = store.put({"rows": "c"}, thread_id="c")
+        assert third not in store
+
+    def test_directory_store_survives_restart(self, tmp_path):
+        """Test file-backed artifacts are picked up by a new store"""
+        handle = ArtifactStore(directory=tmp_path).put(HISTORY)
+
+        assert ArtifactStore(directory=tmp_path).get(handle) == HISTORY
+        assert ArtifactStore(directory=tmp_path, max_bytes=10).get(handle) is None
+        with pytest.raises(RuntimeError):
+            ArtifactStore()._path(handle)
+
+
+class TestArtifactsInToolNode:
+    """Test suite for BasicToolNode with an artifact store"""
+
+    def test_tool_message_carries_handle(self):
+        """Test large results reach the model as a preview with the handle attached"""
+        store = ArtifactStore(inline_limit=200)
+        node = BasicToolNode([_history_tool()], artifact_store=store)
+        messages = [
+            HumanMessage(content="AAPL prices"),
+            _call("get_historical_prices", {"symbol": "AAPL"}, "c1"),
+        ]
+
+        output = node({"messages": messages}, {"configurable": {"thread_id": "t1"}})["messages"][0]
+
+        assert output.artifact is not None
+        assert json.loads(output.content)["rows"] == 28
+        assert store.get(output.artifact) == HISTORY
+        assert store.thread_bytes("t1") == store.total_bytes
+        assert "select_rows" not in json.loads(output.content)["note"]
+
+    def test_local_tools_read_full_result(self):
+        """Test local tools resolve the handle instead of reading the preview"""
+        store = ArtifactStore(inline_limit=200)
+        node = BasicToolNode(
+            [_history_tool()], artifact_store=store, local_tools=create_analytics_tools()
+        )
+        messages = [
+            HumanMessage(content="AAPL prices"),
+            _call("get_historical_prices", {"symbol": "AAPL"}, "c1"),
+        ]
+        messages += node({"messages": messages})["messages"]
+        assert "select_rows" in json.loads(messages[-1].content)["note"]
+        messages.append(
+            _call(
+                "select_rows",
+                {
+                    "source": "c1",
+                    "fields": ["close"],
+                    "start_date": "2024-01-02",
+                    "end_date": "2024-01-03",
+                },
+                "c2",
+            )
+        )
+
+        output = node({"messages": messages})["messages"][0]
+
+        assert json.loads(output.content)["data"] == {
+            "total": 2,
+            "returned": 2,
+            "rows": [
+                {"date": "2024-01-03", "close": 103.0},
+                {"date": "2024-01-02", "close": 102.0},
+            ],
+        }
+
+    def test_expired_artifact_asks_to_refetch(self):
+        """Test an evicted result is reported as expired to the model"""
+        store = ArtifactStore(inline_limit=200)
+        node = BasicToolNode([], artifact_store=store, local_tools=create_analytics_tools())
+        evicted = ToolMessage(
+            content="{}", tool_call_id="c1", name="get_historical_prices", artifact="artifact-gone"
+        )
+        messages = [
+            HumanMessage(content="AAPL"),
+            evicted,
+            _call("compute_cagr", {"source": "c1", "field": "close"}, "c2"),
+        ]
+
+        output = node({"messages": messages})["messages"][0]
+
+        assert "fetch it again" in json.loads(output.content)["message"]
+
+
+class TestDataStructureResponses:
+    """Test suite for structured responses built from tool results"""
+
+    @staticmethod
+    def _workflow(model, tools, store=None):
+        """Data-only workflow over stub endpoint tools."""
+        vector_store = MagicMock()
+        infos = {}
+        for tool in tools:
+            info = MagicMock()
+            info.semantics.deprecated = False
+            info.semantics.method_name = tool.name
+            infos[tool.name] = info
+        by_info = {id(info): tool for info, tool in zip(infos.values(), tools)}
+        vector_store.registry.list_endpoints.return_value = infos
+        vector_store.registry.get_endpoint.side_effect = infos.get
+        vector_store.create_tool.side_effect = lambda info: by_info[id(info)]
+        vector_store.get_tools.return_value = []
+        return create_fmp_data_workflow(
+            vector_store, model, artifact_store=store, stop_after_data=True
+        ).compile()
+
+    def test_workflow_drops_final_answer(self):
+        """Test stop_after_data ends on the tool results once the model stops calling tools"""
+        model = MagicMock()
+        model.invoke.side_effect = [
+            _call("get_historical_prices", {"symbol": "AAPL"}, "c1"),
+            AIMessage(content="AAPL rose."),
+        ]
+        store = ArtifactStore(inline_limit=200)
+
+        final = self._workflow(model, [_history_tool()], store).invoke(
+            {"messages": [HumanMessage(content="AAPL prices")]}
+        )
+
+        assert isinstance(final["messages"][-1], ToolMessage)
+        assert tool_results(final["messages"], store) == [
+            {
+                "tool": "get_historical_prices",
+                "tool_call_id": "c1",
+                "args": {"symbol": "AAPL"},
+                "result": HISTORY,
+            }
+        ]
+
+    def test_workflow_runs_dependent_steps(self):
+        """Test a search result does not end the run before the data it leads to"""
+        search = StructuredTool.from_function(
+            func=lambda query: {"status": "success", "data": [{"symbol": "AAPL"}]},
+            name="search_company",
+            description="Search",
+        )
+        model = MagicMock()
+        model.invoke.side_effect = [
+            _call("search_company", {"query": "Apple"}, "c1"),
+            _call("get_historical_prices", {"symbol": "AAPL"}, "c2"),
+            AIMessage(content="Apple rose."),
+        ]
+
+        final = self._workflow(model, [search, _history_tool()]).invoke(
+            {"messages": [HumanMessage(content="Apple prices")]}
+        )
+
+        assert model.invoke.call_count == 3
+        assert [r["tool"] for r in tool_results(final["messages"])] == [
+            "search_company",
+            "get_historical_prices",
+        ]
+        assert isinstance(final["messages"][-1], ToolMessage)
+
+    @pytest.fixture
+    def tool(self, monkeypatch):
+        """FMPDataTool with a mocked vector store and model."""
+        monkeypatch.setenv("FMP_API_KEY", "test_fmp_key")
+        monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
+        with (
+            patch("langchain_fmp_data.tools.create_vector_store"),
+            patch("langchain_fmp_data.tools.ChatOpenAI"),
+        ):
+            yield FMPDataTool(artifact_store=ArtifactStore(inline_limit=200))
+
+    def test_data_structure_returns_full_results(self, tool):
+        """Test DATA_STRUCTURE returns the stored tool data, not the model's text"""
+        content, handle = tool.artifact_store.offload(HISTORY)
+        messages = [
+            SystemMessage(content="system"),
+            HumanMessage(content="AAPL prices"),
+            _call("get_historical_prices", {"symbol": "AAPL"}, "c1"),
+            ToolMessage(
+                content=content, tool_call_id="c1", name="get_historical_prices", artifact=handle
+            ),
+        ]
+
+        with patch("langchain_fmp_data.tools.create_fmp_data_workflow") as mock_workflow:
+            mock_workflow.return_value.compile.return_value.invoke.return_value = {
+                "messages": messages
+            }
+            result = tool._run("AAPL prices", response_format=ResponseFormat.DATA_STRUCTURE)
+
+        assert mock_workflow.call_args.kwargs["stop_after_data"] is True
+        assert result["results"][0]["result"] == HISTORY
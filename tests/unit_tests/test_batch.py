@@ -0,0 +1,195 @@
+"""Unit tests for batch module"""
+
+import json
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import StructuredTool
+from langgraph.graph import START, MessagesState, StateGraph
+
+from langchain_fmp_data.batch import RateLimiter, answered_ids, resolve_tool_factory, run_batch
+from langchain_fmp_data.cli import main
+from langchain_fmp_data.tools import FMPDataTool
+
+STUB_FACTORY = "tests.unit_tests.test_batch:stub_tool_factory"
+
+
+def stub_tool_factory():
+    """Offline stand-in for FMPDataTool, failing on queries containing "fail"."""
+
+    def answer(query: str, response_format: str = "natural_language") -> str | dict:
+        if "fail" in query:
+            raise RuntimeError("model unavailable")
+        if response_format != "natural_language":
+            return {"query": query}
+        return f"Answer to {query}"
+
+    return StructuredTool.from_function(func=answer, name="FMP Data", description="Stub")
+
+
+def _failing_workflow(*args, **kwargs):
+    """Workflow whose agent fails on queries containing "fail"."""
+
+    def agent(state):
+        query = next(m.content for m in state["messages"] if isinstance(m, HumanMessage))
+        if "fail" in query:
+            raise RuntimeError("model down")
+        return {"messages": [AIMessage(content=f"Answer to {query}")]}
+
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("agent", agent)
+    workflow.add_edge(START, "agent")
+    return workflow
+
+
+def _write_questions(path, lines):
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+
+def _results(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestRunBatch:
+    """Test suite for run_batch"""
+
+    def test_answers_and_records_failures(self, tmp_path):
+        """Test each question gets one result line, failures included"""
+        questions, output = tmp_path / "q.jsonl", tmp_path / "r.jsonl"
+        _write_questions(
+            questions,
+            [
+                "AAPL price",
+                {"id": "msft", "query": "MSFT revenue", "response_format": "data_structure"},
+                "fail please",
+            ],
+        )
+
+        report = run_batch(questions, output, stub_tool_factory, processes=0, warmup=False)
+
+        results = {r["id"]: r for r in _results(output)}
+        assert results["1"]["answer"] == "Answer to AAPL price"
+        assert results["msft"]["answer"] == {"query": "MSFT revenue"}
+        assert results["3"]["status"] == "error"
+        assert "model unavailable" in results["3"]["error"]
+        assert (report.total, report.completed, report.failed) == (3, 2, 1)
+        assert report.done == 3
+
+    def test_fmp_data_tool_failures_are_retried(self, tmp_path, monkeypatch):
+        """Test a real FMPDataTool's failed queries are recorded as errors, not answers"""
+        monkeypatch.setenv("FMP_API_KEY", "test_fmp_key")
+        monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
+        questions, output = tmp_path / "q.jsonl", tmp_path / "r.jsonl"
+        _write_questions(questions, ["AAPL price", "fail please"])
+
+        with (
+            patch("langchain_fmp_data.tools.create_vector_store"),
+            patch("langchain_fmp_data.tools.ChatOpenAI"),
+            patch("langchain_fmp_data.tools.create_fmp_data_workflow", _failing_workflow),
+        ):
+            report = run_batch(questions, output, FMPDataTool, processes=0, warmup=False)
+
+        results = {r["id"]: r for r in _results(output)}
+        assert results["1"]["status"] == "success"
+        assert results["1"]["answer"] == "Answer to AAPL price"
+        assert results["2"]["status"] == "error"
+        assert "model down" in results["2"]["error"]
+        assert report.failed == 1
+        assert answered_ids(output) == {"1"}
+
+    def test_resume_skips_answered_questions(self, tmp_path):
+        """Test a rerun retries failed and cut-off questions only"""
+        questions, output = tmp_path / "q.jsonl", tmp_path / "r.jsonl"
+        _write_questions(questions, ["AAPL price", "MSFT price", "NVDA price"])
+        output.write_text(
+            json.dumps({"id": "1", "status": "success", "answer": "cached"})
+            + "\n"
+            + json.dumps({"id": "2", "status": "error", "error": "timeout"})
+            + "\n"
+            + '{"id": "3", "stat'
+        )
+
+        report = run_batch(questions, output, stub_tool_factory, processes=0, warmup=False)
+
+        lines = output.read_text().splitlines()
+        assert lines[2] == '{"id": "3", "stat'
+        answered = [json.loads(line) for line in lines[3:]]
+        assert sorted(r["id"] for r in answered) == ["2", "3"]
+        assert (report.skipped, report.completed) == (1, 2)
+
+        report = run_batch(questions, output, stub_tool_factory, processes=0, resume=False)
+        assert report.skipped == 0
+        assert len(_results(output)) == 3
+
+    def test_process_pool_with_rate_limit(self, tmp_path):
+        """Test questions are answered by worker processes under a global rate limit"""
+        questions, output = tmp_path / "q.jsonl", tmp_path / "r.jsonl"
+        _write_questions(questions, [f"Q{i} price" for i in range(6)])
+        progress = []
+
+        start = time.perf_counter()
+        report = run_batch(
+            questions,
+            output,
+            STUB_FACTORY,
+            processes=2,
+            rate_limit=10,
+            progress_interval=0.0,
+            on_progress=lambda r: progress.append(r.done),
+        )
+        elapsed = time.perf_counter() - start
+
+        results = _results(output)
+        assert sorted(r["id"] for r in results) == [str(i) for i in range(1, 7)]
+        assert all(r["status"] == "success" for r in results)
+        assert os.getpid() not in {r["worker"] for r in results}
+        assert elapsed >= 0.5
+        assert progress[-1] == 6
+        assert report.throughput > 0
+
+
+class TestBatchHelpers:
+    """Test suite for the batch helpers"""
+
+    def test_rate_limiter_spaces_acquisitions(self):
+        """Test acquisitions are spaced by the rate interval"""
+        limiter = RateLimiter(20)
+        start = time.perf_counter()
+        for _ in range(5):
+            limiter.acquire()
+
+        assert time.perf_counter() - start >= 0.2
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+
+    def test_resolve_tool_factory(self):
+        """Test factories resolve from import paths and malformed paths are rejected"""
+        assert resolve_tool_factory(STUB_FACTORY) is stub_tool_factory
+        assert resolve_tool_factory(stub_tool_factory) is stub_tool_factory
+        with pytest.raises(ValueError):
+            resolve_tool_factory("stub_tool_factory")
+
+    def test_cli_batch(self, tmp_path, capsys):
+        """Test the batch command answers a question file"""
+        questions, output = tmp_path / "q.jsonl", tmp_path / "r.jsonl"
+        _write_questions(questions, ["AAPL price"])
+
+        code = main(
+            [
+                "batch",
+                str(questions),
+                str(output),
+                "--processes",
+                "0",
+                "--tool-factory",
+                STUB_FACTORY,
+                "--no-warmup",
+            ]
+        )
+
+        assert code == 0
+        assert _results(output)[0]["answer"] == "Answer to AAPL price"
+        assert "1/1 done" in capsys.readouterr().out
@@ -0,0 +1,127 @@
+"""Unit tests for checkpointing module"""
+
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from langchain_fmp_data.checkpointing import DeltaMemorySaver, saver_bytes
+from langchain_fmp_data.sessions import SessionManager
+
+
+def _graph(saver, iterations=5):
+    """Agent loop making one tool call per iteration with a large result."""
+
+    def agent(state):
+        calls = sum(isinstance(m, ToolMessage) for m in state["messages"])
+        if calls >= iterations:
+            return {"messages": [AIMessage(content="Done.")]}
+        call = {"name": "get_quote", "args": {"symbol": "AAPL"}, "id": f"call-{calls}"}
+        return {"messages": [AIMessage(content="", tool_calls=[call])]}
+
+    def tools(state):
+        call_id = state["messages"][-1].tool_calls[0]["id"]
+        content = json.dumps({"status": "success", "data": [{"price": 150.0}] * 200})
+        return {"messages": [ToolMessage(content=content, tool_call_id=call_id)]}
+
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("agent", agent)
+    workflow.add_node("tools", tools)
+    workflow.add_edge(START, "agent")
+    workflow.add_conditional_edges(
+        "agent", lambda state: "tools" if state["messages"][-1].tool_calls else END
+    )
+    workflow.add_edge("tools", "agent")
+    return workflow.compile(checkpointer=saver)
+
+
+def _config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def _dump(messages):
+    return [(type(m).__name__, m.content, m.id, getattr(m, "tool_calls", None)) for m in messages]
+
+
+class TestDeltaMemorySaver:
+    """Test suite for DeltaMemorySaver"""
+
+    def test_same_state_as_memory_saver(self):
+        """Test restored state and history match a full checkpointer"""
+        states = []
+        for saver in (MemorySaver(), DeltaMemorySaver()):
+            graph = _graph(saver)
+            graph.invoke(
+                {"messages": [HumanMessage(content="Analyze AAPL", id="h1")]}, _config("a")
+            )
+            graph.invoke({"messages": [HumanMessage(content="Again", id="h2")]}, _config("a"))
+            history = [len(s.values["messages"]) for s in graph.get_state_history(_config("a"))]
+            messages = graph.get_state(_config("a")).values["messages"]
+            states.append(([(t, c, tc) for t, c, _, tc in _dump(messages)], history))
+
+        assert states[0] == states[1]
+
+    def test_stores_each_message_once(self):
+        """Test each message is stored at most twice and far fewer bytes are held"""
+        full, delta = MemorySaver(), DeltaMemorySaver()
+        for saver in (full, delta):
+            _graph(saver, iterations=10).invoke(
+                {"messages": [HumanMessage(content="Analyze AAPL")]}, _config("a")
+            )
+
+        # Once in the checkpoint, and in pending writes until it gets its id
+        assert 22 <= len(delta.payloads) <= 2 * 22
+        assert sum(delta.stored_bytes().values()) * 5 < sum(saver_bytes(full).values())
+
+    def test_payloads_shared_and_freed_per_thread(self):
+        """Test threads share identical payloads, freed with the last thread holding them"""
+        saver = DeltaMemorySaver()
+        graph = _graph(saver, iterations=1)
+        question = {"messages": [HumanMessage(content="q", id="same")]}
+        graph.invoke(question, _config("a"))
+        # Pending writes may be serialized before or after a message gets its
+        # id, so compare the stored digests rather than their counts
+        first = set(saver.payloads.payloads)
+        graph.invoke(question, _config("b"))
+        second = set(saver.payloads.payloads) - first
+
+        saver.delete_thread("a")
+        kept = set(saver.payloads.payloads)
+        assert kept & first, "the question's payload is shared with thread b"
+        assert second <= kept < first | second
+        assert graph.get_state(_config("b")).values["messages"][0].content == "q"
+
+        saver.delete_thread("b")
+        assert len(saver.payloads) == 0
+
+        saver.delete_thread("b")
+        assert len(saver.payloads) == 0
+
+    def test_changed_message_is_stored_again(self):
+        """Test a message whose id changed is serialized again instead of reused"""
+        saver = DeltaMemorySaver()
+        message = AIMessage(content="answer", id="m1")
+        saver._local.thread_id = "a"
+        first = saver.serde.dumps_typed([message])
+        message.id = "m2"
+        second = saver.serde.dumps_typed([message])
+        saver._local.thread_id = None
+
+        assert first != second
+        assert saver.serde.loads_typed(second)[0].id == "m2"
+        assert saver.serde.loads_typed(saver.serde.dumps_typed({"a": 1})) == {"a": 1}
+
+    def test_session_manager_conversation(self):
+        """Test conversations continue on a session manager using delta checkpoints"""
+        sessions = SessionManager(checkpointer=DeltaMemorySaver())
+        graph = _graph(sessions.checkpointer, iterations=1)
+        with sessions.session("a"):
+            graph.invoke({"messages": [HumanMessage(content="first")]}, _config("a"))
+        with sessions.session("a"):
+            result = graph.invoke({"messages": [HumanMessage(content="second")]}, _config("a"))
+
+        assert [m.content for m in result["messages"] if isinstance(m, HumanMessage)] == [
+            "first",
+            "second",
+        ]
@@ -0,0 +1,155 @@
+"""Unit tests for coalesce module"""
+
+import json
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fmp_data import FMPDataClient
+from fmp_data.lc import setup_registry
+from fmp_data.lc.vector_store import EndpointVectorStore
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.tools import BaseTool
+
+from langchain_fmp_data.agent import BasicToolNode, endpoint_tool_factories
+from langchain_fmp_data.coalesce import DEFAULT_BATCH_RULES, ToolCallCoalescer
+from langchain_fmp_data.prefetch import ToolResultCache
+
+
+def _call(call_id, symbol, name="get_quote", **args):
+    return {"name": name, "args": {"symbol": symbol, **args}, "id": call_id}
+
+
+def _mock_tool(name, result=None):
+    tool = MagicMock(spec=BaseTool)
+    tool.name = name
+    tool.invoke.return_value = result
+    return tool
+
+
+def _quote_tools(batch_rows):
+    """Mock get_quote/get_quotes tools; the batch returns the given rows."""
+    single = _mock_tool("get_quote")
+    single.invoke.side_effect = lambda args: {"status": "success", "data": {"single": args}}
+    batch = _mock_tool("get_quotes", {"status": "success", "data": batch_rows})
+    return single, batch
+
+
+class TestToolCallCoalescer:
+    """Test suite for ToolCallCoalescer"""
+
+    def test_plan_groups_same_tool_and_args(self):
+        """Test only calls differing by symbol alone are batched together"""
+        coalescer = ToolCallCoalescer()
+        calls = [
+            _call("1", "AAPL"),
+            _call("2", "MSFT"),
+            _call("3", "TSLA", name="get_profile"),
+            _call("4", "AAPL", name="get_market_cap"),
+            _call("5", "GOOGL"),
+        ]
+
+        batches = coalescer.plan(calls)
+
+        assert len(batches) == 1
+        assert batches[0].batch_args == {"symbols": "AAPL,MSFT,GOOGL"}
+        assert [c["id"] for c in batches[0].tool_calls] == ["1", "2", "5"]
+
+    def test_plan_chunks_by_max_batch(self):
+        """Test groups are cut at max_batch and short remainders are not batched"""
+        coalescer = ToolCallCoalescer(max_batch=2)
+        calls = [_call(str(i), symbol) for i, symbol in enumerate(["A", "B", "C", "D", "E"])]
+
+        batches = coalescer.plan(calls)
+
+        assert [b.symbols for b in batches] == [["A", "B"], ["C", "D"]]
+
+    def test_split_maps_rows_to_calls(self):
+        """Test rows go back to their calls and missing symbols are left out"""
+        coalescer = ToolCallCoalescer()
+        batch = coalescer.plan([_call("1", "aapl"), _call("2", "MSFT"), _call("3", "AAPL")])[0]
+
+        results = coalescer.split(
+            batch, {"status": "success", "data": [{"symbol": "AAPL", "price": 150.0}]}
+        )
+
+        assert batch.batch_args == {"symbols": "aapl,MSFT,AAPL"}
+        assert results == {
+            "1": {"status": "success", "data": {"symbol": "AAPL", "price": 150.0}},
+            "3": {"status": "success", "data": {"symbol": "AAPL", "price": 150.0}},
+        }
+        assert coalescer.split(batch, {"status": "error", "message": "boom"}) == {}
+
+    def test_invalid_bounds(self):
+        """Test batches smaller than two calls are rejected"""
+        with pytest.raises(ValueError, match="min_batch"):
+            ToolCallCoalescer(min_batch=1)
+
+
+class TestCoalescingToolNode:
+    """Test suite for BasicToolNode with a coalescer"""
+
+    def test_calls_answered_by_one_batch(self):
+        """Test per-symbol calls become one batch call with one message per call"""
+        single, batch = _quote_tools(
+            [{"symbol": "MSFT", "price": 400.0}, {"symbol": "AAPL", "price": 150.0}]
+        )
+        node = BasicToolNode([single, batch], coalescer=ToolCallCoalescer())
+        message = MagicMock()
+        message.tool_calls = [_call("1", "AAPL"), _call("2", "MSFT")]
+
+        outputs = node({"messages": [message]})["messages"]
+
+        batch.invoke.assert_called_once_with({"symbols": "AAPL,MSFT"})
+        single.invoke.assert_not_called()
+        assert [m.tool_call_id for m in outputs] == ["1", "2"]
+        assert json.loads(outputs[0].content)["data"]["price"] == 150.0
+
+    def test_unanswered_calls_fall_back(self):
+        """Test symbols missing from the batch and failed batches run on their own"""
+        single, batch = _quote_tools([{"symbol": "AAPL", "price": 150.0}])
+        node = BasicToolNode([single, batch], coalescer=ToolCallCoalescer())
+        message = MagicMock()
+        message.tool_calls = [_call("1", "AAPL"), _call("2", "MSFT")]
+
+        node({"messages": [message]})
+        single.invoke.assert_called_once_with({"symbol": "MSFT"})
+
+        batch.invoke.side_effect = RuntimeError("batch endpoint down")
+        node({"messages": [message]})
+        assert single.invoke.call_count == 3
+
+    def test_prefetched_calls_not_batched(self):
+        """Test calls with a prefetched result stay out of the batch"""
+        single, batch = _quote_tools([{"symbol": "MSFT"}, {"symbol": "GOOGL"}])
+        prefetched: Future = Future()
+        prefetched.set_result({"status": "success", "data": "prefetched"})
+        cache = ToolResultCache()
+        cache.put("get_quote", {"symbol": "AAPL"}, prefetched)
+        node = BasicToolNode([single, batch], result_cache=cache, coalescer=ToolCallCoalescer())
+        message = MagicMock()
+        message.tool_calls = [_call("1", "AAPL"), _call("2", "MSFT"), _call("3", "GOOGL")]
+
+        outputs = node({"messages": [message]})["messages"]
+
+        batch.invoke.assert_called_once_with({"symbols": "MSFT,GOOGL"})
+        single.invoke.assert_not_called()
+        assert json.loads(outputs[0].content)["data"] == "prefetched"
+
+    def test_batch_tools_receive_symbol_lists(self, tmp_path):
+        """Test catalog batch tools pass comma-separated symbols as a list"""
+        client = FMPDataClient(api_key="test")
+        registry, _ = setup_registry(client)
+        store = EndpointVectorStore(
+            client, registry, DeterministicFakeEmbedding(size=8), cache_dir=str(tmp_path)
+        )
+        factories = endpoint_tool_factories(store)
+        assert all(rule.batch_tool in factories for rule in DEFAULT_BATCH_RULES.values())
+
+        with patch.object(
+            type(client.batch), "get_quotes", autospec=True, return_value=[]
+        ) as get_quotes:
+            result = factories["get_quotes"]().invoke({"symbols": "AAPL, MSFT"})
+
+        assert get_quotes.call_args.kwargs == {"symbols": ["AAPL", "MSFT"]}
+        assert result["status"] == "success"
@@ -0,0 +1,188 @@
+"""Unit tests for endpoint_health module"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+
+from langchain_fmp_data.agent import BasicToolNode, ToolExecutionError
+from langchain_fmp_data.endpoint_health import (
+    CircuitState,
+    EndpointHealth,
+    EndpointHealthConfig,
+)
+
+
+class DelayStub:
+    """Local endpoint stand-in injecting per-call delays and failures."""
+
+    def __init__(self, delays=(), fail=False, default_delay=0.0):
+        self.delays = list(delays)
+        self.fail = fail
+        self.default_delay = default_delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol):
+        with self._lock:
+            self.calls += 1
+            delay = self.delays.pop(0) if self.delays else self.default_delay
+        time.sleep(delay)
+        if self.fail:
+            raise TimeoutError("read timed out")
+        return {"status": "success", "data": [{"symbol": symbol, "price": 150.0}]}
+
+    def tool(self):
+        def get_quote(symbol: str) -> dict:
+            return self(symbol)
+
+        return StructuredTool.from_function(func=get_quote, description="Quote")
+
+
+def _call(health, stub):
+    return health.call("get_quote", lambda: stub(symbol="AAPL"))
+
+
+class TestCircuitBreaker:
+    """Test suite for the EndpointHealth circuit breaker"""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test the circuit opens and then rejects calls without reaching the endpoint"""
+        health = EndpointHealth(EndpointHealthConfig(failure_threshold=3))
+        stub = DelayStub(fail=True)
+
+        results = [_call(health, stub) for _ in range(5)]
+
+        assert [r["error_type"] for r in results] == [
+            "endpoint_unavailable",
+            "endpoint_unavailable",
+            "endpoint_unavailable",
+            "circuit_open",
+            "circuit_open",
+        ]
+        assert stub.calls == 3
+        assert health.state("get_quote") == CircuitState.OPEN
+        assert health.snapshot()["get_quote"]["rejected"] == 2
+
+    @pytest.mark.parametrize("recovers", [True, False])
+    def test_probe_after_recovery_time(self, recovers):
+        """Test one probe call closes the circuit on success or reopens it on failure"""
+        health = EndpointHealth(EndpointHealthConfig(failure_threshold=1, recovery_seconds=30))
+        with patch("langchain_fmp_data.endpoint_health.time.monotonic", return_value=0.0):
+            _call(health, DelayStub(fail=True))
+        stub = DelayStub(fail=not recovers)
+
+        with patch("langchain_fmp_data.endpoint_health.time.monotonic", return_value=29.0):
+            assert _call(health, stub)["error_type"] == "circuit_open"
+        with patch("langchain_fmp_data.endpoint_health.time.monotonic", return_value=31.0):
+            assert health.allow("get_quote")
+            assert not health.allow("get_quote")
+            health.record("get_quote", 0.01, failed=not recovers)
+
+        expected = CircuitState.CLOSED if recovers else CircuitState.OPEN
+        assert health.state("get_quote") == expected
+
+    def test_slow_and_error_results_count_as_failures(self):
+        """Test slow calls and endpoint error results trip the circuit, bad input does not"""
+        health = EndpointHealth(EndpointHealthConfig(failure_threshold=2, slow_call_seconds=0.01))
+        _call(health, DelayStub(delays=[0.03]))
+        health.call("get_quote", lambda: {"status": "error", "error_type": "validation_error"})
+        assert health.state("get_quote") == CircuitState.CLOSED
+
+        _call(health, DelayStub(delays=[0.03]))
+        health.call("get_quote", lambda: {"status": "error", "error_type": "unexpected_error"})
+        assert health.state("get_quote") == CircuitState.OPEN
+
+
+class TestHedging:
+    """Test suite for hedged requests"""
+
+    def test_slow_call_is_hedged(self):
+        """Test a call past the latency percentile is raced by a duplicate"""
+        health = EndpointHealth(
+            EndpointHealthConfig(hedge_percentile=95, hedge_min_samples=5, hedge_min_delay=0.0)
+        )
+        stub = DelayStub(default_delay=0.01)
+        for _ in range(5):
+            _call(health, stub)
+        assert health.hedge_delay("get_quote") < 0.1
+
+        stub.delays = [1.0]
+        start = time.perf_counter()
+        result = _call(health, stub)
+        elapsed = time.perf_counter() - start
+        health.close()
+
+        assert result["status"] == "success"
+        assert elapsed < 0.5
+        stats = health.snapshot()["get_quote"]
+        assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+
+    def test_failed_primary_waits_for_hedge(self):
+        """Test an error result from the primary does not beat a successful hedge"""
+        health = EndpointHealth(
+            EndpointHealthConfig(hedge_percentile=95, hedge_min_samples=5, hedge_min_delay=0.0)
+        )
+        stub = DelayStub(default_delay=0.01)
+        for _ in range(5):
+            _call(health, stub)
+        calls = iter([(0.05, False), (0.15, True)])
+
+        def endpoint():
+            delay, ok = next(calls)
+            time.sleep(delay)
+            if ok:
+                return {"status": "success", "data": [{"symbol": "AAPL", "price": 150.0}]}
+            return {"status": "error", "error_type": "unexpected_error", "message": "502"}
+
+        result = health.call("get_quote", endpoint)
+        health.close()
+
+        assert result["status"] == "success"
+        assert health.snapshot()["get_quote"]["hedge_wins"] == 1
+
+    def test_no_hedging_without_samples(self):
+        """Test endpoints without enough latency samples are not hedged"""
+        health = EndpointHealth(EndpointHealthConfig(hedge_percentile=95, hedge_min_samples=5))
+        _call(health, DelayStub())
+
+        assert health.hedge_delay("get_quote") is None
+        assert EndpointHealth().hedge_delay("get_quote") is None
+
+
+class TestToolNodeHealth:
+    """Test suite for endpoint health in BasicToolNode"""
+
+    def _state(self):
+        return {
+            "messages": [
+                AIMessage(
+                    content="",
+                    tool_calls=[{"name": "get_quote", "args": {"symbol": "AAPL"}, "id": "c1"}],
+                )
+            ]
+        }
+
+    def test_failure_becomes_error_result(self):
+        """Test a failing endpoint yields a tool message instead of aborting"""
+        stub = DelayStub(fail=True)
+        node = BasicToolNode(
+            [stub.tool()], endpoint_health=EndpointHealth(EndpointHealthConfig(failure_threshold=1))
+        )
+
+        first = node(self._state())["messages"][0]
+        second = node(self._state())["messages"][0]
+
+        assert '"endpoint_unavailable"' in first.content
+        assert '"circuit_open"' in second.content
+        assert stub.calls == 1
+
+    def test_failure_aborts_without_health(self):
+        """Test the run still aborts on a failing endpoint without health tracking"""
+        node = BasicToolNode([DelayStub(fail=True).tool()])
+
+        with pytest.raises(ToolExecutionError):
+            node(self._state())
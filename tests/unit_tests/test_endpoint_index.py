@@ -0,0 +1,255 @@
+"""Unit tests for endpoint_index module"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import faiss
+import numpy as np
+import pytest
+from fmp_data import FMPDataClient
+from fmp_data.exceptions import ConfigError
+from fmp_data.lc import setup_registry
+from fmp_data.lc.vector_store import EndpointVectorStore
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from langchain_fmp_data import cli
+from langchain_fmp_data.endpoint_index import (
+    METADATA_FILE,
+    EndpointIndexConfig,
+    IndexType,
+    PrebuiltEndpointVectorStore,
+    Quantization,
+    apply_index_config,
+    build_endpoint_index,
+    build_faiss_index,
+    index_exists,
+    read_index_metadata,
+)
+from langchain_fmp_data.tools import FMPDataTool
+
+ENDPOINTS = ["get_quote", "get_profile", "get_income_statement", "get_historical_prices"]
+
+
+@pytest.fixture(scope="module")
+def source_store(tmp_path_factory):
+    """Vector store populated offline with deterministic fake embeddings."""
+    client = FMPDataClient(api_key="test")
+    registry, _ = setup_registry(client)
+    store = EndpointVectorStore(
+        client,
+        registry,
+        DeterministicFakeEmbedding(size=32),
+        cache_dir=str(tmp_path_factory.mktemp("cache")),
+    )
+    store.add_endpoints(ENDPOINTS)
+    return store
+
+
+@pytest.fixture
+def artifact(source_store, tmp_path):
+    """Endpoint index artifact built from the source store."""
+    build_endpoint_index(source_store, tmp_path)
+    return tmp_path
+
+
+class TestEndpointIndex:
+    """Test suite for building and loading endpoint index artifacts"""
+
+    def test_build_writes_artifact(self, artifact):
+        """Test the artifact holds the index and one metadata row per vector"""
+        assert index_exists(artifact)
+        index_metadata = read_index_metadata(artifact)
+        assert sorted(index_metadata.endpoints) == sorted(ENDPOINTS)
+        assert index_metadata.dimension == 32
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_loaded_store_matches_source(self, source_store, artifact, mmap):
+        """Test search results of the prebuilt store match the source store"""
+        store = PrebuiltEndpointVectorStore(
+            source_store.client,
+            source_store.registry,
+            source_store.embeddings,
+            artifact,
+            mmap=mmap,
+        )
+
+        query = "latest stock price quote"
+        expected = [r.name for r in source_store.search(query, k=3, threshold=0)]
+        assert [r.name for r in store.search(query, k=3, threshold=0)] == expected
+        assert {t.name for t in store.get_tools(query, k=2, threshold=0)} <= set(ENDPOINTS)
+
+    def test_store_is_read_only(self, source_store, artifact):
+        """Test prebuilt stores refuse to add endpoints"""
+        store = PrebuiltEndpointVectorStore(
+            source_store.client, source_store.registry, source_store.embeddings, artifact
+        )
+
+        with pytest.raises(ConfigError, match="read-only"):
+            store.add_endpoints(["get_market_cap"])
+
+    def test_version_drift_warns(self, source_store, artifact, caplog):
+        """Test an artifact built for another fmp_data version is flagged"""
+        path = artifact / METADATA_FILE
+        metadata = json.loads(path.read_text())
+        metadata["fmp_data_version"] = "0.0.1"
+        path.write_text(json.dumps(metadata))
+
+        PrebuiltEndpointVectorStore(
+            source_store.client, source_store.registry, source_store.embeddings, artifact
+        )
+
+        assert "Rebuild it" in caplog.text
+
+    def test_embedding_model_mismatch_fails(self, source_store, artifact):
+        """Test loading with embeddings from another model is refused"""
+        embeddings = MagicMock()
+        embeddings.model = "text-embedding-3-large"
+
+        with pytest.raises(ConfigError, match="built with"):
+            PrebuiltEndpointVectorStore(
+                source_store.client, source_store.registry, embeddings, artifact
+            )
+
+
+def _clustered_vectors(count, dimension, seed=0):
+    """Normalized vectors around a few centers, shaped like text embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(20, dimension))
+    vectors = centers[rng.integers(0, 20, count)] + 0.3 * rng.normal(size=(count, dimension))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+class TestIndexTypes:
+    """Test suite for approximate and quantized endpoint indexes"""
+
+    @pytest.mark.parametrize(
+        "config, expected",
+        [
+            (EndpointIndexConfig(), "Flat"),
+            (EndpointIndexConfig(index_type="hnsw", quantization="sq8"), "HNSW32,SQ8"),
+            (EndpointIndexConfig(quantization="fp16"), "SQfp16"),
+            (EndpointIndexConfig(index_type="ivf", quantization="pq"), "IVF25,PQ96x8np"),
+            (EndpointIndexConfig(index_type="ivf", ivf_lists=10), "IVF10,Flat"),
+        ],
+    )
+    def test_factory_string(self, config, expected):
+        """Test configs map to FAISS factory strings sized to the catalog"""
+        assert config.factory_string(1536, 1000) == expected
+
+    def test_pq_must_divide_dimension(self):
+        """Test PQ subquantizers not dividing the dimension are rejected"""
+        config = EndpointIndexConfig(quantization=Quantization.PQ, pq_subquantizers=7)
+
+        with pytest.raises(ValueError, match="divide"):
+            build_faiss_index(_clustered_vectors(300, 32), config)
+
+    @pytest.mark.parametrize(
+        "config, min_recall",
+        [
+            (EndpointIndexConfig(index_type=IndexType.HNSW), 0.9),
+            (EndpointIndexConfig(index_type=IndexType.IVF), 0.8),
+            (EndpointIndexConfig(quantization=Quantization.SQ8), 0.9),
+            (
+                EndpointIndexConfig(
+                    index_type=IndexType.IVF,
+                    quantization=Quantization.PQ,
+                    pq_subquantizers=8,
+                ),
+                0.5,
+            ),
+        ],
+    )
+    def test_recall_against_flat(self, config, min_recall):
+        """Test approximate indexes find most of the exact nearest neighbors"""
+        vectors = _clustered_vectors(2000, 32)
+        queries = _clustered_vectors(50, 32, seed=1)
+        _, exact = build_faiss_index(vectors, EndpointIndexConfig()).search(queries, 5)
+
+        _, approximate = build_faiss_index(vectors, config).search(queries, 5)
+
+        recall = np.mean([len(set(a) & set(e)) / 5 for a, e in zip(approximate, exact)])
+        assert recall >= min_recall
+
+    @pytest.mark.parametrize("index_type", [IndexType.HNSW, IndexType.IVF])
+    def test_artifact_round_trip(self, source_store, tmp_path, index_type):
+        """Test an approximate artifact loads memory-mapped and matches the source store"""
+        config = EndpointIndexConfig(index_type=index_type, hnsw_ef_search=16, ivf_nprobe=4)
+        build_endpoint_index(source_store, tmp_path, config)
+
+        store = PrebuiltEndpointVectorStore(
+            source_store.client, source_store.registry, source_store.embeddings, tmp_path
+        )
+
+        assert read_index_metadata(tmp_path).index_config == config
+        index = faiss.downcast_index(store.vector_store.index)
+        if index_type == IndexType.HNSW:
+            assert index.hnsw.efSearch == 16
+        else:
+            assert index.nprobe == 4
+        query = "latest stock price quote"
+        expected = [r.name for r in source_store.search(query, k=3, threshold=0)]
+        assert [r.name for r in store.search(query, k=3, threshold=0)] == expected
+
+    def test_apply_to_runtime_store(self, tmp_path):
+        """Test a runtime store keeps searching and adding endpoints on an HNSW index"""
+        client = FMPDataClient(api_key="test")
+        registry, _ = setup_registry(client)
+        store = EndpointVectorStore(
+            client, registry, DeterministicFakeEmbedding(size=32), cache_dir=str(tmp_path)
+        )
+        store.add_endpoints(ENDPOINTS)
+
+        index = apply_index_config(store, EndpointIndexConfig(index_type=IndexType.HNSW))
+        store.add_endpoints(["get_market_cap"])
+
+        assert isinstance(faiss.downcast_index(index), faiss.IndexHNSWFlat)
+        assert index.ntotal == len(ENDPOINTS) + 1
+        assert {r.name for r in store.search("quote", k=5, threshold=0)} == {
+            *ENDPOINTS,
+            "get_market_cap",
+        }
+
+
+class TestIndexLoadingInTool:
+    """Test suite for FMPDataTool loading a prebuilt index"""
+
+    def test_tool_loads_prebuilt_index(self, monkeypatch):
+        """Test FMPDataTool uses the prebuilt index when one is given"""
+        monkeypatch.setenv("FMP_API_KEY", "test_fmp_key")
+        monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
+
+        with (
+            patch("langchain_fmp_data.tools.load_vector_store") as mock_load,
+            patch("langchain_fmp_data.tools.create_vector_store") as mock_create,
+            patch("langchain_fmp_data.tools.ChatOpenAI"),
+        ):
+            tool = FMPDataTool(endpoint_index_dir="/opt/index")
+
+            assert tool.vector_store is mock_load.return_value
+            assert mock_load.call_args.kwargs["index_dir"] == "/opt/index"
+            mock_create.assert_not_called()
+
+
+class TestCli:
+    """Test suite for the command line interface"""
+
+    def test_build_index_command(self, source_store, tmp_path):
+        """Test build-index rebuilds the store and writes the artifact"""
+        with patch("fmp_data.lc.create_vector_store", return_value=source_store) as mock_create:
+            exit_code = cli.main(["build-index", "--output", str(tmp_path)])
+
+        assert exit_code == 0
+        assert mock_create.call_args.kwargs["force_create"] is True
+        assert index_exists(tmp_path)
+
+    def test_build_index_command_with_index_type(self, source_store, tmp_path):
+        """Test build-index writes the requested index type and quantization"""
+        with patch("fmp_data.lc.create_vector_store", return_value=source_store):
+            exit_code = cli.main(
+                ["build-index", "--output", str(tmp_path), "--index-type", "hnsw"]
+                + ["--quantization", "sq8"]
+            )
+
+        assert exit_code == 0
+        index_config = read_index_metadata(tmp_path).index_config
+        assert (index_config.index_type, index_config.quantization) == ("hnsw", "sq8")
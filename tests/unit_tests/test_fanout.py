@@ -0,0 +1,168 @@
+"""Unit tests for fanout module"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph import START, MessagesState, StateGraph
+
+from langchain_fmp_data.fanout import EntityFanOut, SubQuery
+from langchain_fmp_data.tools import FMPDataTool, ResponseFormat
+
+
+def _per_ticker_workflow(*args, **kwargs):
+    """Workflow fetching one quote for the ticker its question is about."""
+
+    def agent(state):
+        question = [m for m in state["messages"] if isinstance(m, HumanMessage)][-1].content
+        if "failing" in question and "MSFT only" in question:
+            raise ValueError("quote unavailable")
+        ticker = question.split("Answer for ")[-1].split(" ")[0]
+        return {
+            "messages": [
+                AIMessage(
+                    content="",
+                    tool_calls=[{"name": "get_quote", "args": {"symbol": ticker}, "id": ticker}],
+                ),
+                ToolMessage(
+                    content=f'{{"status": "success", "data": {{"symbol": "{ticker}"}}}}',
+                    name="get_quote",
+                    tool_call_id=ticker,
+                ),
+                AIMessage(content=f"{ticker} margin is 30%"),
+            ]
+        }
+
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("agent", agent)
+    workflow.add_edge(START, "agent")
+    return workflow
+
+
+class TestEntityFanOut:
+    """Test suite for EntityFanOut"""
+
+    @pytest.mark.parametrize(
+        "query,entities",
+        [
+            ("Compare margins of AAPL, MSFT, GOOGL and AMZN", ["AAPL", "MSFT", "GOOGL", "AMZN"]),
+            ("AAPL vs MSFT revenue growth", ["AAPL", "MSFT"]),
+            ("What is the price of AAPL?", []),
+            ("Correlation between AAPL and MSFT returns", []),
+        ],
+    )
+    def test_decompose(self, query, entities):
+        """Test only comparisons over several tickers are split"""
+        sub_queries = EntityFanOut().decompose(query)
+
+        assert [sub.entity for sub in sub_queries] == entities
+        for sub in sub_queries:
+            assert query in sub.query and f"{sub.entity} only" in sub.query
+
+    def test_entity_limit(self):
+        """Test queries over more tickers than the limit are not split"""
+        assert EntityFanOut(max_entities=2).decompose("Compare AAPL, MSFT and GOOGL") == []
+
+    def test_invalid_bounds(self):
+        """Test inconsistent bounds are rejected"""
+        with pytest.raises(ValueError):
+            EntityFanOut(min_entities=3, max_entities=2)
+
+    def test_runs_concurrently_within_limit(self):
+        """Test sub-queries overlap up to the concurrency limit"""
+        fan_out = EntityFanOut(max_concurrency=2)
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def answer(sub):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return sub.entity, []
+
+        sub_queries = [SubQuery(entity=t, query=t) for t in ["A", "B", "C", "D"]]
+        start = time.perf_counter()
+        results = fan_out.run(sub_queries, answer)
+        elapsed = time.perf_counter() - start
+        fan_out.close()
+
+        assert [r.answer for r in results] == ["A", "B", "C", "D"]
+        assert peak == 2
+        assert elapsed < 0.19
+
+    def test_failures_are_isolated(self):
+        """Test a failing sub-query is recorded without failing the others"""
+
+        def answer(sub):
+            if sub.entity == "B":
+                raise ValueError("boom")
+            return "ok", [{"tool": "get_quote"}]
+
+        results = EntityFanOut().run(
+            [SubQuery(entity="A", query="A"), SubQuery(entity="B", query="B")], answer
+        )
+
+        assert results[0].answer == "ok" and results[0].error is None
+        assert results[1].error == "boom"
+        messages = EntityFanOut.synthesis_messages("Compare A and B", results)
+        assert "No data: boom" in messages[-1].content
+
+
+class TestFMPDataToolFanOut:
+    """Test suite for fan-out in FMPDataTool"""
+
+    @pytest.fixture
+    def tool(self, monkeypatch):
+        """FMPDataTool fanning out over a per-ticker workflow."""
+        monkeypatch.setenv("FMP_API_KEY", "test_fmp_key")
+        monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
+        llm = MagicMock()
+        llm.invoke.return_value = AIMessage(content="AAPL and MSFT both earn 30%.")
+        with (
+            patch("langchain_fmp_data.tools.create_vector_store"),
+            patch("langchain_fmp_data.tools.ChatOpenAI", return_value=llm),
+            patch(
+                "langchain_fmp_data.tools.create_fmp_data_workflow",
+                side_effect=_per_ticker_workflow,
+            ),
+        ):
+            yield FMPDataTool(fan_out=EntityFanOut())
+
+    def test_synthesized_answer(self, tool):
+        """Test each ticker runs its own sub-agent and one call merges them"""
+        answer = tool.invoke({"query": "Compare margins of AAPL and MSFT"})
+
+        assert answer == "AAPL and MSFT both earn 30%."
+        prompt = tool.llm.invoke.call_args[0][0][-1].content
+        assert "## AAPL\nAAPL margin is 30%" in prompt
+        assert "## MSFT\nMSFT margin is 30%" in prompt
+        assert len(tool.sessions) == 0
+
+    def test_data_structure_merges_results(self, tool):
+        """Test structured output merges sub-agent tool results without synthesis"""
+        data = tool.invoke(
+            {
+                "query": "Compare failing margins of AAPL and MSFT",
+                "response_format": ResponseFormat.DATA_STRUCTURE,
+            }
+        )
+
+        assert [r["args"]["symbol"] for r in data["results"]] == ["AAPL"]
+        assert data["errors"] == {"MSFT": "quote unavailable"}
+        tool.llm.invoke.assert_not_called()
+
+    def test_turn_recorded_in_thread(self, tool):
+        """Test a fanned-out answer becomes part of the conversation"""
+        tool.invoke({"query": "Compare margins of AAPL and MSFT", "thread_id": "t1"})
+
+        state = tool.get_agent().get_state({"configurable": {"thread_id": "t1"}})
+        messages = state.values["messages"]
+        assert messages[-2].content == "Compare margins of AAPL and MSFT"
+        assert messages[-1].content == "AAPL and MSFT both earn 30%."
@@ -0,0 +1,162 @@
+"""Unit tests for fast_path module"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.tools import StructuredTool
+
+from langchain_fmp_data.fast_path import FastPathMatcher, SymbolTable
+from langchain_fmp_data.tools import FMPDataTool, ResponseFormat
+
+QUOTE = {
+    "status": "success",
+    "data": {
+        "symbol": "AAPL",
+        "price": 189.5,
+        "change_percentage": 1.25,
+        "day_low": 187.0,
+        "day_high": 190.25,
+    },
+}
+INCOME = {
+    "status": "success",
+    "data": [
+        {
+            "date": "2023-09-30T00:00:00",
+            "symbol": "MSFT",
+            "fiscal_year": "2023",
+            "period": "FY",
+            "reported_currency": "USD",
+            "revenue": 211915000000.0,
+            "gross_profit": 146052000000.0,
+            "operating_income": 88523000000.0,
+            "net_income": 72361000000.0,
+            "eps_diluted": 9.68,
+        }
+    ],
+}
+
+
+def _tool(name, result):
+    return StructuredTool.from_function(func=lambda **kwargs: result, name=name, description=name)
+
+
+class TestFastPathMatcher:
+    """Test suite for FastPathMatcher"""
+
+    @pytest.fixture
+    def matcher(self):
+        """Matcher knowing two companies by name."""
+        return FastPathMatcher(
+            symbols=SymbolTable.from_rows(
+                [
+                    {"symbol": "AAPL", "name": "Apple Inc."},
+                    {"symbol": "MSFT", "name": "Microsoft Corporation"},
+                ]
+            )
+        )
+
+    @pytest.mark.parametrize(
+        "query, rule, args",
+        [
+            ("price of AAPL", "quote", {"symbol": "AAPL"}),
+            ("What's the current stock price of Apple?", "quote", {"symbol": "AAPL"}),
+            ("msft market cap", "market_cap", {"symbol": "MSFT"}),
+            ("Apple’s market capitalization", "market_cap", {"symbol": "AAPL"}),
+            (
+                "latest income statement for Microsoft",
+                "income_statement",
+                {"period": "annual", "limit": 1, "symbol": "MSFT"},
+            ),
+            (
+                "AAPL quarterly income statement",
+                "quarterly_income_statement",
+                {"period": "quarter", "limit": 1, "symbol": "AAPL"},
+            ),
+        ],
+    )
+    def test_templated_queries_match(self, matcher, query, rule, args):
+        """Test templated queries resolve to a rule and tool arguments"""
+        found = matcher.match(query)
+
+        assert found is not None
+        assert (found.rule.name, found.args) == (rule, args)
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "What was the price of AAPL in 2020?",
+            "price of apple pie",
+            "price of TSLA",
+            "Compare AAPL and MSFT market caps",
+        ],
+    )
+    def test_other_queries_fall_through(self, matcher, query):
+        """Test open-ended queries and unknown companies are left to the agent"""
+        assert matcher.match(query) is None
+
+    def test_answer_formats_first_row(self, matcher):
+        """Test the rule's template is filled from the tool result"""
+        tools = {"get_income_statement": _tool("get_income_statement", INCOME)}
+
+        answer = matcher.answer("Microsoft income statement", tools.get)
+
+        assert answer is not None
+        assert answer.text == (
+            "MSFT income statement for fiscal year 2023 (ended 2023-09-30), in USD: "
+            "revenue 211,915,000,000, gross profit 146,052,000,000, operating income "
+            "88,523,000,000, net income 72,361,000,000, diluted EPS 9.68."
+        )
+        assert answer.result == INCOME
+
+    def test_unusable_results_fall_through(self, matcher):
+        """Test errors and results missing templated fields go to the agent"""
+        error = {"status": "error", "error_type": "HTTPError", "message": "quota"}
+        partial = {"status": "success", "data": {"symbol": "AAPL", "price": None}}
+
+        assert matcher.answer("price of AAPL", {"get_quote": _tool("get_quote", error)}.get) is None
+        assert (
+            matcher.answer("price of AAPL", {"get_quote": _tool("get_quote", partial)}.get) is None
+        )
+        assert matcher.answer("price of AAPL", {}.get) is None
+
+
+class TestFastPathInTool:
+    """Test suite for FMPDataTool with a fast path"""
+
+    @pytest.fixture
+    def tool(self, monkeypatch):
+        """FMPDataTool whose endpoint catalog only serves get_quote."""
+        monkeypatch.setenv("FMP_API_KEY", "test_fmp_key")
+        monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
+        info = MagicMock()
+        info.semantics.deprecated = False
+        info.semantics.method_name = "get_quote"
+        with (
+            patch("langchain_fmp_data.tools.create_vector_store") as mock_create_vs,
+            patch("langchain_fmp_data.tools.ChatOpenAI"),
+        ):
+            vector_store = mock_create_vs.return_value
+            vector_store.registry.list_endpoints.return_value = {"get_quote": info}
+            vector_store.registry.get_endpoint.return_value = info
+            vector_store.create_tool.return_value = _tool("get_quote", QUOTE)
+            yield FMPDataTool(fast_path=FastPathMatcher())
+
+    def test_match_skips_agent(self, tool):
+        """Test a templated query is answered without building the workflow"""
+        with patch("langchain_fmp_data.tools.create_fmp_data_workflow") as mock_workflow:
+            text = tool.invoke({"query": "AAPL price"})
+            data = tool._run("AAPL price", response_format=ResponseFormat.DATA_STRUCTURE)
+
+        mock_workflow.assert_not_called()
+        assert text == "AAPL is trading at 189.50, +1.25% on the day (range 187.00 to 190.25)."
+        assert data["results"][0]["args"] == {"symbol": "AAPL"}
+        assert data["results"][0]["result"] == QUOTE
+
+    def test_miss_runs_agent(self, tool):
+        """Test other queries go through the agent workflow"""
+        with patch("langchain_fmp_data.tools.create_fmp_data_workflow") as mock_workflow:
+            agent = mock_workflow.return_value.compile.return_value
+            agent.invoke.return_value = {"messages": [MagicMock(content="AAPL beat estimates")]}
+
+            assert tool.invoke({"query": "Did AAPL beat estimates?"}) == "AAPL beat estimates"
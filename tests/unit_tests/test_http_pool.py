@@ -0,0 +1,133 @@
+"""Unit tests for http_pool module"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+from fmp_data import FMPDataClient
+from fmp_data.config import ClientConfig
+
+from langchain_fmp_data.http_pool import (
+    HTTPPoolConfig,
+    SharedHTTPPool,
+    attach_http_pool,
+    get_shared_http_pool,
+)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small JSON body over a keep-alive connection."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        self.server.client_ports.add(self.client_address[1])
+        body = b'[{"symbol": "AAPL", "price": 150}]'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Local HTTP server that records the client port of every request."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.client_ports = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _fmp_client(server):
+    host, port = server.server_address
+    return FMPDataClient(config=ClientConfig(api_key="test", base_url=f"http://{host}:{port}"))
+
+
+@pytest.mark.enable_socket
+class TestSharedHTTPPool:
+    """Test suite for SharedHTTPPool against a local stub server"""
+
+    def test_clients_share_keepalive_connection(self, stub_server):
+        """Test separate fmp_data clients reuse one pooled connection"""
+        pool = SharedHTTPPool(HTTPPoolConfig(max_connections=4))
+        clients = [_fmp_client(stub_server) for _ in range(3)]
+        for client in clients:
+            assert pool.attach(client)
+
+        for client in clients * 2:
+            response = client.client.get(f"{client.config.base_url}/quote")
+            assert response.json()[0]["symbol"] == "AAPL"
+
+        assert len(stub_server.client_ports) == 1
+        pool.close()
+
+    def test_closing_one_client_keeps_pool_open(self, stub_server):
+        """Test a closed fmp_data client does not close the shared transport"""
+        pool = SharedHTTPPool()
+        first, second = _fmp_client(stub_server), _fmp_client(stub_server)
+        pool.attach(first)
+        pool.attach(second)
+
+        first.close()
+        response = second.client.get(f"{second.config.base_url}/quote")
+
+        assert response.status_code == 200
+        pool.close()
+
+    def test_async_clients_share_pool(self, stub_server):
+        """Test the async variant also reuses pooled connections"""
+        pool = SharedHTTPPool()
+        clients = [_fmp_client(stub_server) for _ in range(2)]
+        for client in clients:
+            pool.attach(client)
+
+        async def fetch_all():
+            for client in clients * 2:
+                async_client = client._setup_async_client()
+                response = await async_client.get(f"{client.config.base_url}/quote")
+                assert response.status_code == 200
+            await pool.aclose()
+
+        asyncio.run(fetch_all())
+
+        assert len(stub_server.client_ports) == 1
+
+    def test_attach_preserves_client_settings(self, stub_server):
+        """Test headers, timeouts and event hooks are kept on attach"""
+        pool = SharedHTTPPool()
+        client = _fmp_client(stub_server)
+        private = client.client
+
+        pool.attach(client)
+
+        assert client.client is not private
+        assert private.is_closed
+        assert client.client.headers == private.headers
+        assert client.client.timeout == private.timeout
+        assert client.client.event_hooks == private.event_hooks
+        assert pool.attach(client)  # attaching twice is a no-op
+        pool.close()
+
+
+class TestSharedPoolRegistry:
+    """Test suite for process-wide pool lookup"""
+
+    def test_same_config_returns_same_pool(self):
+        """Test pools are shared per configuration"""
+        assert get_shared_http_pool() is get_shared_http_pool(HTTPPoolConfig())
+        assert get_shared_http_pool(HTTPPoolConfig(max_connections=5)) is not (
+            get_shared_http_pool()
+        )
+
+    def test_attach_skips_non_httpx_clients(self):
+        """Test stores without an httpx-backed client are left alone"""
+        assert attach_http_pool(MagicMock()) is False
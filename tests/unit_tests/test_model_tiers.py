@@ -0,0 +1,110 @@
+"""Unit tests for model_tiers module"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import StructuredTool
+
+from langchain_fmp_data.agent import create_fmp_data_workflow
+from langchain_fmp_data.model_tiers import ModelRouter
+
+
+class FakeToolModel(FakeMessagesListChatModel):
+    """Fake chat model replaying responses, with tools bound as a no-op."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+class FailingModel(FakeToolModel):
+    """Fake chat model whose calls fail."""
+
+    def _generate(self, *args, **kwargs):
+        raise TimeoutError("fast model timed out")
+
+
+def _call(name, call_id):
+    return AIMessage(
+        content="", tool_calls=[{"name": name, "args": {"symbol": "AAPL"}, "id": call_id}]
+    )
+
+
+def _agent(main, router):
+    """Workflow over one quote tool, routed between the two models."""
+    quote = StructuredTool.from_function(
+        func=lambda symbol: {"status": "success", "data": {"price": 150.0}},
+        name="get_quote",
+        description="Quote",
+    )
+    info = MagicMock()
+    info.semantics.deprecated = False
+    info.semantics.method_name = "get_quote"
+    vector_store = MagicMock()
+    vector_store.registry.list_endpoints.return_value = {"get_quote": info}
+    vector_store.registry.get_endpoint.return_value = info
+    vector_store.create_tool.return_value = quote
+    vector_store.get_tools.return_value = [quote]
+    return create_fmp_data_workflow(vector_store, main, model_router=router).compile()
+
+
+def _run(agent):
+    return agent.invoke({"messages": [HumanMessage(content="AAPL price?")]})["messages"]
+
+
+class TestModelRouter:
+    """Test suite for ModelRouter in the agent workflow"""
+
+    def test_tool_steps_fast_answer_main(self):
+        """Test tool calls come from the fast model and the answer from the main one"""
+        fast = FakeToolModel(responses=[_call("get_quote", "c1"), AIMessage(content="draft")])
+        main = FakeToolModel(responses=[AIMessage(content="AAPL trades at 150.")])
+        router = ModelRouter(fast)
+
+        messages = _run(_agent(main, router))
+
+        assert messages[1].tool_calls[0]["name"] == "get_quote"
+        assert messages[-1].content == "AAPL trades at 150."
+        stats = router.stats.snapshot()
+        assert (stats["fast"]["calls"], stats["main"]["calls"]) == (2, 1)
+        assert stats["escalations"] == 1
+        assert stats["main"]["mean_seconds"] >= 0.0
+
+    def test_fast_answers_kept_without_escalation(self):
+        """Test the fast model's answer is used when escalation is off"""
+        fast = FakeToolModel(responses=[_call("get_quote", "c1"), AIMessage(content="150")])
+        main = FakeToolModel(responses=[AIMessage(content="unused")])
+        router = ModelRouter(fast, escalate_answers=False)
+
+        assert _run(_agent(main, router))[-1].content == "150"
+        assert router.stats.snapshot()["main"]["calls"] == 0
+
+    @pytest.mark.parametrize(
+        "fast",
+        [
+            FailingModel(responses=[AIMessage(content="")]),
+            FakeToolModel(responses=[_call("get_unknown", "c1")]),
+        ],
+        ids=["failure", "unknown_tool"],
+    )
+    def test_fallback_to_main_model(self, fast):
+        """Test failed or invalid fast steps are taken by the main model"""
+        main = FakeToolModel(responses=[_call("get_quote", "c1"), AIMessage(content="done")])
+        router = ModelRouter(fast, escalate_answers=False)
+
+        messages = _run(_agent(main, router))
+
+        assert messages[1].tool_calls[0]["name"] == "get_quote"
+        assert router.stats.snapshot()["fallbacks"] >= 1
+
+    def test_max_fast_steps(self):
+        """Test steps beyond the fast step limit go straight to the main model"""
+        fast = FakeToolModel(responses=[_call("get_quote", "c1")])
+        main = FakeToolModel(responses=[AIMessage(content="done")])
+        router = ModelRouter(fast, max_fast_steps=1)
+
+        assert _run(_agent(main, router))[-1].content == "done"
+        stats = router.stats.snapshot()
+        assert (stats["fast"]["calls"], stats["main"]["calls"]) == (1, 1)
+        assert stats["escalations"] == 0
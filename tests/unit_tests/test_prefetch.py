@@ -0,0 +1,158 @@
+"""Unit tests for prefetch module"""
+
+import threading
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import BaseTool
+
+from langchain_fmp_data.agent import BasicToolNode, create_fmp_data_workflow
+from langchain_fmp_data.prefetch import SpeculativePrefetcher, ToolResultCache
+from langchain_fmp_data.symbols import extract_tickers
+
+
+def _mock_tool(name, result):
+    tool = MagicMock(spec=BaseTool)
+    tool.name = name
+    tool.invoke.return_value = result
+    return tool
+
+
+def _done(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class TestExtractTickers:
+    """Test suite for extract_tickers"""
+
+    def test_extracts_symbols_in_order(self):
+        """Test tickers are extracted in order of appearance without duplicates"""
+        query = "Compare AAPL, $MSFT and BRK.B with AAPL"
+        assert extract_tickers(query) == ["AAPL", "MSFT", "BRK.B"]
+
+    def test_ignores_common_abbreviations(self):
+        """Test financial abbreviations are not mistaken for tickers"""
+        assert extract_tickers("What is the EPS and PE of the US market?") == []
+        assert extract_tickers("what is apple's price") == []
+
+
+class TestToolResultCache:
+    """Test suite for ToolResultCache"""
+
+    def test_key_ignores_unset_arguments(self):
+        """Test lookups match regardless of None-valued arguments"""
+        cache = ToolResultCache()
+        future = _done({"price": 1})
+        cache.put("get_quote", {"symbol": "AAPL"}, future)
+
+        assert cache.get("get_quote", {"symbol": "AAPL", "limit": None}) is future
+        assert cache.get("get_quote", {"symbol": "MSFT"}) is None
+
+    def test_entries_expire(self):
+        """Test entries are dropped after their TTL"""
+        cache = ToolResultCache(ttl=-1)
+        cache.put("get_quote", {"symbol": "AAPL"}, _done({}))
+
+        assert cache.get("get_quote", {"symbol": "AAPL"}) is None
+        assert len(cache) == 0
+
+
+class TestSpeculativePrefetcher:
+    """Test suite for SpeculativePrefetcher"""
+
+    def test_plan_uses_intent_and_toolset(self):
+        """Test predicted calls follow the query intent and the bound toolset"""
+        prefetcher = SpeculativePrefetcher()
+
+        plan = prefetcher.plan("What is the price of AAPL and MSFT?", ["get_quote"])
+        assert plan == [("get_quote", {"symbol": "AAPL"}), ("get_quote", {"symbol": "MSFT"})]
+
+        # Tools that were not retrieved for the query are never prefetched
+        assert prefetcher.plan("What is the price of AAPL?", ["get_profile"]) == []
+        assert prefetcher.plan("What is the price of apple?", ["get_quote"]) == []
+
+    def test_prefetch_starts_calls_once(self):
+        """Test prefetch runs each predicted call once and caches the result"""
+        prefetcher = SpeculativePrefetcher()
+        tool = _mock_tool("get_quote", {"price": 150})
+
+        started = prefetcher.prefetch("price of AAPL", ["get_quote"], {"get_quote": tool}.get)
+        again = prefetcher.prefetch("price of AAPL", ["get_quote"], {"get_quote": tool}.get)
+
+        assert (started, again) == (1, 0)
+        assert prefetcher.cache.get("get_quote", {"symbol": "AAPL"}).result() == {"price": 150}
+        tool.invoke.assert_called_once_with({"symbol": "AAPL"})
+        prefetcher.shutdown()
+
+
+class TestPrefetchInToolNode:
+    """Test suite for prefetched results in BasicToolNode"""
+
+    def test_tool_node_uses_prefetched_result(self):
+        """Test the tool node returns a cached result instead of calling the tool"""
+        cache = ToolResultCache()
+        cache.put("get_quote", {"symbol": "AAPL"}, _done({"price": 150}))
+        tool = _mock_tool("get_quote", {"price": 0})
+        node = BasicToolNode([tool], result_cache=cache)
+
+        message = MagicMock()
+        message.tool_calls = [{"name": "get_quote", "args": {"symbol": "AAPL"}, "id": "1"}]
+        result = node({"messages": [message]})
+
+        assert result["messages"][0].content == '{"price": 150}'
+        tool.invoke.assert_not_called()
+
+    def test_tool_node_falls_back_when_prefetch_failed(self):
+        """Test a failed prefetch is retried directly"""
+        cache = ToolResultCache()
+        failed = Future()
+        failed.set_exception(RuntimeError("network"))
+        cache.put("get_quote", {"symbol": "AAPL"}, failed)
+        tool = _mock_tool("get_quote", {"price": 150})
+        node = BasicToolNode([tool], result_cache=cache)
+
+        message = MagicMock()
+        message.tool_calls = [{"name": "get_quote", "args": {"symbol": "AAPL"}, "id": "1"}]
+        result = node({"messages": [message]})
+
+        assert result["messages"][0].content == '{"price": 150}'
+        tool.invoke.assert_called_once()
+
+    def test_prefetch_overlaps_model_call(self):
+        """Test the FMP call starts before the model responds"""
+        fetched = threading.Event()
+        tool = _mock_tool("get_quote", None)
+        tool.invoke.side_effect = lambda args: fetched.set() or {"price": 150}
+
+        def respond(messages):
+            if len(messages) > 1:
+                return AIMessage(content="AAPL trades at 150")
+            # The model is still "thinking" while the prefetch completes
+            assert fetched.wait(timeout=5)
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": "get_quote", "args": {"symbol": "AAPL"}, "id": "1"}],
+            )
+
+        model = MagicMock()
+        model.bind_tools.return_value.invoke.side_effect = respond
+        info = MagicMock()
+        info.semantics.method_name = "get_quote"
+        info.semantics.deprecated = False
+        vector_store = MagicMock()
+        vector_store.registry.list_endpoints.return_value = {"get_quote": info}
+        vector_store.create_tool.return_value = tool
+        vector_store.get_tools.return_value = [
+            {"name": "get_quote", "description": "Quote", "parameters": {}}
+        ]
+        prefetcher = SpeculativePrefetcher()
+
+        agent = create_fmp_data_workflow(vector_store, model, prefetcher=prefetcher).compile()
+        final_state = agent.invoke({"messages": [HumanMessage(content="price of AAPL")]})
+
+        assert final_state["messages"][-1].content == "AAPL trades at 150"
+        tool.invoke.assert_called_once_with({"symbol": "AAPL"})
+        prefetcher.shutdown()
@@ -0,0 +1,169 @@
+"""Unit tests for price_store module"""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+from fmp_data import FMPDataClient
+from fmp_data.company.models import HistoricalData, HistoricalPrice
+from fmp_data.lc import setup_registry
+from fmp_data.lc.vector_store import EndpointVectorStore
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from langchain_fmp_data.agent import endpoint_tool_factories
+from langchain_fmp_data.price_store import PriceStore
+
+
+def _prices(self, symbol, from_date=None, to_date=None):
+    """Fake client method returning one bar per weekday of the range."""
+    from_date = from_date or date(2024, 1, 1)
+    to_date = to_date or date(2024, 1, 31)
+    days = [from_date + timedelta(days=i) for i in range((to_date - from_date).days + 1)]
+    bars = [
+        HistoricalPrice.model_validate(
+            {
+                "date": day.isoformat(),
+                "open": 100.0,
+                "high": 101.0,
+                "low": 99.0,
+                "close": 100.0 + day.day,
+                "volume": 1000 + day.day,
+            }
+        )
+        for day in reversed(days)
+        if day.weekday() < 5
+    ]
+    return HistoricalData(symbol=symbol, historical=bars)
+
+
+@pytest.fixture
+def price_tool(tmp_path):
+    """Historical price tool backed by a price store and a fake client."""
+    client = FMPDataClient(api_key="test")
+    registry, _ = setup_registry(client)
+    store = EndpointVectorStore(
+        client, registry, DeterministicFakeEmbedding(size=8), cache_dir=str(tmp_path / "idx")
+    )
+    price_store = PriceStore(tmp_path / "prices")
+    factories = endpoint_tool_factories(store, price_store)
+    with patch.object(
+        type(client.company), "get_historical_prices", autospec=True, side_effect=_prices
+    ) as fetch:
+        yield factories["get_historical_prices"](), fetch, price_store
+
+
+class TestPriceStore:
+    """Test suite for PriceStore"""
+
+    def test_missing_ranges(self, tmp_path):
+        """Test only uncovered parts of a range are reported"""
+        store = PriceStore(tmp_path)
+        store.write("get_historical_prices", "AAPL", [], date(2024, 1, 10), date(2024, 1, 20))
+        store.write("get_historical_prices", "AAPL", [], date(2024, 1, 21), date(2024, 1, 25))
+
+        assert store.coverage("get_historical_prices", "aapl") == [
+            (date(2024, 1, 10), date(2024, 1, 25))
+        ]
+        assert store.missing_ranges(
+            "get_historical_prices", "AAPL", date(2024, 1, 1), date(2024, 1, 31)
+        ) == [(date(2024, 1, 1), date(2024, 1, 9)), (date(2024, 1, 26), date(2024, 1, 31))]
+        assert (
+            store.missing_ranges(
+                "get_historical_prices", "AAPL", date(2024, 1, 12), date(2024, 1, 15)
+            )
+            == []
+        )
+
+    def test_today_is_not_covered(self, tmp_path):
+        """Test the current day is stored but fetched again next time"""
+        store = PriceStore(tmp_path)
+        today = date.today()
+        start = today - timedelta(days=5)
+        store.write("get_historical_prices", "AAPL", [{"date": today, "close": 1.0}], start, today)
+
+        assert store.missing_ranges("get_historical_prices", "AAPL", start, today) == [
+            (today, today)
+        ]
+        assert len(store.read("get_historical_prices", "AAPL", today, today)) == 1
+
+    def test_rows_merge_by_date(self, tmp_path):
+        """Test newer rows replace stored days and values keep their types"""
+        store = PriceStore(tmp_path)
+        first = [
+            {"date": "2024-01-02T00:00:00", "close": 10.0, "volume": 5},
+            {"date": "2024-01-03T00:00:00", "close": 11.0, "volume": 6},
+        ]
+        second = [{"date": "2024-01-03", "close": 12.0, "volume": 7, "vwap": None}]
+        store.write("get_historical_prices", "AAPL", first, date(2024, 1, 2), date(2024, 1, 3))
+        store.write("get_historical_prices", "AAPL", second, date(2024, 1, 3), date(2024, 1, 3))
+
+        rows = store.read("get_historical_prices", "AAPL", date(2024, 1, 1), date(2024, 1, 31))
+
+        assert rows == [
+            {"date": "2024-01-03", "close": 12.0, "volume": 7},
+            {"date": "2024-01-02", "close": 10.0, "volume": 5},
+        ]
+
+
+class TestCachedPriceHistory:
+    """Test suite for historical price tools backed by a PriceStore"""
+
+    def test_overlapping_ranges_fetch_only_missing_days(self, price_tool):
+        """Test repeated and overlapping requests only fetch new date ranges"""
+        tool, fetch, _ = price_tool
+
+        first = tool.invoke(
+            {"symbol": "AAPL", "start_date": "2024-01-01", "end_date": "2024-01-31"}
+        )
+        again = tool.invoke(
+            {"symbol": "AAPL", "start_date": "2024-01-08", "end_date": "2024-01-12"}
+        )
+        wider = tool.invoke(
+            {"symbol": "AAPL", "start_date": "2024-01-15", "end_date": "2024-02-09"}
+        )
+
+        assert [(c.kwargs["from_date"], c.kwargs["to_date"]) for c in fetch.call_args_list] == [
+            (date(2024, 1, 1), date(2024, 1, 31)),
+            (date(2024, 2, 1), date(2024, 2, 9)),
+        ]
+        assert len(first["data"]["historical"]) == 23
+        assert [row["date"] for row in again["data"]["historical"]] == [
+            "2024-01-12",
+            "2024-01-11",
+            "2024-01-10",
+            "2024-01-09",
+            "2024-01-08",
+        ]
+        assert wider["data"]["historical"][0] == {
+            "date": "2024-02-09",
+            "open": 100.0,
+            "high": 101.0,
+            "low": 99.0,
+            "close": 109.0,
+            "volume": 1009,
+        }
+
+    def test_open_start_passes_through_and_stores(self, price_tool):
+        """Test requests without a start date reach FMP and fill the store"""
+        tool, fetch, price_store = price_tool
+
+        result = tool.invoke({"symbol": "MSFT", "end_date": "2024-01-31"})
+        tool.invoke({"symbol": "MSFT", "start_date": "2024-01-10", "end_date": "2024-01-20"})
+
+        assert fetch.call_count == 1
+        assert len(result["data"]["historical"]) == 23
+        assert price_store.coverage("get_historical_prices", "MSFT") == [
+            (date(2024, 1, 1), date(2024, 1, 31))
+        ]
+
+    def test_errors_are_not_stored(self, price_tool):
+        """Test an error result is returned as is and nothing is marked fetched"""
+        tool, fetch, price_store = price_tool
+        fetch.side_effect = RuntimeError("quota exceeded")
+
+        result = tool.invoke(
+            {"symbol": "AAPL", "start_date": "2024-01-01", "end_date": "2024-01-31"}
+        )
+
+        assert result["status"] == "error"
+        assert price_store.coverage("get_historical_prices", "AAPL") == []
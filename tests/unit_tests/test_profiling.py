@@ -0,0 +1,143 @@
+"""Unit tests for profiling module"""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from langchain_fmp_data.profiling import ProfilingConfig, QueryProfiler, profile_phase
+from langchain_fmp_data.tools import FMPDataTool
+
+
+def _workflow(*args, **kwargs):
+    """Workflow making one slow stub tool call before answering."""
+
+    def agent(state):
+        if isinstance(state["messages"][-1], HumanMessage):
+            call = {"name": "get_quote", "args": {"symbol": "AAPL"}, "id": "c1"}
+            return {"messages": [AIMessage(content="", tool_calls=[call])]}
+        return {"messages": [AIMessage(content="AAPL trades at 150.")]}
+
+    def tools(state):
+        time.sleep(0.02)
+        payload = [{"price": 150.0}] * 1000
+        return {"messages": [ToolMessage(content=json.dumps(payload), tool_call_id="c1")]}
+
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("agent", agent)
+    workflow.add_node("tools", tools)
+    workflow.add_edge(START, "agent")
+    workflow.add_conditional_edges(
+        "agent", lambda state: "tools" if state["messages"][-1].tool_calls else END
+    )
+    workflow.add_edge("tools", "agent")
+    return workflow
+
+
+def _reports(path):
+    return [json.loads(p.read_text()) for p in sorted(path.glob("*.json"))]
+
+
+class TestQueryProfiler:
+    """Test suite for QueryProfiler"""
+
+    def test_sampled_query_writes_profiles(self, tmp_path):
+        """Test a sampled query is written with node timings, CPU profile and allocations"""
+        profiler = QueryProfiler(ProfilingConfig(sample_rate=1.0, output_dir=str(tmp_path)))
+        graph = _workflow().compile()
+
+        with profiler.capture("Price of AAPL", "user/42") as profile:
+            graph.invoke(
+                {"messages": [HumanMessage(content="Price of AAPL")]},
+                {"callbacks": profile.callbacks},
+            )
+            with profile_phase("format_response"):
+                pass
+
+        [report] = _reports(tmp_path)
+        assert (report["thread_id"], report["reason"]) == ("user/42", "sampled")
+        assert [t["name"] for t in report["timings"]] == [
+            "agent",
+            "tools",
+            "agent",
+            "format_response",
+        ]
+        assert report["node_seconds"]["tools"] >= 0.02
+        assert report["cpu_top"] and (tmp_path / report["profile_file"]).is_file()
+        assert report["memory"]["peak_bytes"] > 0
+        assert "-user_42-" in report["profile_file"]
+
+    def test_only_slow_queries_written(self, tmp_path):
+        """Test unsampled queries are written with timings only when slow"""
+        profiler = QueryProfiler(
+            ProfilingConfig(sample_rate=0.0, slow_query_seconds=0.05, output_dir=str(tmp_path))
+        )
+
+        with profiler.capture("fast", "a"):
+            pass
+        with profiler.capture("slow", "b"):
+            time.sleep(0.06)
+
+        [report] = _reports(tmp_path)
+        assert (report["query"], report["reason"]) == ("slow", "slow")
+        assert report["profile_file"] is None and report["memory"] is None
+        assert not list(tmp_path.glob("*.prof"))
+        assert profiler.written == 1
+
+    def test_concurrent_queries_share_one_profiler(self, tmp_path):
+        """Test overlapping queries are both reported, with one CPU profile"""
+        profiler = QueryProfiler(ProfilingConfig(sample_rate=1.0, output_dir=str(tmp_path)))
+        barrier = threading.Barrier(2)
+
+        def query(thread_id):
+            with profiler.capture("q", thread_id):
+                barrier.wait()
+                barrier.wait()
+
+        threads = [threading.Thread(target=query, args=(t,)) for t in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(_reports(tmp_path)) == 2
+        assert len(list(tmp_path.glob("*.prof"))) == 1
+
+    def test_errors_are_reported_and_raised(self, tmp_path):
+        """Test a failing query is written with its error and the error propagates"""
+        profiler = QueryProfiler(ProfilingConfig(sample_rate=1.0, output_dir=str(tmp_path)))
+
+        with pytest.raises(RuntimeError):
+            with profiler.capture("q", "a"):
+                raise RuntimeError("model unavailable")
+
+        assert _reports(tmp_path)[0]["error"] == "RuntimeError: model unavailable"
+        with profiler.capture("q", "a"):
+            pass
+        assert _reports(tmp_path)[1]["profile_file"] is not None
+
+
+class TestToolProfiling:
+    """Test suite for profiling in FMPDataTool"""
+
+    def test_tool_query_profiled(self, tmp_path, monkeypatch):
+        """Test FMPDataTool reports node and formatting timings tagged with the thread id"""
+        monkeypatch.setenv("FMP_API_KEY", "test_fmp_key")
+        monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
+        profiler = QueryProfiler(ProfilingConfig(sample_rate=1.0, output_dir=str(tmp_path)))
+        with (
+            patch("langchain_fmp_data.tools.create_vector_store"),
+            patch("langchain_fmp_data.tools.ChatOpenAI"),
+            patch("langchain_fmp_data.tools.create_fmp_data_workflow", side_effect=_workflow),
+        ):
+            tool = FMPDataTool(profiler=profiler)
+            answer = tool.invoke({"query": "Price of AAPL", "thread_id": "t1"})
+
+        [report] = _reports(tmp_path)
+        assert answer == "AAPL trades at 150."
+        assert report["thread_id"] == "t1"
+        assert set(report["node_seconds"]) == {"agent", "tools", "format_response"}
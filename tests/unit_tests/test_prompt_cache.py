@@ -0,0 +1,132 @@
+"""Unit tests for prompt_cache module"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from langchain_fmp_data.agent import create_fmp_data_workflow
+from langchain_fmp_data.prompt_cache import PromptCacheConfig, PromptCacheStats
+from langchain_fmp_data.tool_specs import ToolSpecCatalog
+
+TOOL_NAMES = ["get_quote", "get_profile", "get_market_cap", "get_historical_prices"]
+
+
+def _spec(name):
+    return {"type": "function", "function": {"name": name, "description": name, "parameters": {}}}
+
+
+def _store(ranked_names):
+    """Mock vector store retrieving the given tools in score order."""
+    vector_store = MagicMock()
+    endpoints = {}
+    for name in TOOL_NAMES:
+        info = MagicMock()
+        info.semantics.method_name = name
+        info.semantics.deprecated = False
+        endpoints[name] = info
+    vector_store.registry.list_endpoints.return_value = endpoints
+    vector_store.search.return_value = [
+        MagicMock(info=endpoints[name], score=1.0) for name in ranked_names
+    ]
+    return vector_store
+
+
+def _bound_tool_names(ranked_names, prompt_cache, stats=None):
+    """Run one step of the workflow and return the names of the bound tools."""
+    catalog = ToolSpecCatalog(
+        fmp_data_version="test", specs={name: _spec(name) for name in TOOL_NAMES}
+    )
+    model = MagicMock()
+    model.bind_tools.return_value.invoke.return_value = AIMessage(
+        content="done",
+        usage_metadata={
+            "input_tokens": 2000,
+            "output_tokens": 10,
+            "total_tokens": 2010,
+            "input_token_details": {"cache_read": 1536},
+        },
+    )
+
+    agent = create_fmp_data_workflow(
+        _store(ranked_names),
+        model,
+        tool_specs=catalog,
+        prompt_cache=prompt_cache,
+        prompt_cache_stats=stats,
+    ).compile()
+    agent.invoke({"messages": [HumanMessage(content="price of AAPL")]})
+    return [spec["function"]["name"] for spec in model.bind_tools.call_args.kwargs["tools"]]
+
+
+class TestPromptCacheStats:
+    """Test suite for PromptCacheStats"""
+
+    def test_record_reads_cache_read_tokens(self):
+        """Test cached tokens are read from the usage metadata"""
+        stats = PromptCacheStats()
+        stats.record(
+            AIMessage(
+                content="",
+                usage_metadata={
+                    "input_tokens": 1000,
+                    "output_tokens": 5,
+                    "total_tokens": 1005,
+                    "input_token_details": {"cache_read": 250},
+                },
+            ),
+            seconds=0.5,
+        )
+        stats.record(AIMessage(content=""), seconds=1.5)  # no usage reported
+
+        assert stats.snapshot() == {
+            "calls": 2,
+            "input_tokens": 1000,
+            "cached_tokens": 250,
+            "hit_rate": 0.25,
+            "mean_seconds": 1.0,
+        }
+        assert stats.hit_rate == 0.25
+
+
+class TestPromptCacheWorkflow:
+    """Test suite for cache-friendly tool binding"""
+
+    def test_score_order_kept_by_default(self):
+        """Test tools are bound in retrieval order without a prompt cache config"""
+        ranked = ["get_quote", "get_profile", "get_market_cap"]
+
+        assert _bound_tool_names(ranked, None) == ranked
+
+    def test_canonical_order_is_stable(self):
+        """Test the same toolset is bound identically whatever the scores"""
+        config = PromptCacheConfig()
+
+        first = _bound_tool_names(["get_quote", "get_profile", "get_market_cap"], config)
+        second = _bound_tool_names(["get_market_cap", "get_quote", "get_profile"], config)
+
+        assert first == second == ["get_market_cap", "get_profile", "get_quote"]
+
+    def test_pinned_tools_come_first(self):
+        """Test pinned tools lead the toolset and are not bound twice"""
+        config = PromptCacheConfig(pinned_tools=["get_quote", "get_historical_prices"])
+
+        names = _bound_tool_names(["get_profile", "get_quote"], config)
+
+        assert names == ["get_quote", "get_historical_prices", "get_profile"]
+
+    def test_unknown_pinned_tool(self):
+        """Test pinning a tool missing from the catalog is rejected"""
+        config = PromptCacheConfig(pinned_tools=["get_everything"])
+
+        with pytest.raises(ValueError, match="Unknown pinned tool"):
+            create_fmp_data_workflow(_store([]), MagicMock(), prompt_cache=config)
+
+    def test_stats_recorded_per_model_call(self):
+        """Test every model call is recorded"""
+        stats = PromptCacheStats()
+
+        _bound_tool_names(["get_quote"], PromptCacheConfig(), stats)
+
+        assert stats.calls == 1
+        assert stats.cached_tokens == 1536
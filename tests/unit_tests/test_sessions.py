@@ -0,0 +1,139 @@
+"""Unit tests for sessions module"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import START, MessagesState, StateGraph
+
+from langchain_fmp_data.sessions import SessionManager
+from langchain_fmp_data.tools import FMPDataTool
+
+
+def _echo_workflow(*args, **kwargs):
+    """Workflow answering with the number of questions asked in the thread."""
+
+    def agent(state):
+        questions = [m.content for m in state["messages"] if isinstance(m, HumanMessage)]
+        time.sleep(0.01)
+        return {"messages": [AIMessage(content=f"{len(questions)}: {' | '.join(questions)}")]}
+
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("agent", agent)
+    workflow.add_edge(START, "agent")
+    return workflow
+
+
+class TestSessionManager:
+    """Test suite for SessionManager"""
+
+    def test_idle_sessions_are_evicted(self):
+        """Test conversations idle past the timeout are deleted from the checkpointer"""
+        sessions = SessionManager(idle_timeout=60)
+        with patch("langchain_fmp_data.sessions.time.monotonic", return_value=0.0):
+            with sessions.session("a"):
+                sessions.checkpointer.storage["a"]["ns"]["cp"] = None
+            with sessions.session("b"):
+                pass
+        with patch("langchain_fmp_data.sessions.time.monotonic", return_value=61.0):
+            with sessions.session("c"):
+                assert sessions.evict() == ["a", "b"]
+
+        assert "a" not in sessions and "c" in sessions
+        assert "a" not in sessions.checkpointer.storage
+
+    def test_limit_evicts_least_recently_used(self):
+        """Test the session limit deletes the least recently used idle conversation"""
+        sessions = SessionManager(max_sessions=2)
+        for thread_id in ["a", "b", "a", "c"]:
+            with sessions.session(thread_id):
+                pass
+
+        assert "b" not in sessions
+        assert "a" in sessions and "c" in sessions
+
+    def test_active_sessions_are_kept(self):
+        """Test a conversation with a call in progress is never evicted"""
+        sessions = SessionManager(max_sessions=1)
+        with sessions.session("a"):
+            with sessions.session("b"):
+                pass
+            with sessions.session("c", keep=False):
+                pass
+            assert "a" in sessions
+
+        assert "b" not in sessions and "c" not in sessions
+
+    def test_same_thread_calls_are_serialized(self):
+        """Test calls on one thread wait for each other while others run"""
+        sessions = SessionManager()
+        running = {"a": 0, "b": 0}
+        overlap = {"a": 0, "b": 0}
+        lock = threading.Lock()
+
+        def call(thread_id):
+            with sessions.session(thread_id):
+                with lock:
+                    running[thread_id] += 1
+                    overlap[thread_id] = max(overlap[thread_id], running[thread_id])
+                time.sleep(0.01)
+                with lock:
+                    running[thread_id] -= 1
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(call, ["a", "a", "a", "b", "b", "b"]))
+
+        assert overlap == {"a": 1, "b": 1}
+
+
+class TestSharedTool:
+    """Test suite for one FMPDataTool serving concurrent conversations"""
+
+    @pytest.fixture
+    def tool(self, monkeypatch):
+        """FMPDataTool running a workflow that echoes the thread's questions."""
+        monkeypatch.setenv("FMP_API_KEY", "test_fmp_key")
+        monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
+        with (
+            patch("langchain_fmp_data.tools.create_vector_store"),
+            patch("langchain_fmp_data.tools.ChatOpenAI"),
+            patch(
+                "langchain_fmp_data.tools.create_fmp_data_workflow", side_effect=_echo_workflow
+            ) as mock_workflow,
+        ):
+            yield FMPDataTool(), mock_workflow
+
+    def test_conversations_do_not_mix(self, tool):
+        """Test concurrent calls keep each thread's history separate"""
+        tool, mock_workflow = tool
+
+        def ask(thread_id, question):
+            return tool.invoke({"query": question, "thread_id": thread_id})
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(ask, ["a", "b", "a", "b"], ["A1", "B1", "A2", "B2"]))
+        answer = ask("a", "A3")
+
+        assert answer.startswith("3: ") and "B" not in answer
+        assert mock_workflow.call_count == 1
+
+    def test_thread_id_from_config(self, tool):
+        """Test the thread id can come from the run config"""
+        tool, _ = tool
+        config = {"configurable": {"thread_id": "user-1"}}
+
+        tool.invoke({"query": "first"}, config=config)
+
+        assert tool.invoke({"query": "second"}, config=config) == "2: first | second"
+
+    def test_standalone_queries_leave_no_session(self, tool):
+        """Test calls without a thread id are independent and not kept"""
+        tool, _ = tool
+
+        assert tool.invoke({"query": "first"}) == "1: first"
+        assert tool.invoke({"query": "second"}) == "1: second"
+        assert len(tool.sessions) == 0
+        assert not tool.sessions.checkpointer.storage
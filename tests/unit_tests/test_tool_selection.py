@@ -0,0 +1,84 @@
+"""Unit tests for tool_selection module"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from fmp_data import FMPDataClient
+from fmp_data.lc import setup_registry
+from fmp_data.lc.vector_store import SearchResult
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+from pydantic import ValidationError
+
+from langchain_fmp_data.agent import create_fmp_data_workflow
+from langchain_fmp_data.tool_selection import AdaptiveToolSelection
+
+
+@pytest.fixture(scope="module")
+def endpoint_info():
+    """Registry entry reused by every fake search result."""
+    registry, _ = setup_registry(FMPDataClient(api_key="test"))
+    return registry.get_endpoint("get_quote")
+
+
+def _results(endpoint_info, *scores):
+    return [
+        SearchResult(score=score, name=f"tool_{i}", info=endpoint_info)
+        for i, score in enumerate(scores)
+    ]
+
+
+class TestAdaptiveToolSelection:
+    """Test suite for AdaptiveToolSelection"""
+
+    def test_clear_match_binds_few_tools(self, endpoint_info):
+        """Test a dominant top hit cuts the toolset down to min_tools"""
+        selection = AdaptiveToolSelection(min_tools=1, max_relative_gap=0.1)
+
+        selected = selection.select(_results(endpoint_info, 0.6, 0.9, 0.5, 0.45))
+
+        assert [r.score for r in selected] == [0.9]
+
+    def test_vague_query_binds_up_to_max_tools(self, endpoint_info):
+        """Test close scores keep tools up to max_tools"""
+        selection = AdaptiveToolSelection(max_tools=3, max_relative_gap=0.1)
+
+        selected = selection.select(_results(endpoint_info, 0.60, 0.59, 0.58, 0.57))
+
+        assert [r.score for r in selected] == [0.60, 0.59, 0.58]
+
+    def test_min_score_floor(self, endpoint_info):
+        """Test tools below min_score are dropped beyond min_tools"""
+        selection = AdaptiveToolSelection(min_tools=2, min_score=0.5, max_relative_gap=1)
+
+        selected = selection.select(_results(endpoint_info, 0.45, 0.44, 0.43))
+
+        assert [r.score for r in selected] == [0.45, 0.44]
+        assert selection.select([]) == []
+
+    def test_invalid_bounds(self):
+        """Test min_tools above max_tools is rejected"""
+        with pytest.raises(ValidationError, match="min_tools"):
+            AdaptiveToolSelection(min_tools=5, max_tools=3)
+
+    def test_workflow_binds_selected_tools(self, endpoint_info):
+        """Test the workflow binds only the selected tools"""
+
+        @tool
+        def get_quote(symbol: str) -> dict:
+            """Get a stock quote."""
+            return {}
+
+        vector_store = MagicMock()
+        vector_store.create_tool.return_value = get_quote
+        vector_store.search.return_value = _results(endpoint_info, 0.9, 0.5, 0.4)
+        model = MagicMock()
+        model.bind_tools.return_value.invoke.return_value = AIMessage(content="done")
+        selection = AdaptiveToolSelection(min_tools=1, max_tools=5)
+
+        agent = create_fmp_data_workflow(vector_store, model, tool_selection=selection).compile()
+        agent.invoke({"messages": [HumanMessage(content="price of AAPL")]})
+
+        vector_store.search.assert_called_once_with("price of AAPL", k=5, threshold=0)
+        assert vector_store.create_tool.call_count == 1
+        assert len(model.bind_tools.call_args.kwargs["tools"]) == 1
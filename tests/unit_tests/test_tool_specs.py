@@ -0,0 +1,133 @@
+"""Unit tests for tool_specs module"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fmp_data import FMPDataClient
+from fmp_data.exceptions import ConfigError
+from fmp_data.lc import setup_registry
+from fmp_data.lc.vector_store import EndpointVectorStore
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from langchain_fmp_data import cli
+from langchain_fmp_data.agent import create_fmp_data_workflow
+from langchain_fmp_data.tool_specs import (
+    build_tool_spec_catalog,
+    find_tool_spec_catalog,
+    load_tool_spec_catalog,
+    retrieve_tool_specs,
+    write_tool_spec_catalog,
+)
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    """Vector store populated offline with deterministic fake embeddings."""
+    client = FMPDataClient(api_key="test")
+    registry, _ = setup_registry(client)
+    store = EndpointVectorStore(
+        client,
+        registry,
+        DeterministicFakeEmbedding(size=32),
+        cache_dir=str(tmp_path_factory.mktemp("cache")),
+    )
+    store.add_endpoints(["get_quote", "get_profile"])
+    return store
+
+
+@pytest.fixture(scope="module")
+def catalog(store):
+    """Tool spec catalog built from the store's registry."""
+    return build_tool_spec_catalog(store)
+
+
+class TestToolSpecCatalog:
+    """Test suite for building and loading tool spec catalogs"""
+
+    def test_build_converts_every_endpoint(self, store, catalog):
+        """Test the catalog holds the converted spec of each current endpoint"""
+        endpoints = store.registry.list_endpoints()
+        current = {
+            i.semantics.method_name for i in endpoints.values() if not i.semantics.deprecated
+        }
+
+        assert set(catalog.specs) == current
+        info = store.registry.get_endpoint("get_quote")
+        assert catalog.specs["get_quote"] == convert_to_openai_tool(store.create_tool(info))
+
+    def test_write_and_load_round_trip(self, catalog, tmp_path):
+        """Test a written catalog loads back unchanged"""
+        path = tmp_path / "specs.json"
+        write_tool_spec_catalog(catalog, path)
+
+        assert load_tool_spec_catalog(path).specs == catalog.specs
+
+    def test_version_mismatch_is_refused(self, catalog, tmp_path, caplog):
+        """Test a catalog built for another fmp_data version is not used"""
+        path = tmp_path / "specs.json"
+        write_tool_spec_catalog(catalog, path)
+        data = json.loads(path.read_text())
+        data["fmp_data_version"] = "0.0.1"
+        path.write_text(json.dumps(data))
+
+        with pytest.raises(ConfigError, match="build-specs"):
+            load_tool_spec_catalog(path)
+        assert find_tool_spec_catalog(path) is None
+        assert "runtime" in caplog.text
+
+    def test_missing_default_catalog_is_skipped(self, tmp_path):
+        """Test no catalog is loaded when none was packaged"""
+        with patch("langchain_fmp_data.tool_specs.DEFAULT_SPECS_PATH", tmp_path / "none.json"):
+            assert find_tool_spec_catalog() is None
+
+
+class TestSpecBinding:
+    """Test suite for binding precomputed specs"""
+
+    def test_retrieve_uses_catalog_specs(self, store, catalog):
+        """Test retrieved specs are the catalog entries, not new conversions"""
+        specs = retrieve_tool_specs(store, catalog, "stock quote", k=2, threshold=0)
+
+        assert {spec["function"]["name"] for spec in specs} == {"get_quote", "get_profile"}
+        assert all(spec is catalog.specs[spec["function"]["name"]] for spec in specs)
+
+    def test_retrieve_converts_specs_missing_from_catalog(self, store, catalog):
+        """Test tools added after the catalog was built are still bound"""
+        partial = catalog.model_copy(update={"specs": {}})
+
+        specs = retrieve_tool_specs(store, partial, "stock quote", k=1, threshold=0)
+
+        assert len(specs) == 1
+        assert specs[0]["function"]["name"] in catalog.specs
+
+    def test_workflow_binds_catalog_specs(self, catalog):
+        """Test the workflow binds catalog specs without converting tools"""
+        result = MagicMock()
+        result.info.semantics.method_name = "get_quote"
+        vector_store = MagicMock()
+        vector_store.search.return_value = [result]
+        model = MagicMock()
+        model.bind_tools.return_value.invoke.return_value = AIMessage(content="done")
+
+        agent = create_fmp_data_workflow(vector_store, model, tool_specs=catalog).compile()
+        agent.invoke({"messages": [HumanMessage(content="price of AAPL")]})
+
+        assert model.bind_tools.call_args.kwargs["tools"] == [catalog.specs["get_quote"]]
+        vector_store.get_tools.assert_not_called()
+        vector_store.create_tool.assert_not_called()
+
+
+class TestBuildSpecsCli:
+    """Test suite for the build-specs command"""
+
+    def test_build_specs_command(self, store, tmp_path):
+        """Test build-specs writes a loadable catalog"""
+        path = tmp_path / "specs.json"
+        with patch("fmp_data.lc.create_vector_store", return_value=store):
+            exit_code = cli.main(["build-specs", "--output", str(path)])
+
+        assert exit_code == 0
+        assert "get_quote" in load_tool_spec_catalog(path)
@@ -4,6 +4,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from langchain_fmp_data.http_pool import SharedHTTPPool
 from langchain_fmp_data.toolkits import FMPDataToolkit
 
 
@@ -80,6 +81,19 @@ class TestFMPDataToolkit:
             assert tools == mock_tools
             assert len(tools) == 2
 
+    def test_http_pool_attached(self):
+        """Test the toolkit routes endpoint tools through the given HTTP pool"""
+        with (
+            patch("fmp_data.lc.create_vector_store") as mock_create_vs,
+            patch("langchain_fmp_data.toolkits.attach_http_pool") as mock_attach,
+        ):
+            mock_create_vs.return_value = MagicMock()
+            pool = SharedHTTPPool()
+
+            FMPDataToolkit(query="test query", http_pool=pool)
+
+            mock_attach.assert_called_once_with(mock_create_vs.return_value, pool)
+
     def test_import_error_handling(self):
         """Test proper error handling when fmp_data is not installed"""
         with patch.dict("sys.modules", {"fmp_data.lc": None}):
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from langgraph.errors import GraphRecursionError
 
+from langchain_fmp_data.agent import ToolCallBudgetExceededError
 from langchain_fmp_data.tools import FMPDataTool, ResponseFormat
 
 
@@ -86,6 +87,41 @@ class TestFMPDataToolExtended:
             assert "exceeded" in result
             assert "30 iterations" in result
 
+    @patch("langchain_fmp_data.tools.create_vector_store")
+    @patch("langchain_fmp_data.tools.ChatOpenAI")
+    def test_run_passes_recursion_limit(self, mock_chat, mock_create_vs):
+        """Test _run sets recursion_limit at the top level of the graph config"""
+        mock_create_vs.return_value = MagicMock()
+
+        tool = FMPDataTool(max_iterations=7)
+
+        with patch("langchain_fmp_data.tools.create_fmp_data_workflow") as mock_workflow:
+            mock_agent = mock_workflow.return_value.compile.return_value
+            mock_agent.invoke.return_value = {"messages": [MagicMock(content="done")]}
+
+            tool.invoke({"query": "test query"})
+
+            config = mock_agent.invoke.call_args.kwargs["config"]
+            assert config["recursion_limit"] == 7
+            assert "recursion_limit" not in config["configurable"]
+
+    @patch("langchain_fmp_data.tools.create_vector_store")
+    @patch("langchain_fmp_data.tools.ChatOpenAI")
+    def test_run_with_tool_call_budget_error(self, mock_chat, mock_create_vs):
+        """Test _run reports an exhausted tool call budget"""
+        mock_create_vs.return_value = MagicMock()
+
+        tool = FMPDataTool(max_tool_calls=4)
+
+        with patch("langchain_fmp_data.tools.create_fmp_data_workflow") as mock_workflow:
+            mock_agent = mock_workflow.return_value.compile.return_value
+            mock_agent.invoke.side_effect = ToolCallBudgetExceededError(4)
+
+            result = tool.invoke({"query": "test query"})
+
+            assert result == "Analysis exceeded 4 tool calls"
+            assert mock_workflow.call_args.kwargs["max_tool_calls"] == 4
+
     @patch("langchain_fmp_data.tools.create_vector_store")
     @patch("langchain_fmp_data.tools.ChatOpenAI")
     def test_run_with_exception(self, mock_chat, mock_create_vs):
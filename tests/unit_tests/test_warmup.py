@@ -0,0 +1,151 @@
+"""Unit tests for warmup module"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from langchain_core.embeddings import Embeddings
+from langchain_core.tools import StructuredTool
+
+from langchain_fmp_data.answer_cache import CachingEmbeddings
+from langchain_fmp_data.toolkits import FMPDataToolkit
+from langchain_fmp_data.tools import FMPDataTool
+from langchain_fmp_data.warmup import WarmupReport, pre_embed_queries, warm_connections
+
+
+class CountingEmbeddings(Embeddings):
+    """Embeddings returning the text length, counting calls."""
+
+    def __init__(self):
+        self.query_calls = 0
+        self.document_calls = 0
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        return [float(len(text))]
+
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        return [[float(len(text))] for text in texts]
+
+
+def _fmp_client(handler):
+    """Stand-in fmp_data client over a mock transport."""
+    return SimpleNamespace(
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        config=SimpleNamespace(base_url="https://financialmodelingprep.com"),
+    )
+
+
+class TestWarmupHelpers:
+    """Test suite for the warmup helpers"""
+
+    def test_phase_records_time_and_errors(self):
+        """Test a failing phase is timed and recorded instead of raised"""
+        report = WarmupReport()
+        with report.phase("ok"):
+            pass
+        with report.phase("broken"):
+            raise RuntimeError("no route")
+
+        assert list(report.phases) == ["ok", "broken"]
+        assert report.errors == {"broken": "no route"}
+        assert not report.ok
+        assert report.total_seconds >= 0.0
+
+    def test_warm_connections(self):
+        """Test connections are opened with key-less HEAD requests to the API host"""
+        requests = []
+        lock = threading.Lock()
+
+        def handler(request):
+            with lock:
+                requests.append(request)
+            return httpx.Response(403)
+
+        vector_store = SimpleNamespace(client=_fmp_client(handler))
+
+        assert warm_connections(vector_store, connections=3) == 3
+        assert len(requests) == 3
+        assert {(r.method, r.url.host) for r in requests} == {("HEAD", "financialmodelingprep.com")}
+        assert all("apikey" not in str(r.url) for r in requests)
+
+    def test_warm_connections_without_http_client(self):
+        """Test a client without an httpx client is skipped"""
+        assert warm_connections(MagicMock()) == 0
+
+    def test_pre_embed_queries(self):
+        """Test queries are embedded in one batch and served from the cache"""
+        embeddings = CountingEmbeddings()
+        vector_store = SimpleNamespace(embeddings=embeddings)
+
+        assert pre_embed_queries(vector_store, ["AAPL price", "MSFT revenue", "AAPL price"]) == 2
+        assert pre_embed_queries(vector_store, ["AAPL price"]) == 0
+
+        assert isinstance(vector_store.embeddings, CachingEmbeddings)
+        assert vector_store.embeddings.embed_query("MSFT revenue") == [12.0]
+        assert (embeddings.document_calls, embeddings.query_calls) == (1, 0)
+
+
+class TestToolWarmup:
+    """Test suite for FMPDataTool.warmup and FMPDataToolkit.warmup"""
+
+    @pytest.fixture(autouse=True)
+    def setup_env(self, monkeypatch):
+        """Setup test environment"""
+        monkeypatch.setenv("FMP_API_KEY", "test_fmp_key")
+        monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
+
+    def test_tool_warmup(self):
+        """Test warmup compiles both graphs once and reports every phase"""
+        vector_store = MagicMock()
+        vector_store.embeddings = CountingEmbeddings()
+        with (
+            patch("langchain_fmp_data.tools.create_vector_store", return_value=vector_store),
+            patch("langchain_fmp_data.tools.ChatOpenAI"),
+            patch("langchain_fmp_data.tools.create_fmp_data_workflow") as mock_workflow,
+        ):
+            tool = FMPDataTool()
+            report = tool.warmup(queries=["AAPL price"])
+            tool.get_agent()
+
+        assert list(report.phases) == [
+            "vector_store",
+            "tools",
+            "graph",
+            "connections",
+            "embeddings",
+        ]
+        assert report.ok and report.embedded_queries == 1
+        assert mock_workflow.call_count == 2
+        assert tool.warmup_report is report
+
+    def test_tool_warmup_reports_failure(self):
+        """Test a failed phase leaves the worker reported as not warm"""
+        with (
+            patch("langchain_fmp_data.tools.create_vector_store"),
+            patch("langchain_fmp_data.tools.ChatOpenAI"),
+            patch(
+                "langchain_fmp_data.tools.create_fmp_data_workflow",
+                side_effect=ValueError("bad pinned tool"),
+            ),
+        ):
+            report = FMPDataTool().warmup()
+
+        assert report.errors == {"graph": "bad pinned tool"}
+        assert "embeddings" not in report.phases
+
+    def test_toolkit_warmup(self):
+        """Test the toolkit reports its startup and warmup phases"""
+        quote = StructuredTool.from_function(
+            func=lambda symbol: {"price": 1.0}, name="get_quote", description="Quote"
+        )
+        with patch("fmp_data.lc.create_vector_store") as mock_create_vs:
+            mock_create_vs.return_value.get_tools.return_value = [quote]
+            toolkit = FMPDataToolkit(query="test query")
+            report = toolkit.warmup()
+
+        assert list(report.phases) == ["vector_store", "tools", "connections"]
+        assert report.ok and report.connections == 0